@@ -0,0 +1,200 @@
+import asyncio
+import datetime
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from discord import Bot, HTTPException
+from discord.abc import Messageable
+
+from api.clients import clients
+from api.rate_limiter import Priority
+from config import ALERT_CHECK_INTERVAL, ALERT_PRICE_BATCH_SIZE, logger
+from models import PriceAlert
+from sharding import owns_guild
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+ALERT_COLUMNS = [
+    "id",
+    "user_id",
+    "guild_id",
+    "channel_id",
+    "symbol",
+    "coin_id",
+    "direction",
+]
+# Discord rejects messages longer than this
+MESSAGE_MAX_LENGTH = 2000
+
+
+def evaluate_alerts(alerts: "DataFrame", prices: Dict[str, float]) -> "DataFrame":
+    """
+    Select alerts whose threshold was crossed, comparing all of them at once.
+
+    :param alerts: Active alerts with coin_id, direction and threshold columns
+    :param prices: Current price by coin id
+    :return: Triggered alerts with their current price
+    """
+    import numpy  # noqa: WPS433
+
+    current_prices = alerts.coin_id.map(prices).to_numpy(dtype=float)
+    thresholds = alerts.threshold.to_numpy(dtype=float)
+    above = alerts.direction.to_numpy() == "above"
+
+    # Coins without a price are NaN, which never compares true
+    triggered = numpy.where(
+        above, current_prices >= thresholds, current_prices <= thresholds
+    )
+    return alerts[triggered].assign(price=current_prices[triggered])
+
+
+def format_alert_messages(triggered: "DataFrame") -> List[str]:
+    """
+    Format triggered alerts of one channel into as few messages as possible.
+
+    :param triggered: Triggered alerts with their current price
+    :return: Message contents
+    """
+    messages = [""]
+
+    for alert in triggered.itertuples():
+        line = (
+            f"🔔 <@{alert.user_id}> {alert.symbol} is {alert.direction} "
+            f"${alert.threshold:,} (now ${alert.price:,})\n"
+        )
+
+        if len(messages[-1]) + len(line) > MESSAGE_MAX_LENGTH:
+            messages.append("")
+        messages[-1] += line
+    return messages
+
+
+class PriceAlertEngine:
+    """Checks every active price alert on a schedule with bulk price lookups."""
+
+    def __init__(self, interval: float, batch_size: int):
+        """
+        Create price alert engine.
+
+        :param interval: Seconds between checks
+        :param batch_size: Maximum number of coins priced by one upstream request
+        """
+        self.interval = interval
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self, bot: Bot) -> None:
+        """
+        Start checking alerts in the background.
+
+        :param bot: Discord bot announcing triggered alerts
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._poll(bot))
+
+    async def stop(self) -> None:
+        """Stop checking alerts."""
+        if self._task is not None:
+            self._task.cancel()
+
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                logger.info("Price alert engine stopped")
+            self._task = None
+
+    async def check(self, bot: Bot) -> None:
+        """
+        Evaluate every active alert once and announce the triggered ones.
+
+        :param bot: Discord bot announcing triggered alerts
+        """
+        rows = [
+            row
+            for row in await PriceAlert.filter(triggered_at=None).values_list(
+                *ALERT_COLUMNS, "threshold"
+            )
+            # Other processes check the alerts of the guilds they serve
+            if owns_guild(bot, row[ALERT_COLUMNS.index("guild_id")])
+        ]
+
+        if not rows:
+            return
+
+        from pandas import DataFrame  # noqa: WPS433
+
+        alerts = DataFrame(rows, columns=[*ALERT_COLUMNS, "threshold"])
+        prices = await self.fetch_prices(coin_ids=alerts.coin_id.unique().tolist())
+        triggered = evaluate_alerts(alerts=alerts, prices=prices)
+        logger.info(
+            "Checked %s price alerts on %s coins, %s triggered",
+            len(alerts),
+            len(prices),
+            len(triggered),
+        )
+
+        if triggered.empty:
+            return
+
+        await PriceAlert.filter(id__in=triggered.id.tolist()).update(
+            triggered_at=datetime.datetime.now(datetime.timezone.utc)
+        )
+
+        for channel_id, channel_alerts in triggered.groupby("channel_id"):
+            await self.announce(bot, int(channel_id), channel_alerts)
+
+    async def fetch_prices(self, coin_ids: List[str]) -> Dict[str, float]:
+        """
+        Price coins with one upstream request per batch.
+
+        :param coin_ids: Unique coin ids
+        :return: Price by coin id
+        """
+        prices: Dict[str, float] = {}
+
+        for start in range(0, len(coin_ids), self.batch_size):
+            prices.update(
+                await clients.coin_gecko.price_lookup(
+                    ids=coin_ids[start : start + self.batch_size],
+                    vs_currency="usd",
+                    priority=Priority.BACKGROUND,
+                )
+            )
+        return prices
+
+    @staticmethod
+    async def announce(bot: Bot, channel_id: int, triggered: "DataFrame") -> None:
+        """
+        Send triggered alerts to the channel they were created in.
+
+        :param bot: Discord bot
+        :param channel_id: Channel id
+        :param triggered: Triggered alerts of the channel
+        """
+        try:
+            channel = bot.get_channel(channel_id) or await bot.fetch_channel(channel_id)
+
+            if not isinstance(channel, Messageable):
+                logger.error(
+                    "Unable to announce alerts in %s: not a text channel", channel_id
+                )
+                return
+
+            for message in format_alert_messages(triggered):
+                await channel.send(message)
+        except HTTPException as error:
+            logger.error("Unable to announce alerts in %s: %s", channel_id, error)
+
+    async def _poll(self, bot: Bot) -> None:
+        while True:
+            try:
+                await self.check(bot)
+            except Exception:
+                # Keep polling, a failed check must not stop every later alert
+                logger.exception("Unable to check price alerts")
+            await asyncio.sleep(self.interval)
+
+
+price_alert_engine = PriceAlertEngine(
+    interval=ALERT_CHECK_INTERVAL, batch_size=ALERT_PRICE_BATCH_SIZE
+)
@@ -1,6 +1,31 @@
-from lru import LRU
+from api.cache_backends import create_cache_backend
+from api.rate_limiter import RateLimiter
+from api.symbol_index import SymbolIndex
+from api.ttl_cache import TTLCache
+from config import (
+    CACHE_URL,
+    COINGECKO_SYMBOL_INDEX_TTL,
+    COIN_STATS_CACHE_SIZE,
+    COIN_STATS_CACHE_TTL,
+    RATE_LIMITS,
+    RATE_LIMIT_MAX_RETRIES,
+)
+from metrics import registry
 
-coingecko_coin_lookup_cache = LRU(5)
+cache_backend = create_cache_backend(CACHE_URL)
+coingecko_symbol_index = SymbolIndex(
+    ttl=COINGECKO_SYMBOL_INDEX_TTL, backend=cache_backend, name="coingecko"
+)
+coin_stats_cache = TTLCache(
+    maxsize=COIN_STATS_CACHE_SIZE,
+    ttl=COIN_STATS_CACHE_TTL,
+    backend=cache_backend,
+    namespace="coin_stats",
+)
+rate_limiter = RateLimiter(
+    limits=RATE_LIMITS, max_retries=RATE_LIMIT_MAX_RETRIES, backend=cache_backend
+)
+registry.add_cache("coin_stats", coin_stats_cache)
 
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.93 "
@@ -0,0 +1,358 @@
+import asyncio
+import pickle  # noqa: S403
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+# Seconds idle rate limit buckets are kept in the shared store
+BUCKET_TTL = 3600
+
+
+class CacheBackendUnavailable(Exception):
+    """Raised when the shared cache backend cannot be reached."""
+
+
+class CacheBackend(ABC):
+    """Store shared by every bot process for caches and rate limit budgets.
+
+    Values are pickled, so the store must only be reachable by the bot.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """Retrieve a value.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            Optional[Any]: Stored value, None when missing or expired
+        """
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store a value.
+
+        Args:
+            key (str): Cache key
+            value (Any): Picklable value
+            ttl (float): Seconds the value is kept
+        """
+
+    @abstractmethod
+    async def take_token(self, limits: Dict[str, float]) -> float:
+        """Take a token out of every bucket at once, when all of them have one.
+
+        Buckets behave like rate_limiter.TokenBucket with the default burst.
+
+        Args:
+            limits (Dict[str, float]): Requests per minute by bucket key
+
+        Returns:
+            float: Seconds to wait before trying again, 0 when the tokens were taken
+        """
+
+    @abstractmethod
+    async def block(self, keys: List[str], seconds: float) -> None:
+        """Drain buckets and refuse tokens for the given number of seconds.
+
+        Args:
+            keys (List[str]): Bucket keys
+            seconds (float): Seconds to block the buckets for
+        """
+
+    async def close(self) -> None:
+        """Release connections."""
+
+
+def take_from_buckets(
+    states: Dict[str, List[float]], limits: Dict[str, float], now: float
+) -> float:
+    """Refill buckets and take a token out of each when all of them have one.
+
+    Args:
+        states (Dict[str, List[float]]): Tokens, updated_at and blocked_until
+            by bucket key, updated in place
+        limits (Dict[str, float]): Requests per minute by bucket key
+        now (float): Current time in seconds
+
+    Returns:
+        float: Seconds to wait before trying again, 0 when the tokens were taken
+    """
+    delay = 0.0
+
+    for key, per_minute in limits.items():
+        rate = per_minute / 60
+        capacity = max(1.0, per_minute / 4)
+        tokens, updated_at, blocked_until = states.get(key, (capacity, now, 0.0))
+        tokens = min(capacity, tokens + max(0.0, now - updated_at) * rate)
+        missing = (1 - tokens) / rate if tokens < 1 else 0
+        delay = max(delay, missing, blocked_until - now)
+        states[key] = [tokens, max(now, updated_at), blocked_until]
+
+    if delay <= 0:
+        for state in states.values():
+            state[0] -= 1
+    return delay
+
+
+class SQLiteBackend(CacheBackend):
+    """Shared store in a SQLite database, for processes on the same host."""
+
+    def __init__(self, path: str):
+        """Create SQLite backend, the database is opened on first use.
+
+        Args:
+            path (str): Database file path
+        """
+        self.path = path
+        self._connection: Optional[sqlite3.Connection] = None
+        self._purged_at = 0.0
+        # sqlite3 connections must not be used from several threads at once
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Retrieve a value, None when missing or expired."""
+        row = await self._run(
+            lambda connection: connection.execute(
+                "SELECT value FROM cache WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        )
+        return None if row is None else pickle.loads(row[0])  # noqa: S301
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store a value for ttl seconds."""
+        data = pickle.dumps(value)
+        now = time.time()
+
+        def store(connection: sqlite3.Connection) -> None:
+            connection.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) "
+                "VALUES (?, ?, ?)",
+                (key, data, now + ttl),
+            )
+
+            if now - self._purged_at > 60:
+                connection.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+                connection.execute(
+                    "DELETE FROM buckets WHERE updated_at <= ?", (now - BUCKET_TTL,)
+                )
+                self._purged_at = now
+
+        await self._run(store)
+
+    async def take_token(self, limits: Dict[str, float]) -> float:
+        """Take a token out of every bucket when all of them have one."""
+
+        def take(connection: sqlite3.Connection) -> float:
+            with connection:
+                # Take the write lock before reading the buckets
+                connection.execute("BEGIN IMMEDIATE")
+                states = self._read_buckets(connection, list(limits))
+                delay = take_from_buckets(states, limits, time.time())
+                self._write_buckets(connection, states)
+            return delay
+
+        return await self._run(take)
+
+    async def block(self, keys: List[str], seconds: float) -> None:
+        """Drain buckets and refuse tokens for the given number of seconds."""
+
+        def block(connection: sqlite3.Connection) -> None:
+            blocked_until = time.time() + seconds
+
+            with connection:
+                connection.execute("BEGIN IMMEDIATE")
+                states = self._read_buckets(connection, keys)
+
+                for key in keys:
+                    tokens, _, previous = states.get(key, (0.0, 0.0, 0.0))
+                    blocked_until = max(blocked_until, previous)
+                    states[key] = [min(tokens, 0), blocked_until, blocked_until]
+                self._write_buckets(connection, states)
+
+        await self._run(block)
+
+    async def close(self) -> None:
+        """Release the connection."""
+        if self._connection is not None:
+            await self._run(lambda connection: connection.close())
+            self._connection = None
+
+    async def _run(self, operation: Callable[[sqlite3.Connection], Any]) -> Any:
+        loop = asyncio.get_running_loop()
+
+        try:
+            return await loop.run_in_executor(
+                self._executor, lambda: operation(self._connect())
+            )
+        except sqlite3.Error as error:
+            raise CacheBackendUnavailable(str(error)) from error
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=5, isolation_level=None, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache "
+                "(key TEXT PRIMARY KEY, value BLOB, expires_at REAL)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, "
+                "tokens REAL, updated_at REAL, blocked_until REAL)"
+            )
+            self._connection = connection
+        return self._connection
+
+    @staticmethod
+    def _read_buckets(
+        connection: sqlite3.Connection, keys: List[str]
+    ) -> Dict[str, List[float]]:
+        rows = connection.execute(
+            "SELECT key, tokens, updated_at, blocked_until FROM buckets "
+            f"WHERE key IN ({', '.join('?' * len(keys))})",  # noqa: S608
+            keys,
+        )
+        return {key: list(state) for key, *state in rows}
+
+    @staticmethod
+    def _write_buckets(
+        connection: sqlite3.Connection, states: Dict[str, List[float]]
+    ) -> None:
+        connection.executemany(
+            "INSERT OR REPLACE INTO buckets (key, tokens, updated_at, blocked_until) "
+            "VALUES (?, ?, ?, ?)",
+            [(key, *state) for key, state in states.items()],
+        )
+
+
+# Same refill rules as take_from_buckets, atomically on the Redis server
+TAKE_TOKEN_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local delay = 0
+local states = {}
+for i, key in ipairs(KEYS) do
+    local per_minute = tonumber(ARGV[i])
+    local rate = per_minute / 60
+    local capacity = math.max(1, per_minute / 4)
+    local state = redis.call('HMGET', key, 'tokens', 'updated_at', 'blocked_until')
+    local tokens = tonumber(state[1]) or capacity
+    local updated_at = tonumber(state[2]) or now
+    local blocked_until = tonumber(state[3]) or 0
+    tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate)
+    local missing = 0
+    if tokens < 1 then
+        missing = (1 - tokens) / rate
+    end
+    delay = math.max(delay, missing, blocked_until - now)
+    states[i] = {tokens, math.max(now, updated_at), blocked_until}
+end
+for i, key in ipairs(KEYS) do
+    local tokens = states[i][1]
+    if delay <= 0 then
+        tokens = tokens - 1
+    end
+    redis.call(
+        'HSET', key, 'tokens', tokens, 'updated_at', states[i][2],
+        'blocked_until', states[i][3]
+    )
+    redis.call('EXPIRE', key, ARGV[#KEYS + 1])
+end
+return tostring(delay)
+"""
+
+BLOCK_SCRIPT = """
+local clock = redis.call('TIME')
+local blocked_until = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+    + tonumber(ARGV[1])
+for _, key in ipairs(KEYS) do
+    local state = redis.call('HMGET', key, 'tokens', 'blocked_until')
+    local until_time = math.max(blocked_until, tonumber(state[2]) or 0)
+    redis.call(
+        'HSET', key, 'tokens', math.min(tonumber(state[1]) or 0, 0),
+        'updated_at', until_time, 'blocked_until', until_time
+    )
+    redis.call('EXPIRE', key, ARGV[2])
+end
+"""
+
+
+class RedisBackend(CacheBackend):
+    """Shared store in a Redis compatible server, requires the redis package."""
+
+    def __init__(self, url: str):
+        """Create Redis backend, the server is connected to on first use.
+
+        Args:
+            url (str): Server url, e.g. redis://localhost:6379/0
+        """
+        from redis import asyncio as redis  # noqa: WPS433
+
+        self._client = redis.from_url(url)
+        self._take_token = self._client.register_script(TAKE_TOKEN_SCRIPT)
+        self._block = self._client.register_script(BLOCK_SCRIPT)
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Retrieve a value, None when missing or expired."""
+        data = await self._call(self._client.get, key)
+        return None if data is None else pickle.loads(data)  # noqa: S301
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store a value for ttl seconds."""
+        await self._call(
+            self._client.set, key, pickle.dumps(value), px=max(1, int(ttl * 1000))
+        )
+
+    async def take_token(self, limits: Dict[str, float]) -> float:
+        """Take a token out of every bucket when all of them have one."""
+        delay = await self._call(
+            self._take_token,
+            keys=list(limits),
+            args=[*limits.values(), BUCKET_TTL],
+        )
+        return float(delay)
+
+    async def block(self, keys: List[str], seconds: float) -> None:
+        """Drain buckets and refuse tokens for the given number of seconds."""
+        await self._call(self._block, keys=keys, args=[seconds, BUCKET_TTL])
+
+    async def close(self) -> None:
+        """Release the connection."""
+        await self._client.close()
+
+    @staticmethod
+    async def _call(command: Callable[..., Any], *args, **kwargs) -> Any:
+        from redis.exceptions import RedisError  # noqa: WPS433
+
+        try:
+            return await command(*args, **kwargs)
+        except RedisError as error:
+            raise CacheBackendUnavailable(str(error)) from error
+
+
+def create_cache_backend(url: str) -> Optional[CacheBackend]:
+    """Create the backend named by a url.
+
+    Args:
+        url (str): sqlite:///path/to/cache.db, redis://host:port/db, or empty
+            to keep every cache in the bot process
+
+    Returns:
+        Optional[CacheBackend]: Shared backend, None for in-process caches
+    """
+    scheme = urlparse(url).scheme
+
+    if not url or scheme == "memory":
+        return None
+    if scheme == "sqlite":
+        return SQLiteBackend(path=url[len("sqlite://") :])
+    if scheme in {"redis", "rediss", "unix"}:
+        return RedisBackend(url=url)
+    raise ValueError(f"Unknown cache backend {url}")
@@ -0,0 +1,74 @@
+from typing import Optional
+
+from aiohttp import ClientSession, TCPConnector
+
+from api.coingecko import CoinGecko
+from api.coinmarketcap import CoinMarketCap, executor
+from config import (
+    COINGECKO_API_URL,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_POOL_SIZE,
+    HTTP_POOL_SIZE_PER_HOST,
+    logger,
+)
+
+
+class ClientRegistry:
+    """Process-wide API clients sharing pooled keep-alive HTTP sessions."""
+
+    def __init__(self):
+        """Create empty client registry."""
+        # Read when the clients are created, e.g. to point them at a replay server
+        self.coin_gecko_url = COINGECKO_API_URL
+        self._session: Optional[ClientSession] = None
+        self._coin_gecko: Optional[CoinGecko] = None
+        self._coin_market_cap: Optional[CoinMarketCap] = None
+
+    @property
+    def coin_gecko(self) -> CoinGecko:
+        """Shared CoinGecko client, created on first use."""
+        if self._coin_gecko is None:
+            self._coin_gecko = CoinGecko(
+                client_session=self.session, api_base_url=self.coin_gecko_url
+            )
+        return self._coin_gecko
+
+    @property
+    def coin_market_cap(self) -> CoinMarketCap:
+        """Shared CoinMarketCap client, created on first use."""
+        if self._coin_market_cap is None:
+            self._coin_market_cap = CoinMarketCap()
+        return self._coin_market_cap
+
+    @property
+    def session(self) -> ClientSession:
+        """Pooled aiohttp session, created on first use."""
+        if self._session is None:
+            logger.info("Opening pooled HTTP session")
+            self._session = ClientSession(
+                connector=TCPConnector(
+                    limit=HTTP_POOL_SIZE,
+                    limit_per_host=HTTP_POOL_SIZE_PER_HOST,
+                    keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+                )
+            )
+        return self._session
+
+    def start(self) -> None:
+        """Open the pooled session and warm the symbol index."""
+        self.coin_gecko.refresh_symbol_index()
+
+    async def close(self) -> None:
+        """Close pooled sessions and worker threads."""
+        logger.info("Closing pooled HTTP sessions")
+
+        if self._session is not None:
+            await self._session.close()
+
+        executor.shutdown(wait=False)
+        self._session = None
+        self._coin_gecko = None
+        self._coin_market_cap = None
+
+
+clients = ClientRegistry()
@@ -1,17 +1,86 @@
-from typing import Any
+import json
+from functools import partial
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional
 
-from aiocoingecko import AsyncCoinGeckoAPISession
-from pandas import DataFrame, to_datetime
-from requests.exceptions import RequestException
+from aiocoingecko import AsyncCoinGeckoAPISession, HTTPException, UnknownResponse
+from aiohttp import ClientSession
 
-from api import coingecko_coin_lookup_cache
-from config import logger
+from api import coingecko_symbol_index, rate_limiter
+from api.rate_limiter import Priority, RateLimitExceeded
+from config import COINGECKO_API_URL, logger
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+# Largest page CoinGecko returns from coins/markets
+COINGECKO_MARKETS_PAGE_SIZE = 250
+# Skip the heavy coins/{id} sections the bot never reads
+COIN_LOOKUP_SECTIONS = {
+    "localization": "false",
+    "tickers": "false",
+    "market_data": "true",
+    "community_data": "false",
+    "developer_data": "false",
+    "sparkline": "false",
+}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header.
+
+    Args:
+        value (Optional[str]): Header value, in seconds
+
+    Returns:
+        Optional[float]: Seconds to wait, None when missing or not in seconds
+    """
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+class CoinGeckoAPISession(AsyncCoinGeckoAPISession):
+    """aiocoingecko session raising RateLimitExceeded with the upstream Retry-After.
+
+    aiocoingecko drops the response headers from its errors, so requests are
+    sent here instead of through the library's own _request.
+    """
+
+    async def _request(self, route: str, **kwargs) -> Any:
+        async with self._client_session.get(
+            self.api_base_url + route, params=kwargs
+        ) as response:
+            if response.status == 429:
+                raise RateLimitExceeded(
+                    response.reason,
+                    retry_after=parse_retry_after(response.headers.get("Retry-After")),
+                )
+            if not response.ok:
+                raise HTTPException(response.reason, status_code=response.status)
+
+            try:
+                return await response.json()
+            except json.JSONDecodeError as error:
+                raise UnknownResponse(resp=response) from error
 
 
 class CoinGecko:
-    def __init__(self):
-        """Create CoinGecko API instance."""
-        self.cg = AsyncCoinGeckoAPISession()
+    def __init__(
+        self,
+        client_session: Optional[ClientSession] = None,
+        api_base_url: str = COINGECKO_API_URL,
+    ):
+        """Create CoinGecko API instance.
+
+        Args:
+            client_session (Optional[ClientSession]): Shared session to reuse.
+                A new session is opened per call when omitted.
+            api_base_url (str): CoinGecko API base url
+        """
+        self.cg = CoinGeckoAPISession(
+            api_base_url=api_base_url, client_session=client_session
+        )
 
     async def coin_lookup(self, ids: str, is_address: bool = False) -> Any:
         """Coin lookup in CoinGecko API.
@@ -25,47 +94,126 @@ class CoinGecko:
         """
         logger.info("Looking up price for %s in CoinGecko API", ids)
         async with self.cg as cg:
-            try:
-                token_data = (
-                    await cg.get_coin_info_from_contract_address_by_id(
-                        platform_id="ethereum", contract_address=ids
-                    )
-                    if is_address
-                    else await cg.get_coin_by_id(coin_id=ids)
+            if not is_address:
+                return await self._request(
+                    "coins",
+                    partial(cg.get_coin_by_id, **COIN_LOOKUP_SECTIONS),
+                    coin_id=ids,
                 )
-            except ValueError:
-                token_data = await cg.get_coin_info_from_contract_address_by_id(
-                    platform_id="binance-smart-chain", contract_address=ids
+
+            try:
+                token_data = await self._request(
+                    "coins/contract",
+                    cg.get_coin_info_from_contract_address_by_id,
+                    platform_id="ethereum",
+                    contract_address=ids,
                 )
-            except RequestException:
-                token_data = (
-                    await cg.get_coin_info_from_contract_address_by_id(
-                        platfomr_id="binance", contract_address=ids
-                    )
-                    if is_address
-                    else await cg.get_coin_by_id(coin_id=ids)  # type: ignore
+            except HTTPException:
+                token_data = await self._request(
+                    "coins/contract",
+                    cg.get_coin_info_from_contract_address_by_id,
+                    platform_id="binance-smart-chain",
+                    contract_address=ids,
                 )
         return token_data
 
-    async def get_trending_coins(self) -> list:
+    async def coin_markets_lookup(self, ids: List[str], vs_currency: str) -> list:
+        """Market data of several coins in a single CoinGecko API request.
+
+        Args:
+            ids (List[str]): ids of coins to lookup, at most 250
+            vs_currency (str): Currency of prices and market caps
+
+        Returns:
+            list: Market data of every found coin
+        """
+        logger.info("Looking up market data for %s coins in CoinGecko API", len(ids))
+        async with self.cg as cg:
+            return await self._request(
+                "coins/markets",
+                cg.get_coins_markets,
+                vs_currency=vs_currency,
+                ids=",".join(ids),
+                per_page=COINGECKO_MARKETS_PAGE_SIZE,
+                price_change_percentage="7d",
+            )
+
+    async def price_lookup(
+        self,
+        ids: List[str],
+        vs_currency: str,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> Dict[str, float]:
+        """Current price of several coins in a single CoinGecko API request.
+
+        Args:
+            ids (List[str]): ids of coins to lookup
+            vs_currency (str): Currency of prices
+            priority (Priority): Rate limiter priority of the request
+
+        Returns:
+            Dict[str, float]: Price by coin id, coins without a price are left out
+        """
+        logger.info("Looking up prices for %s coins in CoinGecko API", len(ids))
+        async with self.cg as cg:
+            prices = await self._request(
+                "simple/price",
+                cg.get_price,
+                priority=priority,
+                ids=",".join(ids),
+                vs_currencies=vs_currency,
+            )
+        return {
+            coin_id: price[vs_currency]
+            for coin_id, price in prices.items()
+            if price.get(vs_currency) is not None
+        }
+
+    async def get_trending_coins(
+        self, priority: Priority = Priority.INTERACTIVE
+    ) -> list:
         """
         Get trending coins.
 
+        Args:
+            priority (Priority): Rate limiter priority of the request
+
         Returns (list): Trending coins
 
         """
         logger.info("Retrieving CoinGecko trending coins")
 
         async with self.cg as cg:
-            trending_coins = await cg.get_search_trending()
+            trending_coins = await self._request(
+                "search/trending", cg.get_search_trending, priority=priority
+            )
         return [
             f"{coin['item']['name']} ({coin['item']['symbol']})"
             for coin in trending_coins["coins"]
         ]
 
+    async def get_exchange_rates(
+        self, priority: Priority = Priority.INTERACTIVE
+    ) -> Dict[str, dict]:
+        """Exchange rates of fiat and crypto currencies against Bitcoin.
+
+        Args:
+            priority (Priority): Rate limiter priority of the request
+
+        Returns:
+            Dict[str, dict]: Name, unit, value and type by currency
+        """
+        logger.info("Retrieving CoinGecko exchange rates")
+
+        async with self.cg as cg:
+            exchange_rates = await self._request(
+                "exchange_rates", cg.get_exchange_rates, priority=priority
+            )
+        return exchange_rates["rates"]
+
     async def coin_market_lookup(
         self, ids: str, time_frame: str, base_coin: str
-    ) -> DataFrame:
+    ) -> "DataFrame":
         """Coin lookup in CoinGecko API for Market Chart.
 
         Args:
@@ -76,11 +224,17 @@ class CoinGecko:
         Returns:
             DataFrame: Data from CoinGecko API
         """
+        from pandas import DataFrame, to_datetime  # noqa: WPS433
+
         logger.info("Looking up chart data for %s in CoinGecko API", ids)
 
         async with self.cg as cg:
-            market_data = await cg.get_coin_ohlc_by_id(
-                coin_id=ids, vs_currency=base_coin, days=time_frame
+            market_data = await self._request(
+                "coins/ohlc",
+                cg.get_coin_ohlc_by_id,
+                coin_id=ids,
+                vs_currency=base_coin,
+                days=time_frame,
             )
             dataframe = DataFrame(
                 market_data, columns=["Date", "Open", "High", "Low", "Close"]
@@ -98,23 +252,28 @@ class CoinGecko:
             list: coin ids of matching search results for given symbol
         """
         logger.info("Getting coin ID for %s", symbol)
-        coin_ids = []
-
-        if symbol in coingecko_coin_lookup_cache.keys():
-            coin_ids.append(coingecko_coin_lookup_cache[symbol])
-        else:
-            async with self.cg as cg:
-                coins = [
-                    coin
-                    for coin in await cg.get_coins_list()
-                    if coin["symbol"].upper() == symbol
-                ]
-
-            for coin in coins:
-                coin_id = coin["id"]
-                coin_ids.append(coin_id)
-
-            if len(coin_ids) == 1:
-                coingecko_coin_lookup_cache[symbol] = coin_ids[0]
-
-        return coin_ids
+        return await coingecko_symbol_index.lookup(
+            symbol=symbol, loader=self._get_coins_list
+        )
+
+    def refresh_symbol_index(self) -> None:
+        """Rebuild the shared symbol index in the background."""
+        coingecko_symbol_index.schedule_refresh(loader=self._get_coins_list)
+
+    async def _get_coins_list(self) -> list:
+        logger.info("Downloading CoinGecko coins list")
+        async with self.cg as cg:
+            return await self._request(
+                "coins/list", cg.get_coins_list, priority=Priority.BACKGROUND
+            )
+
+    @staticmethod
+    async def _request(
+        endpoint: str,
+        request: Callable[..., Awaitable[Any]],
+        priority: Priority = Priority.INTERACTIVE,
+        **kwargs,
+    ) -> Any:
+        return await rate_limiter.call(
+            "coingecko", endpoint, request, priority=priority, **kwargs
+        )
@@ -1,18 +1,69 @@
-from typing import Any
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, List
 
-from coinmarketcap_utils.coinmarketcap_utils import get_trending_tokens
-from coinmarketcapapi import CoinMarketCapAPI
+from coinmarketcap_utils.coinmarketcap_utils import TrendingScraper
+from coinmarketcapapi import CoinMarketCapAPI, CoinMarketCapAPIError
 
-from config import COIN_MARKET_CAP_API_KEY
+from api import rate_limiter
+from api.rate_limiter import Priority, RateLimitExceeded
+from config import COIN_MARKET_CAP_API_KEY, COIN_MARKET_CAP_MAX_WORKERS
 from config import logger
 
+executor = ThreadPoolExecutor(
+    max_workers=COIN_MARKET_CAP_MAX_WORKERS, thread_name_prefix="coinmarketcap"
+)
+# HTTP 429 and the CoinMarketCap status codes of exceeded rate limits
+RATE_LIMIT_ERROR_CODES = {"429", "1008", "1011"}
+# Reused across calls so the pooled connection and cookies survive between scrapes
+trending_scraper = TrendingScraper()
+
+
+async def run_in_executor(func: Callable, *args, **kwargs) -> Any:
+    """
+    Run blocking CoinMarketCap call without blocking the event loop.
+
+    Args:
+        func (Callable): Blocking callable
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns (Any): Result of func
+
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, partial(func, *args, **kwargs))
+
+
+async def run_rate_limited(func: Callable, **kwargs) -> Any:
+    """
+    Run blocking CoinMarketCap API call, surfacing HTTP 429 as RateLimitExceeded.
+
+    python-coinmarketcap does not expose the response headers, so CoinMarketCap
+    rate limits carry no Retry-After and are backed off exponentially.
+
+    Args:
+        func (Callable): Blocking CoinMarketCapAPI method
+        **kwargs: Keyword arguments for func
+
+    Returns (Any): Result of func
+
+    """
+    try:
+        return await run_in_executor(func, **kwargs)
+    except CoinMarketCapAPIError as error:
+        if str(error.rep.error_code) not in RATE_LIMIT_ERROR_CODES:
+            raise
+        raise RateLimitExceeded(error.rep.error_message) from error
+
 
 class CoinMarketCap:
     def __init__(self):
         """Create CoinMarketCap API instance."""
         self.cmc = CoinMarketCapAPI(COIN_MARKET_CAP_API_KEY)
 
-    def get_coin_ids(self, symbol: str) -> list:
+    async def get_coin_ids(self, symbol: str) -> list:
         """
         Retrieve coin ids for matching symbol.
 
@@ -23,12 +74,12 @@ class CoinMarketCap:
 
         """
         logger.info("Looking up token ids for %s in CoinMarketCap API", symbol)
-        return [
-            (str(token["id"]), token["name"])
-            for token in self.cmc.cryptocurrency_map(symbol=symbol).data
-        ]
+        response = await self._request(
+            "cryptocurrency/map", self.cmc.cryptocurrency_map, symbol=symbol
+        )
+        return [(str(token["id"]), token["name"]) for token in response.data]
 
-    def get_coin_metadata(self, ids: str) -> Any:
+    async def get_coin_metadata(self, ids: str) -> Any:
         """
         Retrieve coin metadata.
 
@@ -37,9 +88,12 @@ class CoinMarketCap:
 
         Returns (Any): Metadata for provided coin ids
         """
-        return self.cmc.cryptocurrency_info(id=ids).data
+        response = await self._request(
+            "cryptocurrency/info", self.cmc.cryptocurrency_info, id=ids
+        )
+        return response.data
 
-    def coin_lookup(self, ids: str) -> Any:
+    async def coin_lookup(self, ids: str) -> Any:
         """Coin lookup in CoinMarketCap API.
 
         Args:
@@ -49,15 +103,66 @@ class CoinMarketCap:
             Any: Results of coin lookup
         """
         logger.info("Looking up price for %s in CoinMarketCap API", ids)
-        return self.cmc.cryptocurrency_quotes_latest(id=ids, convert="usd").data
+        response = await self._request(
+            "cryptocurrency/quotes/latest",
+            self.cmc.cryptocurrency_quotes_latest,
+            id=ids,
+            convert="usd",
+        )
+        return response.data
+
+    async def quotes_lookup(self, symbols: List[str]) -> Any:
+        """Quotes of several symbols in a single CoinMarketCap API request.
+
+        Args:
+            symbols (List[str]): Token symbols, unknown symbols are skipped
+
+        Returns:
+            Any: Quote by symbol
+        """
+        logger.info("Looking up quotes for %s in CoinMarketCap API", symbols)
+        response = await self._request(
+            "cryptocurrency/quotes/latest",
+            self.cmc.cryptocurrency_quotes_latest,
+            symbol=",".join(symbols),
+            convert="usd",
+            skip_invalid="true",
+        )
+        return response.data
 
     @staticmethod
-    async def get_trending_coins() -> list:
+    async def get_trending_coins(priority: Priority = Priority.INTERACTIVE) -> list:
         """
         Scalp trending coins from CoinMarketCap website.
 
+        Args:
+            priority (Priority): Rate limiter priority of the request
+
         Returns (list): Trending coins
 
         """
         logger.info("Retrieving trending coins from CoinMarketCap")
-        return get_trending_tokens()[:7]  # type: ignore
+        trending_tokens = await rate_limiter.call(
+            "coinmarketcap-web",
+            "trending",
+            run_in_executor,
+            trending_scraper.fetch,
+            priority=priority,
+        )
+        return trending_tokens[:7]  # type: ignore
+
+    @staticmethod
+    async def _request(
+        endpoint: str,
+        func: Callable,
+        priority: Priority = Priority.INTERACTIVE,
+        **kwargs,
+    ) -> Any:
+        return await rate_limiter.call(
+            "coinmarketcap",
+            endpoint,
+            run_rate_limited,
+            func,
+            priority=priority,
+            **kwargs,
+        )
@@ -0,0 +1,142 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, NamedTuple, Optional
+
+from api.clients import clients
+from api.rate_limiter import Priority
+from config import EXCHANGE_RATES_REFRESH_INTERVAL, logger
+
+RatesLoader = Callable[[], Awaitable[Dict[str, dict]]]
+
+
+class ExchangeRateUnavailable(Exception):
+    """Raised when no exchange rate is known for a currency."""
+
+
+class Conversion(NamedTuple):
+    """Rate between two currencies, taken from one exchange rates snapshot."""
+
+    currency: str
+    unit: str
+    rate: float
+
+    def convert(self, amount: Optional[float]) -> Optional[float]:
+        """Convert an amount, keeping unknown amounts unknown.
+
+        Args:
+            amount (Optional[float]): Amount in the source currency
+
+        Returns:
+            Optional[float]: Amount in the target currency
+        """
+        if amount is None:
+            return None
+        # Drop the float noise of the multiplication, e.g. 61640.110400000005
+        return float(f"{amount * self.rate:.10g}")
+
+
+class ExchangeRates:
+    """Exchange rates polled in the background, shared by every conversion."""
+
+    def __init__(self, loader: RatesLoader, interval: float):
+        """Create exchange rates table.
+
+        Args:
+            loader (RatesLoader): Coroutine function returning rates by currency,
+                each with a unit and a value against a common reference
+            interval (float): Seconds between background refreshes
+        """
+        self.loader = loader
+        self.interval = interval
+        self.rates: Dict[str, dict] = {}
+        self._refreshed_at: Optional[float] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def get_conversion(self, source: str, target: str) -> Conversion:
+        """Conversion between two currencies, refreshing only if none was attempted yet.
+
+        Converting a currency to itself never needs the rates table, amounts are
+        quoted in USD so the identity conversion uses the dollar sign.
+
+        Args:
+            source (str): Currency of the amounts to convert, e.g. usd
+            target (str): Currency to convert to, e.g. eur
+
+        Raises:
+            ExchangeRateUnavailable: Either currency has no known rate
+
+        Returns:
+            Conversion: Rate and unit of the target currency
+        """
+        if source == target:
+            # Amounts are already in the target currency, no rate is needed
+            return Conversion(currency=target, unit="$", rate=1.0)
+
+        if self._refreshed_at is None:
+            await self.refresh()
+
+        try:
+            source_rate = self.rates[source]["value"]
+            target_rate = self.rates[target]
+        except KeyError as error:
+            raise ExchangeRateUnavailable(
+                f"No exchange rate from {source} to {target}"
+            ) from error
+        return Conversion(
+            currency=target,
+            unit=target_rate["unit"],
+            rate=target_rate["value"] / source_rate,
+        )
+
+    async def refresh(self) -> None:
+        """Refresh the rates, keeping the previous ones when the loader fails."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        requested_at = time.monotonic()
+
+        async with self._lock:
+            if self._refreshed_at is not None and self._refreshed_at >= requested_at:
+                return
+
+            try:
+                self.rates = await self.loader()
+            except Exception as error:
+                logger.error("Unable to refresh exchange rates: %s", error)
+            self._refreshed_at = time.monotonic()
+
+    def start(self) -> None:
+        """Start polling rates in the background."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._poll())
+
+    async def stop(self) -> None:
+        """Stop background polling."""
+        if self._task is not None:
+            self._task.cancel()
+
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                logger.info("Exchange rates stopped")
+            self._task = None
+
+    async def _poll(self) -> None:
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.interval)
+
+
+async def get_coin_gecko_exchange_rates() -> Dict[str, dict]:
+    """Exchange rates against Bitcoin on CoinGecko, requested at background priority.
+
+    Returns:
+        Dict[str, dict]: Name, unit, value and type by currency
+    """
+    return await clients.coin_gecko.get_exchange_rates(priority=Priority.BACKGROUND)
+
+
+exchange_rates = ExchangeRates(
+    loader=get_coin_gecko_exchange_rates, interval=EXCHANGE_RATES_REFRESH_INTERVAL
+)
@@ -0,0 +1,262 @@
+import asyncio
+import random
+from collections import Counter, defaultdict
+from enum import IntEnum
+from time import monotonic
+from typing import Any, Awaitable, Callable, DefaultDict, Dict, List, Optional
+
+from api.cache_backends import CacheBackend, CacheBackendUnavailable
+from config import logger
+from metrics import upstream_latency, upstream_requests
+
+
+class Priority(IntEnum):
+    """Request priority, lower values are served first."""
+
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+class RateLimitExceeded(Exception):
+    """Raised when an upstream API keeps answering with HTTP 429."""
+
+    def __init__(self, *args, retry_after: Optional[float] = None):
+        """Create rate limit error.
+
+        Args:
+            retry_after (Optional[float]): Seconds the upstream asked to wait
+        """
+        self.retry_after = retry_after
+        super().__init__(*args)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a per-minute rate."""
+
+    def __init__(self, per_minute: float, burst: Optional[float] = None):
+        """Create token bucket.
+
+        Args:
+            per_minute (float): Tokens added per minute
+            burst (Optional[float]): Maximum number of stored tokens
+        """
+        self.rate = per_minute / 60
+        self.capacity = burst or max(1.0, per_minute / 4)
+        self.tokens = self.capacity
+        self.blocked_until = 0.0
+        self._updated_at = monotonic()
+
+    def delay(self) -> float:
+        """Seconds until a token can be consumed."""
+        now = monotonic()
+        elapsed = max(0.0, now - self._updated_at)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self._updated_at = max(now, self._updated_at)
+        missing = (1 - self.tokens) / self.rate if self.tokens < 1 else 0
+        return max(missing, self.blocked_until - now)
+
+    def consume(self) -> None:
+        """Take one token out of the bucket."""
+        self.tokens -= 1
+
+    def block(self, seconds: float) -> None:
+        """Drain the bucket and refuse tokens for the given number of seconds.
+
+        Args:
+            seconds (float): Seconds to block the bucket for
+        """
+        self.tokens = min(self.tokens, 0)
+        self.blocked_until = max(self.blocked_until, monotonic() + seconds)
+        self._updated_at = self.blocked_until
+
+
+class RateLimiter:
+    """Central rate limiter with a token bucket per provider and per endpoint.
+
+    With a shared backend the buckets live there, so every bot process draws
+    from the same budget. Local buckets take over while it is unavailable.
+    """
+
+    def __init__(
+        self,
+        limits: Dict[str, float],
+        max_retries: int = 3,
+        backoff: float = 1.0,
+        backend: Optional[CacheBackend] = None,
+    ):
+        """Create rate limiter.
+
+        Args:
+            limits (Dict[str, float]): Requests per minute keyed by "provider"
+                or "provider:endpoint"
+            max_retries (int): Retries after a rate limited response
+            backoff (float): Base of the exponential backoff in seconds
+            backend (Optional[CacheBackend]): Shared store of the buckets, None
+                to keep them in this process only
+        """
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.backend = backend
+        self._limits: Dict[str, float] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._waiting: DefaultDict[str, Counter] = defaultdict(Counter)
+        self.set_limits(limits)
+
+    def set_limits(self, limits: Dict[str, float]) -> None:
+        """Replace every token bucket with a full one.
+
+        Args:
+            limits (Dict[str, float]): Requests per minute keyed by "provider"
+                or "provider:endpoint", an empty dict lifts all limits
+        """
+        self._limits = dict(limits)
+        self._buckets = {key: TokenBucket(limit) for key, limit in limits.items()}
+
+    async def acquire(
+        self, provider: str, endpoint: str, priority: Priority = Priority.INTERACTIVE
+    ) -> None:
+        """Wait until a request to the endpoint is allowed.
+
+        Background requests only proceed while no interactive request to the
+        same provider is waiting.
+
+        Args:
+            provider (str): Upstream provider name
+            endpoint (str): Upstream endpoint name
+            priority (Priority): Request priority
+        """
+        buckets = self._buckets_for(provider, endpoint)
+
+        if not buckets:
+            return
+
+        waiting = self._waiting[provider]
+        waiting[priority] += 1
+
+        try:
+            while True:
+                delay = max(bucket.delay() for bucket in buckets)
+
+                if any(waiting[higher] for higher in Priority if higher < priority):
+                    delay = max(delay, 1 / max(bucket.rate for bucket in buckets))
+                elif self.backend is not None:
+                    delay = await self._take_shared_token(
+                        self.backend, provider, endpoint, delay
+                    )
+
+                    if delay <= 0:
+                        return
+                elif delay <= 0:
+                    for bucket in buckets:
+                        bucket.consume()
+                    return
+                await asyncio.sleep(delay)
+        finally:
+            waiting[priority] -= 1
+
+    def penalize(
+        self, provider: str, endpoint: str, attempt: int, retry_after: Optional[float]
+    ) -> float:
+        """Block provider after a rate limited response.
+
+        Args:
+            provider (str): Upstream provider name
+            endpoint (str): Upstream endpoint name
+            attempt (int): Number of rate limited responses in a row
+            retry_after (Optional[float]): Seconds the upstream asked to wait
+
+        Returns:
+            float: Seconds the provider is blocked for
+        """
+        delay = retry_after or self.backoff * 2**attempt
+        delay += random.uniform(0, self.backoff)  # noqa: S311
+
+        for bucket in self._buckets_for(provider, endpoint):
+            bucket.block(delay)
+        return delay
+
+    async def call(
+        self,
+        provider: str,
+        endpoint: str,
+        request: Callable[..., Awaitable[Any]],
+        *args,
+        priority: Priority = Priority.INTERACTIVE,
+        **kwargs,
+    ) -> Any:
+        """Perform request within the rate limit, retrying rate limited responses.
+
+        Args:
+            provider (str): Upstream provider name
+            endpoint (str): Upstream endpoint name
+            request (Callable[..., Awaitable[Any]]): Coroutine function raising
+                RateLimitExceeded when the upstream answers with HTTP 429
+            *args: Positional arguments for request
+            priority (Priority): Request priority
+            **kwargs: Keyword arguments for request
+
+        Returns:
+            Any: Result of request
+        """
+        for attempt in range(self.max_retries + 1):
+            await self.acquire(provider, endpoint, priority)
+            started = monotonic()
+            outcome = "error"
+
+            try:
+                response = await request(*args, **kwargs)
+                outcome = "ok"
+                return response
+            except RateLimitExceeded as error:
+                outcome = "rate_limited"
+
+                if attempt == self.max_retries:
+                    raise
+                delay = self.penalize(provider, endpoint, attempt, error.retry_after)
+                await self._block_shared(provider, endpoint, delay)
+                logger.warning(
+                    "Rate limited by %s (%s), backing off %.1fs",
+                    provider,
+                    endpoint,
+                    delay,
+                )
+            finally:
+                upstream_requests.inc(provider, endpoint, outcome)
+                upstream_latency.observe(monotonic() - started, provider, endpoint)
+            await asyncio.sleep(delay)
+
+    def _buckets_for(self, provider: str, endpoint: str) -> List[TokenBucket]:
+        keys = (provider, f"{provider}:{endpoint}")
+        return [self._buckets[key] for key in keys if key in self._buckets]
+
+    def _shared_limits(self, provider: str, endpoint: str) -> Dict[str, float]:
+        keys = (provider, f"{provider}:{endpoint}")
+        return {
+            f"rate_limit:{key}": self._limits[key]
+            for key in keys
+            if key in self._limits
+        }
+
+    async def _take_shared_token(
+        self, backend: CacheBackend, provider: str, endpoint: str, local_delay: float
+    ) -> float:
+        try:
+            return await backend.take_token(self._shared_limits(provider, endpoint))
+        except CacheBackendUnavailable as error:
+            logger.warning("Unable to use shared rate limit: %s", error)
+
+        if local_delay <= 0:
+            for bucket in self._buckets_for(provider, endpoint):
+                bucket.consume()
+        return local_delay
+
+    async def _block_shared(self, provider: str, endpoint: str, delay: float) -> None:
+        if self.backend is None:
+            return
+
+        try:
+            await self.backend.block(
+                list(self._shared_limits(provider, endpoint)), delay
+            )
+        except CacheBackendUnavailable as error:
+            logger.warning("Unable to block shared rate limit: %s", error)
@@ -0,0 +1,129 @@
+import asyncio
+import time
+from collections import defaultdict
+from time import monotonic
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from api.cache_backends import CacheBackend, CacheBackendUnavailable
+from config import logger
+
+CoinsListLoader = Callable[[], Awaitable[list]]
+
+
+class SymbolIndex:
+    """In-memory index of upper-case token symbols to their matching coin ids.
+
+    With a shared backend, an index built by another bot process is reused
+    instead of downloading the coins list again.
+    """
+
+    def __init__(
+        self, ttl: float, backend: Optional[CacheBackend] = None, name: str = ""
+    ):
+        """Create symbol index.
+
+        Args:
+            ttl (float): Seconds after which the index is rebuilt in the background
+            backend (Optional[CacheBackend]): Shared store, None to build the index
+                in this process only
+            name (str): Key of the index in the shared store
+        """
+        self.ttl = ttl
+        self.backend = backend
+        self.name = name
+        self._index: Dict[str, List[str]] = {}
+        self._built_at: Optional[float] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @property
+    def is_stale(self) -> bool:
+        """Indicates if the index was never built or has outlived its TTL."""
+        return self._built_at is None or monotonic() - self._built_at > self.ttl
+
+    def build(self, coins: list, age: float = 0) -> None:
+        """Replace index contents with the given coins list.
+
+        Args:
+            coins (list): Coins list entries containing "id" and "symbol" keys
+            age (float): Seconds since the coins list was downloaded
+        """
+        index = defaultdict(list)
+
+        for coin in coins:
+            index[coin["symbol"].upper()].append(coin["id"])
+
+        self._index = dict(index)
+        self._built_at = monotonic() - age
+
+    async def refresh(self, loader: CoinsListLoader) -> None:
+        """Rebuild the index unless another caller already did so.
+
+        Args:
+            loader (CoinsListLoader): Coroutine function returning the coins list
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            if self.is_stale:
+                self.build(*await self._load_coins(loader))
+                logger.info("Symbol index built with %s symbols", len(self._index))
+
+    def schedule_refresh(self, loader: CoinsListLoader) -> None:
+        """Rebuild the index in the background, at most one rebuild at a time.
+
+        Args:
+            loader (CoinsListLoader): Coroutine function returning the coins list
+        """
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._background_refresh(loader))
+
+    async def lookup(self, symbol: str, loader: CoinsListLoader) -> List[str]:
+        """Retrieve coin ids for a symbol.
+
+        The first lookup builds the index. Afterwards stale entries keep being
+        served while a rebuild runs in the background.
+
+        Args:
+            symbol (str): Token symbol
+            loader (CoinsListLoader): Coroutine function returning the coins list
+
+        Returns:
+            list: Coin ids matching the symbol
+        """
+        if self._built_at is None:
+            await self.refresh(loader)
+        elif self.is_stale:
+            self.schedule_refresh(loader)
+        return list(self._index.get(symbol.upper(), ()))
+
+    async def _load_coins(self, loader: CoinsListLoader) -> Tuple[list, float]:
+        key = f"symbol_index:{self.name}"
+
+        if self.backend is None:
+            return await loader(), 0
+
+        try:
+            shared = await self.backend.get(key)
+        except CacheBackendUnavailable as error:
+            logger.warning("Unable to read shared symbol index: %s", error)
+            return await loader(), 0
+
+        if shared is not None:
+            downloaded_at, coins = shared
+            return coins, time.time() - downloaded_at
+
+        coins = await loader()
+
+        try:
+            await self.backend.set(key, (time.time(), coins), self.ttl)
+        except CacheBackendUnavailable as error:
+            logger.warning("Unable to write shared symbol index: %s", error)
+        return coins, 0
+
+    async def _background_refresh(self, loader: CoinsListLoader) -> None:
+        try:
+            await self.refresh(loader)
+        except Exception as error:
+            logger.error("Unable to refresh symbol index: %s", error)
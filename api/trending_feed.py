@@ -0,0 +1,118 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, NamedTuple, Optional
+
+from api.clients import clients
+from api.rate_limiter import Priority
+from config import TRENDING_REFRESH_INTERVAL, logger
+
+TrendingLoader = Callable[[], Awaitable[list]]
+
+
+class TrendingSnapshot(NamedTuple):
+    """Trending coins of one provider and the time they were retrieved."""
+
+    coins: list
+    updated_at: float
+
+
+class TrendingFeed:
+    """Trending coins polled in the background, last good snapshot per provider."""
+
+    def __init__(self, providers: Dict[str, TrendingLoader], interval: float):
+        """Create trending feed.
+
+        Args:
+            providers (Dict[str, TrendingLoader]): Coroutine functions returning
+                trending coins, by provider name
+            interval (float): Seconds between background refreshes
+        """
+        self.providers = providers
+        self.interval = interval
+        self.snapshots: Dict[str, TrendingSnapshot] = {}
+        self._refreshed_at: Optional[float] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def get(self) -> Dict[str, Optional[TrendingSnapshot]]:
+        """Retrieve latest snapshots, refreshing only if none was attempted yet.
+
+        Returns:
+            dict: Snapshot by provider name, None when a provider never succeeded
+        """
+        if self._refreshed_at is None:
+            await self.refresh()
+        return {name: self.snapshots.get(name) for name in self.providers}
+
+    async def refresh(self) -> None:
+        """Refresh every provider, keeping the previous snapshot of failing ones."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        requested_at = time.monotonic()
+
+        async with self._lock:
+            if self._refreshed_at is not None and self._refreshed_at >= requested_at:
+                return
+
+            results = await asyncio.gather(
+                *(loader() for loader in self.providers.values()),
+                return_exceptions=True,
+            )
+
+            for name, coins in zip(self.providers, results):
+                if isinstance(coins, BaseException):
+                    logger.error("Unable to refresh %s trending coins: %s", name, coins)
+                else:
+                    self.snapshots[name] = TrendingSnapshot(coins, time.time())
+            self._refreshed_at = time.monotonic()
+
+    def start(self) -> None:
+        """Start polling providers in the background."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._poll())
+
+    async def stop(self) -> None:
+        """Stop background polling."""
+        if self._task is not None:
+            self._task.cancel()
+
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                logger.info("Trending feed stopped")
+            self._task = None
+
+    async def _poll(self) -> None:
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.interval)
+
+
+async def get_coin_gecko_trending_coins() -> list:
+    """Trending coins on CoinGecko, requested at background priority.
+
+    Returns:
+        list: Trending coins
+    """
+    return await clients.coin_gecko.get_trending_coins(priority=Priority.BACKGROUND)
+
+
+async def get_coin_market_cap_trending_coins() -> list:
+    """Trending coins on CoinMarketCap, requested at background priority.
+
+    Returns:
+        list: Trending coins
+    """
+    return await clients.coin_market_cap.get_trending_coins(
+        priority=Priority.BACKGROUND
+    )
+
+
+trending_feed = TrendingFeed(
+    providers={
+        "CoinGecko": get_coin_gecko_trending_coins,
+        "CoinMarketCap": get_coin_market_cap_trending_coins,
+    },
+    interval=TRENDING_REFRESH_INTERVAL,
+)
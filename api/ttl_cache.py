@@ -0,0 +1,115 @@
+import asyncio
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from lru import LRU
+
+from api.cache_backends import CacheBackend, CacheBackendUnavailable
+from config import logger
+
+Loader = Callable[[], Awaitable[Any]]
+
+
+class TTLCache:
+    """Size-bounded cache whose entries expire and whose misses are coalesced.
+
+    With a shared backend, misses are looked up there before being loaded, so
+    every bot process serves what one of them loaded.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        backend: Optional[CacheBackend] = None,
+        namespace: str = "",
+    ):
+        """Create TTL cache.
+
+        Args:
+            maxsize (int): Maximum number of entries before least recently used
+                entries are evicted
+            ttl (float): Seconds an entry is served before it is loaded again
+            backend (Optional[CacheBackend]): Shared store, None to keep entries
+                in this process only
+            namespace (str): Prefix of the keys in the shared store
+        """
+        self.ttl = ttl
+        self.backend = backend
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._entries = LRU(maxsize)
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """Hit, miss and coalesced request counters."""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "size": len(self._entries),
+            "hit_ratio": (self.hits + self.coalesced) / lookups if lookups else 0,
+        }
+
+    async def get_or_load(self, key: Hashable, loader: Loader) -> Any:
+        """Retrieve cached value or load it once for all concurrent callers.
+
+        Args:
+            key (Hashable): Cache key
+            loader (Loader): Coroutine function producing the value on a miss
+
+        Returns:
+            Any: Cached or freshly loaded value
+        """
+        entry = self._entries.get(key)
+
+        if entry is not None and entry[0] > monotonic():
+            self.hits += 1
+            return entry[1]
+
+        inflight = self._inflight.get(key)
+
+        if inflight is None:
+            self.misses += 1
+            inflight = asyncio.ensure_future(self._load(key, loader))
+            self._inflight[key] = inflight
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(inflight)
+
+    async def _load(self, key: Hashable, loader: Loader) -> Any:
+        try:
+            shared_key = f"{self.namespace}:{key}"
+            value = await self._get_shared(shared_key)
+
+            if value is None:
+                value = await loader()
+                await self._set_shared(shared_key, value)
+
+            self._entries[key] = (monotonic() + self.ttl, value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _get_shared(self, key: str) -> Any:
+        if self.backend is None:
+            return None
+
+        try:
+            return await self.backend.get(key)
+        except CacheBackendUnavailable as error:
+            logger.warning("Unable to read shared cache: %s", error)
+            return None
+
+    async def _set_shared(self, key: str, value: Any) -> None:
+        if self.backend is None:
+            return
+
+        try:
+            await self.backend.set(key, value, self.ttl)
+        except CacheBackendUnavailable as error:
+            logger.warning("Unable to write shared cache: %s", error)
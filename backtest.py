@@ -0,0 +1,151 @@
+import asyncio
+import datetime
+from typing import List
+
+from pandas import DataFrame, concat, merge_asof, to_datetime
+
+from api.clients import clients
+from api.coingecko import COINGECKO_MARKETS_PAGE_SIZE
+from config import logger
+from constants import CHART_CANDLE_INTERVALS
+from ohlc_store import get_market_data
+
+SUBMISSION_COLUMNS = ["token_name", "symbol", "date_submitted"]
+CANDLE_COLUMNS = ["Date", "coin_id", "Close"]
+
+
+def time_frame_covering(since: datetime.date, today: datetime.date) -> str:
+    """
+    Smallest chart time frame reaching back to a date.
+
+    :param since: Oldest date needed
+    :param today: Current date
+    :return: One of CHART_CANDLE_INTERVALS
+    """
+    age = (today - since).days + 1
+
+    for days in CHART_CANDLE_INTERVALS:
+        if days != "max" and int(days) >= age:
+            return days
+    return "max"
+
+
+async def resolve_coins(symbols: List[str]) -> DataFrame:
+    """
+    Map symbols to the highest ranked CoinGecko coin, with its current price.
+
+    Candidates come from the local symbol index and are quoted in bulk, one
+    upstream request per 250 candidates.
+
+    :param symbols: Upper-case token symbols
+    :return: symbol, coin_id and price columns, unknown symbols are left out
+    """
+    coin_ids = [
+        coin_id
+        for symbol in symbols
+        for coin_id in await clients.coin_gecko.get_coin_ids(symbol=symbol)
+    ]
+    markets = []
+
+    for start in range(0, len(coin_ids), COINGECKO_MARKETS_PAGE_SIZE):
+        markets.extend(
+            await clients.coin_gecko.coin_markets_lookup(
+                ids=coin_ids[start : start + COINGECKO_MARKETS_PAGE_SIZE],
+                vs_currency="usd",
+            )
+        )
+
+    coins = DataFrame(
+        markets, columns=["id", "symbol", "current_price", "market_cap_rank"]
+    )
+    coins["symbol"] = coins.symbol.str.upper()
+    return (
+        coins.sort_values("market_cap_rank", na_position="last")
+        .drop_duplicates("symbol")
+        .rename(columns={"id": "coin_id", "current_price": "price"})
+        .loc[:, ["symbol", "coin_id", "price"]]
+    )
+
+
+async def load_candles(coin_ids: List[str], time_frame: str) -> DataFrame:
+    """
+    Read OHLC history of several coins from the local store, topping it up.
+
+    :param coin_ids: CoinGecko coin ids
+    :param time_frame: Number of days of history, one of CHART_CANDLE_INTERVALS
+    :return: Date, coin_id and Close columns, coins that failed are left out
+    """
+    markets = await asyncio.gather(
+        *(
+            get_market_data(ids=coin_id, time_frame=time_frame, base_coin="usd")
+            for coin_id in coin_ids
+        ),
+        return_exceptions=True,
+    )
+    candles = [DataFrame(columns=CANDLE_COLUMNS)]
+
+    for coin_id, market in zip(coin_ids, markets):
+        if isinstance(market, BaseException):
+            logger.error("Unable to load history of %s: %s", coin_id, market)
+        else:
+            candles.append(market.assign(coin_id=coin_id).loc[:, CANDLE_COLUMNS])
+    return concat(candles, ignore_index=True)
+
+
+def compute_returns(
+    submissions: DataFrame, coins: DataFrame, candles: DataFrame
+) -> DataFrame:
+    """
+    Return of every pick since it was submitted, all picks at once.
+
+    The entry price is the close of the first candle on or after the
+    submission date.
+
+    :param submissions: token_name, symbol and date_submitted columns
+    :param coins: symbol, coin_id and price columns
+    :param candles: Date, coin_id and Close columns
+    :return: Picks with entry price, current price and return, best first
+    """
+    picks = submissions.assign(
+        symbol=submissions.symbol.str.upper().str.strip(),
+        date=to_datetime(submissions.date_submitted),
+    ).merge(coins, on="symbol")
+    entries = merge_asof(
+        picks.sort_values("date"),
+        candles.astype({"Date": "datetime64[ns]", "Close": float}).sort_values("Date"),
+        left_on="date",
+        right_on="Date",
+        by="coin_id",
+        direction="forward",
+    )
+    entries["performance"] = entries.price / entries.Close - 1
+    return (
+        entries.dropna(subset=["performance"])
+        .rename(columns={"Close": "entry_price"})
+        .sort_values("performance", ascending=False, ignore_index=True)
+    )
+
+
+async def backtest_submissions(submissions: DataFrame) -> DataFrame:
+    """
+    Compute how past picks performed with bulk quotes and stored history.
+
+    Upstream requests grow with the number of distinct coins, not submissions,
+    and stored candles are only topped up.
+
+    :param submissions: token_name, symbol and date_submitted columns
+    :return: Picks with entry price, current price and return, best first
+    """
+    symbols = submissions.symbol.str.upper().str.strip().unique().tolist()
+    coins = await resolve_coins(symbols=symbols)
+    time_frame = time_frame_covering(
+        since=submissions.date_submitted.min(), today=datetime.date.today()
+    )
+    candles = await load_candles(coin_ids=coins.coin_id.tolist(), time_frame=time_frame)
+    logger.info(
+        "Backtesting %s submissions of %s coins over %s days",
+        len(submissions),
+        len(coins),
+        time_frame,
+    )
+    return compute_returns(submissions=submissions, coins=coins, candles=candles)
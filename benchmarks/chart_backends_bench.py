@@ -0,0 +1,140 @@
+"""
+Compare render time and memory of the chart backends.
+
+Every backend runs in a fresh interpreter so import cost and peak memory are
+measured in isolation. Memory is the peak RSS of the interpreter plus the
+resident memory of its child processes (kaleido's headless Chromium).
+
+Usage: python -m benchmarks.chart_backends_bench --renders 30 --candles 180
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess  # noqa: S404
+import sys
+import time
+from typing import Dict, Iterator
+
+from chart_backends import CHART_BACKENDS
+
+
+def child_processes(pid: int) -> Iterator[int]:
+    """
+    Recursively list child processes of a process.
+
+    :param pid: Parent process id
+    :return: Child process ids
+    """
+    for task in os.listdir(f"/proc/{pid}/task"):
+        with open(f"/proc/{pid}/task/{task}/children") as children:
+            for child in children.read().split():
+                yield int(child)
+                yield from child_processes(int(child))
+
+
+def resident_kb(pid: int) -> int:
+    """
+    Resident memory of a process.
+
+    :param pid: Process id
+    :return: Resident memory in KiB
+    """
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def measure(backend: str, renders: int, candles: int) -> Dict[str, float]:
+    """
+    Import backend and render charts in the current interpreter.
+
+    :param backend: Chart backend name
+    :param renders: Number of charts to render
+    :param candles: Number of candles per chart
+    :return: Timings in milliseconds and memory in MiB
+    """
+    from benchmarks.chart_rendering import create_market  # noqa: WPS433
+    from charts import render_candlestick_chart  # noqa: WPS433
+
+    market = create_market(candles=candles)
+    title = "Candlestick graph for Bitcoin (BTC)"
+    started = time.perf_counter()
+    render_candlestick_chart(market=market, title=title, backend=backend)
+    first_render = time.perf_counter() - started
+    timings = []
+
+    for _ in range(renders):
+        started = time.perf_counter()
+        render_candlestick_chart(market=market, title=title, backend=backend)
+        timings.append(time.perf_counter() - started)
+
+    timings.sort()
+    children_kb = sum(resident_kb(child) for child in child_processes(os.getpid()))
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "first_render_ms": first_render * 1000,
+        "median_ms": timings[len(timings) // 2] * 1000,
+        "p99_ms": timings[min(len(timings) - 1, int(len(timings) * 0.99))] * 1000,
+        "memory_mb": (peak_kb + children_kb) / 1024,
+    }
+
+
+def main(renders: int, candles: int) -> None:
+    """
+    Run every backend in a fresh interpreter and print results.
+
+    :param renders: Number of charts to render per backend
+    :param candles: Number of candles per chart
+    """
+    print(
+        f"{'backend':<8}{'first (ms)':>12}{'median (ms)':>13}"
+        f"{'p99 (ms)':>10}{'memory (MiB)':>14}"
+    )
+
+    for backend in CHART_BACKENDS:
+        output = subprocess.run(  # noqa: S603
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.chart_backends_bench",
+                "--backend",
+                backend,
+                "--renders",
+                str(renders),
+                "--candles",
+                str(candles),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        result = json.loads(output.splitlines()[-1])
+        print(
+            f"{backend:<8}{result['first_render_ms']:>12.0f}"
+            f"{result['median_ms']:>13.1f}{result['p99_ms']:>10.1f}"
+            f"{result['memory_mb']:>14.0f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--renders", type=int, default=30)
+    parser.add_argument("--candles", type=int, default=180)
+    parser.add_argument("--backend", choices=list(CHART_BACKENDS))
+    arguments = parser.parse_args()
+
+    if arguments.backend:
+        print(
+            json.dumps(
+                measure(
+                    backend=arguments.backend,
+                    renders=arguments.renders,
+                    candles=arguments.candles,
+                )
+            )
+        )
+    else:
+        main(renders=arguments.renders, candles=arguments.candles)
@@ -0,0 +1,146 @@
+"""
+Measure chart throughput and latency when many users click chart buttons at once.
+
+Compares rendering on the event loop (previous behaviour) with the warm
+process pool behind ``chart_renderer``. OHLC data is synthetic so the
+benchmark runs offline.
+
+Usage: python -m benchmarks.chart_rendering --clicks 40 --candles 180
+"""
+import argparse
+import asyncio
+import time
+from typing import List, Tuple
+
+import numpy
+from pandas import DataFrame, date_range
+
+from charts import ChartRenderer, render_candlestick_chart
+
+HEARTBEAT_INTERVAL = 0.01
+
+
+def create_market(candles: int) -> DataFrame:
+    """
+    Create random walk OHLC data.
+
+    :param candles: Number of candles
+    :return: OHLC data frame
+    """
+    closes = 100 + numpy.cumsum(numpy.random.normal(0, 1, candles))
+    opens = numpy.roll(closes, 1)
+    spread = numpy.abs(numpy.random.normal(0, 0.5, candles))
+    return DataFrame(
+        {
+            "Date": date_range(end="2022-06-01", periods=candles, freq="4H"),
+            "Open": opens,
+            "High": numpy.maximum(opens, closes) + spread,
+            "Low": numpy.minimum(opens, closes) - spread,
+            "Close": closes,
+        }
+    )
+
+
+def percentile(samples: List[float], rank: float) -> float:
+    """
+    Nearest-rank percentile.
+
+    :param samples: Measured values
+    :param rank: Percentile between 0 and 100
+    :return: Percentile value
+    """
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * rank / 100))]
+
+
+async def heartbeat(lags: List[float], stop: asyncio.Event) -> None:
+    """
+    Record how late the event loop wakes up a sleeping coroutine.
+
+    :param lags: List receiving each measured lag in seconds
+    :param stop: Event signalling the end of the measurement
+    """
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+        lags.append(time.perf_counter() - started - HEARTBEAT_INTERVAL)
+
+
+async def measure(render, clicks: int) -> Tuple[List[float], float]:
+    """
+    Render charts for clicks arriving at the same time.
+
+    :param render: Coroutine function rendering one chart
+    :param clicks: Number of simultaneous chart requests
+    :return: Latency of every request and the worst event loop lag in seconds
+    """
+    latencies: List[float] = []
+    lags: List[float] = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(heartbeat(lags, stop))
+    await asyncio.sleep(HEARTBEAT_INTERVAL)
+    arrived = time.perf_counter()
+
+    async def click() -> None:
+        await render()
+        latencies.append(time.perf_counter() - arrived)
+
+    await asyncio.gather(*(click() for _ in range(clicks)))
+    stop.set()
+    await monitor
+    return latencies, max(lags)
+
+
+async def main(clicks: int, candles: int, workers: int) -> None:
+    """
+    Run benchmark and print results.
+
+    :param clicks: Number of simultaneous chart requests
+    :param candles: Number of candles per chart
+    :param workers: Number of render worker processes
+    """
+    market = create_market(candles=candles)
+    title = "Candlestick graph for Bitcoin (BTC)"
+    renderer = ChartRenderer(workers=workers, queue_size=clicks)
+    renderer.start()
+    await renderer.render(market=market, title=title)
+    render_candlestick_chart(market=market, title=title)
+
+    async def inline_render() -> None:
+        render_candlestick_chart(market=market, title=title)
+
+    async def pool_render() -> None:
+        await renderer.render(market=market, title=title)
+
+    print(
+        f"{'mode':<8}{'charts/s':>10}{'p50 (ms)':>10}{'p99 (ms)':>10}"
+        f"{'max loop lag (ms)':>19}"
+    )
+
+    for mode, render in (("inline", inline_render), ("pool", pool_render)):
+        started = time.perf_counter()
+        latencies, max_lag = await measure(render=render, clicks=clicks)
+        wall_time = time.perf_counter() - started
+        print(
+            f"{mode:<8}{clicks / wall_time:>10.1f}"
+            f"{percentile(latencies, 50) * 1000:>10.0f}"
+            f"{percentile(latencies, 99) * 1000:>10.0f}"
+            f"{max_lag * 1000:>19.0f}"
+        )
+
+    renderer.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clicks", type=int, default=40)
+    parser.add_argument("--candles", type=int, default=180)
+    parser.add_argument("--workers", type=int, default=4)
+    arguments = parser.parse_args()
+    asyncio.run(
+        main(
+            clicks=arguments.clicks,
+            candles=arguments.candles,
+            workers=arguments.workers,
+        )
+    )
@@ -0,0 +1,109 @@
+"""
+Measure event loop lag caused by CoinMarketCap lookups.
+
+Compares calling the blocking CoinMarketCap client directly on the event loop
+(previous behaviour) against the executor-backed ``CoinMarketCap`` client.
+Upstream latency is simulated so the benchmark runs offline.
+
+Usage: python -m benchmarks.event_loop_lag --requests 20 --latency 0.2
+"""
+import argparse
+import asyncio
+import time
+from statistics import mean
+from types import SimpleNamespace
+from typing import Awaitable, Callable, List
+
+from api.coinmarketcap import CoinMarketCap
+
+HEARTBEAT_INTERVAL = 0.01
+
+
+class SlowCoinMarketCapAPI:
+    """Stand-in for CoinMarketCapAPI whose calls block like real HTTP requests."""
+
+    def __init__(self, latency: float):
+        """
+        Create slow CoinMarketCap API stand-in.
+
+        :param latency: Seconds each call blocks for
+        """
+        self.latency = latency
+
+    def cryptocurrency_quotes_latest(self, **kwargs) -> SimpleNamespace:
+        """
+        Block for the configured latency.
+
+        :return: Empty response
+        """
+        time.sleep(self.latency)
+        return SimpleNamespace(data={})
+
+
+async def heartbeat(lags: List[float], stop: asyncio.Event) -> None:
+    """
+    Record how late the event loop wakes up a sleeping coroutine.
+
+    :param lags: List receiving each measured lag in seconds
+    :param stop: Event signalling the end of the measurement
+    """
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+        lags.append(time.perf_counter() - started - HEARTBEAT_INTERVAL)
+
+
+async def measure(lookup: Callable[[], Awaitable], requests: int) -> SimpleNamespace:
+    """
+    Run lookups concurrently while measuring event loop lag.
+
+    :param lookup: Coroutine function performing one lookup
+    :param requests: Number of concurrent lookups
+    :return: Wall time and lag statistics
+    """
+    lags: List[float] = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(heartbeat(lags, stop))
+    await asyncio.sleep(HEARTBEAT_INTERVAL)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(lookup() for _ in range(requests)))
+    wall_time = time.perf_counter() - started
+
+    stop.set()
+    await monitor
+    return SimpleNamespace(wall_time=wall_time, max_lag=max(lags), mean_lag=mean(lags))
+
+
+async def main(requests: int, latency: float) -> None:
+    """
+    Run benchmark and print results.
+
+    :param requests: Number of concurrent lookups
+    :param latency: Simulated upstream latency in seconds
+    """
+    coin_market_cap = CoinMarketCap()
+    coin_market_cap.cmc = SlowCoinMarketCapAPI(latency=latency)
+
+    async def blocking_lookup() -> None:
+        coin_market_cap.cmc.cryptocurrency_quotes_latest(id="1", convert="usd")
+
+    async def executor_lookup() -> None:
+        await coin_market_cap.coin_lookup(ids="1")
+
+    print(f"{'mode':<10}{'wall (s)':>10}{'max lag (ms)':>15}{'mean lag (ms)':>15}")
+
+    for mode, lookup in (("blocking", blocking_lookup), ("executor", executor_lookup)):
+        result = await measure(lookup=lookup, requests=requests)
+        print(
+            f"{mode:<10}{result.wall_time:>10.2f}"
+            f"{result.max_lag * 1000:>15.1f}{result.mean_lag * 1000:>15.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.2)
+    arguments = parser.parse_args()
+    asyncio.run(main(requests=arguments.requests, latency=arguments.latency))
@@ -0,0 +1,245 @@
+"""
+Measure the bot's hot paths against recorded upstream responses.
+
+Recorded CoinGecko and CoinMarketCap responses are replayed by a local
+``UpstreamStub``, so the code behind /price, /trending and the chart buttons
+runs without Discord or the network. Paths ending in ``:miss`` ask for a new
+coin id on every call so caches never answer, ``:hit`` paths repeat one id.
+Rate limits are lifted, the stub answers as fast as it can unless
+``--upstream-latency`` is given. Results are printed and written as JSON so
+runs can be compared before deploying.
+
+Usage: python -m benchmarks.hot_paths --iterations 200 --output hot_paths.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import time
+from itertools import count
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from coinmarketcap_utils.coinmarketcap_utils import TrendingScraper
+from coinmarketcapapi import CoinMarketCapAPI
+from tortoise import Tortoise
+
+import api.coinmarketcap
+from api import rate_limiter
+from api.clients import clients
+from benchmarks.chart_rendering import percentile
+from benchmarks.upstream_stub import UpstreamStub
+from button import ChartButton
+from charts import chart_renderer
+from coin_stats import CoinStats
+from config import COIN_MARKET_CAP_API_KEY, logger
+from utils import generate_price_embed, get_coin_ids, get_coin_stats
+
+Operation = Callable[[], Awaitable[object]]
+
+
+class StubCoinMarketCapAPI(CoinMarketCapAPI):
+    """CoinMarketCap API client sending its requests to the upstream stub."""
+
+    def __init__(self, base_url: str):
+        """
+        Create CoinMarketCap API client for a base url.
+
+        :param base_url: Upstream stub CoinMarketCap url
+        """
+        super().__init__(COIN_MARKET_CAP_API_KEY)
+        # The client takes no base url argument
+        self._CoinMarketCapAPI__base_url = base_url  # noqa: WPS437
+
+
+class ReplayInteraction:
+    """Stand-in for a Discord interaction, keeping the follow-ups it is sent."""
+
+    def __init__(self):
+        """Create interaction answering both response and followup calls."""
+        self.response = self
+        self.followup = self
+        self.sent: List[dict] = []
+
+    async def defer(self) -> None:
+        """Acknowledge the interaction."""
+
+    async def send(self, **kwargs) -> None:
+        """
+        Record follow-up message.
+
+        :param kwargs: Message content, embed or file
+        """
+        self.sent.append(kwargs)
+
+
+async def click_chart_button(label: str) -> None:
+    """
+    Run chart button callback and check it answered with an image.
+
+    :param label: Coin id charted by the button
+    """
+    interaction = ReplayInteraction()
+    await ChartButton(label=label, symbol="BTC", days="30").callback(interaction)
+
+    if "file" not in interaction.sent[0]:
+        raise RuntimeError(f"Chart button answered without a chart: {interaction.sent}")
+
+
+def create_paths(coin_stats: CoinStats) -> Dict[str, Operation]:
+    """
+    Create one operation per measured path.
+
+    :param coin_stats: Coin stats rendered by the price embed path
+    :return: Coroutine function by path name
+    """
+    unique = count()
+
+    async def price_embed() -> None:
+        generate_price_embed(token_data=coin_stats)
+
+    return {
+        "get_coin_ids": lambda: get_coin_ids(symbol="BTC"),
+        "get_coin_stats:miss": lambda: get_coin_stats(coin_id=f"coin-{next(unique)}"),
+        "get_coin_stats:hit": lambda: get_coin_stats(coin_id="bitcoin"),
+        "generate_price_embed": price_embed,
+        "coin_market_lookup": lambda: clients.coin_gecko.coin_market_lookup(
+            ids="bitcoin", time_frame="30", base_coin="usd"
+        ),
+        "chart_button:miss": lambda: click_chart_button(f"coin-{next(unique)}"),
+        "chart_button:hit": lambda: click_chart_button("bitcoin"),
+        "coinmarketcap:get_coin_ids": lambda: clients.coin_market_cap.get_coin_ids(
+            symbol="BTC"
+        ),
+        "coinmarketcap:coin_lookup": lambda: clients.coin_market_cap.coin_lookup(
+            ids="1"
+        ),
+        "coinmarketcap:trending": clients.coin_market_cap.get_trending_coins,
+    }
+
+
+async def measure(
+    operation: Operation, iterations: int, concurrency: int
+) -> Dict[str, float]:
+    """
+    Run operation repeatedly with a bounded number of calls in flight.
+
+    :param operation: Coroutine function exercising the path
+    :param iterations: Number of calls
+    :param concurrency: Maximum number of simultaneous calls
+    :return: Throughput and latency percentiles
+    """
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await operation()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(call() for _ in range(iterations)))
+    wall_time = time.perf_counter() - started
+    return {
+        "iterations": iterations,
+        "concurrency": concurrency,
+        "throughput": iterations / wall_time,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+async def main(
+    iterations: int,
+    concurrency: int,
+    upstream_latency: float,
+    db_url: str,
+    selected: Optional[List[str]],
+    output: Optional[str],
+) -> None:
+    """
+    Run benchmark, print results and write them as JSON.
+
+    :param iterations: Number of calls per path
+    :param concurrency: Maximum number of simultaneous calls per path
+    :param upstream_latency: Seconds the stub waits before answering
+    :param db_url: Database holding stored OHLC candles
+    :param selected: Names of the paths to measure, all when omitted
+    :param output: Path of the JSON results file, if any
+    """
+    logger.setLevel(logging.WARNING)
+    stub = UpstreamStub(latency=upstream_latency)
+    await stub.start()
+    clients.coin_gecko_url = stub.coin_gecko_url
+    clients.coin_market_cap.cmc = StubCoinMarketCapAPI(
+        base_url=stub.coin_market_cap_url
+    )
+    api.coinmarketcap.trending_scraper = TrendingScraper(url=stub.trending_url)
+    rate_limiter.set_limits({})
+    await Tortoise.init(db_url=db_url, modules={"models": ["models"]})
+    await Tortoise.generate_schemas()
+    chart_renderer.start()
+
+    paths = create_paths(coin_stats=await get_coin_stats(coin_id="bitcoin"))
+    results: Dict[str, Dict[str, float]] = {}
+    print(
+        f"{'path':<28}{'calls/s':>10}{'p50 (ms)':>10}"
+        f"{'p95 (ms)':>10}{'p99 (ms)':>10}"
+    )
+
+    try:
+        for name in selected or paths:
+            # Warm up connections, the symbol index and the chart workers
+            await paths[name]()
+            results[name] = await measure(paths[name], iterations, concurrency)
+            print(
+                f"{name:<28}{results[name]['throughput']:>10.1f}"
+                f"{results[name]['p50_ms']:>10.2f}"
+                f"{results[name]['p95_ms']:>10.2f}"
+                f"{results[name]['p99_ms']:>10.2f}"
+            )
+    finally:
+        chart_renderer.close()
+        await clients.close()
+        await Tortoise.close_connections()
+        await stub.stop()
+
+    if output:
+        with open(output, "w", encoding="utf-8") as results_file:
+            json.dump(
+                {
+                    "created_at": time.time(),
+                    "python": platform.python_version(),
+                    "upstream_latency": upstream_latency,
+                    "upstream_requests": dict(stub.requests),
+                    "paths": results,
+                },
+                results_file,
+                indent=2,
+            )
+        print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--upstream-latency", type=float, default=0, help="Seconds per response"
+    )
+    parser.add_argument("--db-url", default="sqlite://:memory:")
+    parser.add_argument("--paths", nargs="+", help="Paths to measure, default all")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    arguments = parser.parse_args()
+    asyncio.run(
+        main(
+            iterations=arguments.iterations,
+            concurrency=arguments.concurrency,
+            upstream_latency=arguments.upstream_latency,
+            db_url=arguments.db_url,
+            selected=arguments.paths,
+            output=arguments.output,
+        )
+    )
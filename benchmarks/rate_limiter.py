@@ -0,0 +1,134 @@
+"""
+Exercise the upstream rate limiter against a local stub server.
+
+The stub enforces its own per-second quota and answers with HTTP 429 and a
+Retry-After header once it is exceeded. Interactive and background requests
+are fired together through ``RateLimiter`` to show how many requests were
+rejected upstream and how long each priority waited.
+
+Usage: python -m benchmarks.rate_limiter --interactive 40 --background 40
+"""
+import argparse
+import asyncio
+import time
+from collections import Counter
+from statistics import median
+from typing import Dict, List
+
+from aiohttp import ClientSession, web
+
+from api.rate_limiter import Priority, RateLimiter, RateLimitExceeded
+
+STUB_QUOTA_PER_SECOND = 10
+
+
+def create_stub_app(responses: Counter) -> web.Application:
+    """
+    Create stub upstream enforcing a per-second quota.
+
+    :param responses: Counter receiving the status code of every response
+    :return: Stub aiohttp application
+    """
+    window = {"second": 0, "requests": 0}
+
+    async def handle(request: web.Request) -> web.Response:
+        second = int(time.monotonic())
+
+        if window["second"] != second:
+            window.update(second=second, requests=0)
+        window["requests"] += 1
+
+        if window["requests"] > STUB_QUOTA_PER_SECOND:
+            responses[429] += 1
+            return web.json_response(
+                {"error": "rate limited"}, status=429, headers={"Retry-After": "1"}
+            )
+        responses[200] += 1
+        return web.json_response({"id": request.match_info["coin_id"]})
+
+    app = web.Application()
+    app.router.add_get("/coins/{coin_id}", handle)
+    return app
+
+
+async def fetch(session: ClientSession, url: str) -> dict:
+    """
+    Fetch stub coin, surfacing HTTP 429 as RateLimitExceeded.
+
+    :param session: HTTP session
+    :param url: Stub url
+    :return: Stub response body
+    """
+    async with session.get(url) as response:
+        if response.status == 429:
+            retry_after = response.headers.get("Retry-After")
+            raise RateLimitExceeded(
+                retry_after=float(retry_after) if retry_after else None
+            )
+        return await response.json()
+
+
+async def main(interactive: int, background: int, limit: float) -> None:
+    """
+    Run benchmark and print results.
+
+    :param interactive: Number of interactive requests
+    :param background: Number of background requests
+    :param limit: Requests per minute allowed by the rate limiter
+    """
+    responses: Counter = Counter()
+    runner = web.AppRunner(create_stub_app(responses))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # noqa: WPS437
+    rate_limiter = RateLimiter(limits={"stub": limit}, backoff=0.5)
+    latencies: Dict[Priority, List[float]] = {priority: [] for priority in Priority}
+
+    async with ClientSession() as session:
+
+        async def timed_request(index: int, priority: Priority) -> None:
+            started = time.perf_counter()
+            await rate_limiter.call(
+                "stub",
+                "coins",
+                fetch,
+                session,
+                f"http://127.0.0.1:{port}/coins/{index}",
+                priority=priority,
+            )
+            latencies[priority].append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(timed_request(index, Priority.BACKGROUND) for index in range(background)),
+            *(
+                timed_request(index, Priority.INTERACTIVE)
+                for index in range(interactive)
+            ),
+        )
+        wall_time = time.perf_counter() - started
+
+    await runner.cleanup()
+    print(f"wall time: {wall_time:.2f}s, upstream responses: {dict(responses)}")
+
+    for priority, samples in latencies.items():
+        print(
+            f"{priority.name.lower():<12} median wait {median(samples):.2f}s, "
+            f"max wait {max(samples):.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--interactive", type=int, default=40)
+    parser.add_argument("--background", type=int, default=40)
+    parser.add_argument("--limit", type=float, default=STUB_QUOTA_PER_SECOND * 54)
+    arguments = parser.parse_args()
+    asyncio.run(
+        main(
+            interactive=arguments.interactive,
+            background=arguments.background,
+            limit=arguments.limit,
+        )
+    )
@@ -0,0 +1,92 @@
+"""
+Report import time of the bot entry point, per module.
+
+Imports ``main`` in a fresh interpreter with ``-X importtime`` and sums the
+time spent in the modules of every top-level package, so a dependency pulled
+back onto the startup path shows up by name. ``--budget`` fails the run when
+the total exceeds it, to keep startup from regressing.
+
+Usage: python -m benchmarks.startup --top 15 --budget 2.5
+"""
+import argparse
+import re
+import subprocess  # noqa: S404
+import sys
+from typing import Counter, List, Optional, Tuple
+
+# Loaded lazily, importing main must not pull them in
+HEAVY_MODULES = ("pandas", "numpy", "plotly", "kaleido", "PIL")
+IMPORT_TIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| \s*(\S+)")
+
+
+def measure_imports(module: str) -> List[Tuple[str, int, int]]:
+    """
+    Import a module in a new interpreter and record the time of every import.
+
+    :param module: Module to import
+    :return: Imported module, own and cumulative microseconds
+    """
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imports = []
+
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+
+        if match:
+            own, cumulative, name = match.groups()
+            imports.append((name, int(own), int(cumulative)))
+    return imports
+
+
+def summarize(imports: List[Tuple[str, int, int]]) -> Counter[str]:
+    """
+    Import time of each top-level package, summed over its modules.
+
+    :param imports: Imported module, own and cumulative microseconds
+    :return: Microseconds by package
+    """
+    packages: Counter[str] = Counter()
+
+    for name, own, _ in imports:
+        packages[name.split(".")[0]] += own
+    return packages
+
+
+def main(module: str, top: int, budget: Optional[float]) -> None:
+    """
+    Run benchmark and print results.
+
+    :param module: Module to import
+    :param top: Number of packages listed
+    :param budget: Seconds the import may take, no limit when omitted
+    """
+    imports = measure_imports(module)
+    packages = summarize(imports)
+    total = next(cumulative for name, _, cumulative in imports if name == module) / 1e6
+    loaded = {name.split(".")[0] for name, _, _ in imports}
+
+    print(f"{'package':30} {'import (ms)':>12}")
+
+    for package, own in packages.most_common(top):
+        print(f"{package:30} {own / 1e3:12.1f}")
+
+    print(f"\nimport {module}: {total:.2f}s")
+    heavy = [name for name in HEAVY_MODULES if name in loaded]
+    print(f"heavy modules loaded: {', '.join(heavy) or 'none'}")
+
+    if budget is not None and total > budget:
+        sys.exit(f"import {module} took {total:.2f}s, budget is {budget:.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget", type=float)
+    args = parser.parse_args()
+    main(module=args.module, top=args.top, budget=args.budget)
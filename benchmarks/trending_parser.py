@@ -0,0 +1,91 @@
+"""
+Measure parsing speed of the native CoinMarketCap trending scraper.
+
+Parses saved trending pages through ``TrendingScraper.parse`` so no network
+is needed. Parsing runs with the GIL released, so the same pages are also
+parsed from several threads to show throughput scaling. When no fixture is
+given a synthetic page of the same shape is generated.
+
+Usage: python -m benchmarks.trending_parser --fixture trending.html --parses 200
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from coinmarketcap_utils.coinmarketcap_utils import TrendingScraper
+
+from benchmarks.chart_rendering import percentile
+
+
+def create_page(rows: int) -> str:
+    """
+    Create trending page with the table layout the scraper expects.
+
+    :param rows: Number of trending tokens
+    :return: HTML page
+    """
+    table_rows = "".join(
+        f"<tr><td><a href='/currencies/coin-{index}/'><div>"
+        f"<p>Coin {index}</p><p>C{index}</p></div></a></td>"
+        f"<td>{'<span>filler</span>' * 20}</td></tr>"
+        for index in range(rows)
+    )
+    return f"<html><body><table><tbody>{table_rows}</tbody></table></body></html>"
+
+
+def parse(html: str) -> float:
+    """
+    Parse page once.
+
+    :param html: Trending page
+    :return: Seconds spent parsing
+    """
+    started = time.perf_counter()
+    TrendingScraper.parse(html)
+    return time.perf_counter() - started
+
+
+def main(fixture: Optional[str], parses: int, threads: List[int]) -> None:
+    """
+    Run benchmark and print results.
+
+    :param fixture: Path of a saved trending page, synthetic page when omitted
+    :param parses: Number of parses per run
+    :param threads: Thread counts to parse with
+    """
+    if fixture:
+        with open(fixture) as fixture_file:
+            html = fixture_file.read()
+    else:
+        html = create_page(rows=100)
+
+    print(
+        f"page: {len(html) / 1024:.0f} KiB, {len(TrendingScraper.parse(html))} tokens"
+    )
+    print(f"{'threads':<8}{'parses/s':>10}{'p50 (ms)':>10}{'p99 (ms)':>10}")
+
+    for thread_count in threads:
+        with ThreadPoolExecutor(max_workers=thread_count) as executor:
+            started = time.perf_counter()
+            timings = list(executor.map(parse, [html] * parses))
+            wall_time = time.perf_counter() - started
+
+        print(
+            f"{thread_count:<8}{parses / wall_time:>10.0f}"
+            f"{percentile(timings, 50) * 1000:>10.2f}"
+            f"{percentile(timings, 99) * 1000:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fixture")
+    parser.add_argument("--parses", type=int, default=200)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4])
+    arguments = parser.parse_args()
+    main(
+        fixture=arguments.fixture,
+        parses=arguments.parses,
+        threads=arguments.threads,
+    )
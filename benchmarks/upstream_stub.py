@@ -0,0 +1,128 @@
+"""
+Local server replaying recorded CoinGecko and CoinMarketCap responses.
+
+Fixtures live in ``benchmarks/fixtures``. Every coin id is answered with the
+recorded Bitcoin lookup, so benchmarks can miss caches by asking for distinct
+ids. OHLC timestamps are shifted on every request so the newest candle is the
+current one, as it would be upstream.
+"""
+import asyncio
+import json
+import os
+import time
+from collections import Counter
+from typing import Optional
+
+from aiohttp import web
+
+FIXTURES_DIRECTORY = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def load_fixture(name: str) -> str:
+    """
+    Read recorded response.
+
+    :param name: Path relative to the fixtures directory
+    :return: Response body
+    """
+    with open(os.path.join(FIXTURES_DIRECTORY, name), encoding="utf-8") as fixture:
+        return fixture.read()
+
+
+def shift_candles(candles: list, now: int) -> list:
+    """
+    Move recorded candles so the newest one is the latest completed candle.
+
+    :param candles: [timestamp, open, high, low, close] rows in milliseconds
+    :param now: Current time in milliseconds
+    :return: Shifted candles, still aligned to their interval
+    """
+    step = candles[1][0] - candles[0][0]
+    offset = now // step * step - candles[-1][0]
+    return [[timestamp + offset, *prices] for timestamp, *prices in candles]
+
+
+class UpstreamStub:
+    """Replays fixtures for the CoinGecko API, CoinMarketCap API and website."""
+
+    def __init__(self, latency: float = 0):
+        """
+        Create stub server.
+
+        :param latency: Seconds added to every response, simulating upstream RTT
+        """
+        self.latency = latency
+        self.requests: Counter = Counter()
+        self.url = ""
+        self._runner: Optional[web.AppRunner] = None
+        self._ohlc = json.loads(load_fixture("coingecko/ohlc.json"))
+        self._routes = {
+            "/coingecko/coins/list": load_fixture("coingecko/coins_list.json"),
+            "/coingecko/coins/{coin_id}/": load_fixture("coingecko/coin.json"),
+            "/coinmarketcap/{version}/cryptocurrency/map": load_fixture(
+                "coinmarketcap/map.json"
+            ),
+            "/coinmarketcap/{version}/cryptocurrency/info": load_fixture(
+                "coinmarketcap/info.json"
+            ),
+            "/coinmarketcap/{version}/cryptocurrency/quotes/latest": load_fixture(
+                "coinmarketcap/quotes_latest.json"
+            ),
+        }
+
+    @property
+    def coin_gecko_url(self) -> str:
+        """CoinGecko API base url."""
+        return f"{self.url}coingecko/"
+
+    @property
+    def coin_market_cap_url(self) -> str:
+        """CoinMarketCap API base url."""
+        return f"{self.url}coinmarketcap/"
+
+    @property
+    def trending_url(self) -> str:
+        """CoinMarketCap trending page url."""
+        return f"{self.url}trending-cryptocurrencies"
+
+    async def start(self) -> None:
+        """Listen on a free local port."""
+        app = web.Application()
+
+        for path, body in self._routes.items():
+            app.router.add_get(path, self._replay(path, body, "application/json"))
+        app.router.add_get(
+            "/trending-cryptocurrencies",
+            self._replay("/trending-cryptocurrencies", load_fixture("trending.html")),
+        )
+        app.router.add_get("/coingecko/coins/{coin_id}/ohlc", self._handle_ohlc)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]  # noqa: WPS437
+        self.url = f"http://127.0.0.1:{port}/"
+
+    async def stop(self) -> None:
+        """Stop listening."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def _replay(self, path: str, body: str, content_type: str = "text/html"):
+        async def handle(request: web.Request) -> web.Response:
+            await self._respond(path)
+            return web.Response(text=body, content_type=content_type)
+
+        return handle
+
+    async def _handle_ohlc(self, request: web.Request) -> web.Response:
+        await self._respond("/coingecko/coins/{coin_id}/ohlc")
+        return web.json_response(shift_candles(self._ohlc, int(time.time() * 1000)))
+
+    async def _respond(self, path: str) -> None:
+        self.requests[path] += 1
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
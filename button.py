@@ -1,32 +1,41 @@
 import tempfile
+from concurrent.futures.process import BrokenProcessPool
 from io import BufferedReader, BytesIO
 
-from discord import Interaction, File
+from discord import Embed, Interaction, File
 from discord.enums import ButtonStyle
 from discord.ui import Button
 from inflection import humanize
-from plotly.graph_objects import Candlestick, Figure
-from plotly.io import to_image
+from tortoise.exceptions import BaseORMException
 
-from api.coingecko import CoinGecko
+from api.exchange_rates import ExchangeRateUnavailable, exchange_rates
+from charts import ChartRendererBusy, chart_cache, chart_renderer
+from config import logger
+from constants import CHART_CANDLE_INTERVALS
+from ohlc_store import OHLC_COLUMNS, get_market_data
+from utils import COIN_STATS_ERRORS
+
+# Market data fetch, OHLC store and render worker failures
+CHART_ERRORS = (*COIN_STATS_ERRORS, BaseORMException, BrokenProcessPool)
 
 
 class ChartButton(Button):
     """Custom button for creating charts based on provided cryptocurrency symbol."""
 
-    def __init__(self, label: str, symbol: str, days: str):
+    def __init__(self, label: str, symbol: str, days: str, currency: str = "usd"):
         """
         Create ChartButton instance.
 
         :param label: ChartButton label
         :param symbol: Symbol of cryptocurrency token
         :param days: Number of days to chart
+        :param currency: Currency the prices are charted in
         """
         super(ChartButton, self).__init__(label=label, style=ButtonStyle.primary)
-        self.coin_gecko = CoinGecko()
         self.token_ids = label
         self.symbol = symbol
         self.days = days
+        self.currency = currency
 
     async def callback(self, interaction: Interaction) -> None:
         """
@@ -34,37 +43,71 @@ class ChartButton(Button):
 
         :param interaction: Discord bot interaction
         """
-        humanized_token_ids = humanize(self.token_ids)
-        market = await self.coin_gecko.coin_market_lookup(
-            ids=self.token_ids, time_frame=self.days, base_coin="usd"
-        )
-        fig = Figure(
-            data=[
-                Candlestick(
-                    x=market.Date,
-                    open=market.Open,
-                    high=market.High,
-                    low=market.Low,
-                    close=market.Close,
-                ),
-            ]
-        )
-        fig.update_layout(
-            title=f"Candlestick graph for {humanized_token_ids} ({self.symbol})",
-            xaxis_title="Date",
-            yaxis_title="Price (USD)",
-            xaxis_rangeslider_visible=False,
-        )
+        await interaction.response.defer()
 
-        fig.update_yaxes(tickprefix="$")
+        try:
+            image = await chart_cache.get_or_render(
+                key=(self.token_ids, self.days, self.currency),
+                ttl=CHART_CANDLE_INTERVALS[self.days],
+                render=self.render_chart,
+            )
+        except ChartRendererBusy as error:
+            logger.warning(error)
+            await interaction.followup.send(
+                embed=Embed(
+                    title="Too many charts are being generated. Try again shortly",
+                    colour=0x338E86,
+                )
+            )
+            return
+        except ExchangeRateUnavailable as error:
+            logger.error(error)
+            await interaction.followup.send(
+                embed=Embed(
+                    title=f"Unable to chart in {self.currency.upper()} at this time",
+                    colour=0x338E86,
+                )
+            )
+            return
+        except CHART_ERRORS as error:
+            logger.error(error)
+            await interaction.followup.send(
+                embed=Embed(
+                    title="Unable to gather charting data at this moment",
+                    colour=0x338E86,
+                )
+            )
+            return
 
-        await interaction.response.send_message(
+        await interaction.followup.send(
             file=File(
-                BufferedReader(
-                    BytesIO(  # type: ignore
-                        to_image(fig, format="png", engine="kaleido")
-                    )
-                ),
+                BufferedReader(BytesIO(image)),  # type: ignore
                 filename=f"{tempfile.NamedTemporaryFile()}.png",
             )
         )
+
+    async def render_chart(self) -> bytes:
+        """
+        Fetch market data and render it as a candlestick chart.
+
+        :return: PNG image bytes
+        """
+        humanized_token_ids = humanize(self.token_ids)
+        # Candles are stored in USD once and converted with the shared rates
+        market = await get_market_data(
+            ids=self.token_ids, time_frame=self.days, base_coin="usd"
+        )
+
+        conversion = await exchange_rates.get_conversion("usd", self.currency)
+
+        if self.currency != "usd":
+            market = market.copy()
+            market[OHLC_COLUMNS[1:]] *= conversion.rate
+
+        return await chart_renderer.render(
+            market=market,
+            title=f"Candlestick graph for {humanized_token_ids} ({self.symbol}) "
+            f"in {self.currency.upper()}",
+            currency=conversion.currency,
+            unit=conversion.unit,
+        )
@@ -0,0 +1,320 @@
+import math
+from abc import ABC, abstractmethod
+from io import BytesIO
+from typing import Dict, List, Type
+
+import numpy
+from pandas import DataFrame
+
+
+def is_unit_prefix(unit: str) -> bool:
+    """
+    Indicates if a currency unit is written before amounts.
+
+    :param unit: Unit of the currency, e.g. € or BTC
+    :return: True for symbols such as $ or €, False for codes such as BTC
+    """
+    return not unit.isalpha()
+
+
+class ChartBackend(ABC):
+    """Renders OHLC market data as a candlestick chart PNG."""
+
+    @abstractmethod
+    def render(
+        self, market: DataFrame, title: str, currency: str = "usd", unit: str = "$"
+    ) -> bytes:
+        """
+        Render candlestick chart as a PNG image.
+
+        :param market: OHLC data with Date, Open, High, Low and Close columns
+        :param title: Chart title
+        :param currency: Currency of the prices, e.g. eur
+        :param unit: Unit of the currency, e.g. € or BTC
+        :return: PNG image bytes
+        """
+
+
+class PlotlyChartBackend(ChartBackend):
+    """Candlestick charts drawn by plotly and exported through kaleido."""
+
+    def render(
+        self, market: DataFrame, title: str, currency: str = "usd", unit: str = "$"
+    ) -> bytes:
+        """
+        Render candlestick chart as a PNG image.
+
+        :param market: OHLC data with Date, Open, High, Low and Close columns
+        :param title: Chart title
+        :param currency: Currency of the prices, e.g. eur
+        :param unit: Unit of the currency, e.g. € or BTC
+        :return: PNG image bytes
+        """
+        from plotly.io import to_image  # noqa: WPS433
+
+        fig = self.build_figure(market, title, currency, unit)
+        return to_image(fig, format="png", engine="kaleido")
+
+    @staticmethod
+    def build_figure(market: DataFrame, title: str, currency: str, unit: str):
+        """
+        Lay out candlestick chart as a plotly figure.
+
+        :param market: OHLC data with Date, Open, High, Low and Close columns
+        :param title: Chart title
+        :param currency: Currency of the prices, e.g. eur
+        :param unit: Unit of the currency, e.g. € or BTC
+        :return: plotly Figure
+        """
+        from plotly.graph_objects import Candlestick, Figure  # noqa: WPS433
+
+        fig = Figure(
+            data=[
+                Candlestick(
+                    x=market.Date,
+                    open=market.Open,
+                    high=market.High,
+                    low=market.Low,
+                    close=market.Close,
+                ),
+            ]
+        )
+        fig.update_layout(
+            title=title,
+            xaxis_title="Date",
+            yaxis_title=f"Price ({currency.upper()})",
+            xaxis_rangeslider_visible=False,
+        )
+
+        if is_unit_prefix(unit):
+            fig.update_yaxes(tickprefix=unit)
+        else:
+            fig.update_yaxes(ticksuffix=f" {unit}")
+        return fig
+
+
+class NativeChartBackend(ChartBackend):
+    """Candlestick charts drawn straight into a NumPy pixel buffer."""
+
+    width = 700
+    height = 500
+    margin_left = 90
+    margin_right = 30
+    margin_top = 60
+    margin_bottom = 60
+    paper_colour = (255, 255, 255)
+    plot_colour = (229, 236, 246)
+    grid_colour = (255, 255, 255)
+    text_colour = (42, 63, 95)
+    increasing_colour = (61, 153, 112)
+    decreasing_colour = (255, 65, 54)
+
+    def render(
+        self, market: DataFrame, title: str, currency: str = "usd", unit: str = "$"
+    ) -> bytes:
+        """
+        Render candlestick chart as a PNG image.
+
+        :param market: OHLC data with Date, Open, High, Low and Close columns
+        :param title: Chart title
+        :param currency: Currency of the prices, e.g. eur
+        :param unit: Unit of the currency, e.g. € or BTC
+        :return: PNG image bytes
+        """
+        from PIL import Image, ImageDraw, ImageFont  # noqa: WPS433
+
+        plot_width = self.width - self.margin_left - self.margin_right
+        plot_height = self.height - self.margin_top - self.margin_bottom
+        pixels = numpy.empty((self.height, self.width, 3), dtype=numpy.uint8)
+        pixels[:] = self.paper_colour
+        plot = pixels[
+            self.margin_top : self.margin_top + plot_height,
+            self.margin_left : self.margin_left + plot_width,
+        ]
+        plot[:] = self.plot_colour
+        # Skip candles with upstream gaps, as plotly does
+        market = market.dropna(subset=["Open", "High", "Low", "Close"])
+
+        opens, highs, lows, closes = (
+            market[column].to_numpy(dtype=float)
+            for column in ("Open", "High", "Low", "Close")
+        )
+        ticks = self.price_ticks(lows.min(), highs.max()) if len(market) else []
+        low, high = (ticks[0], ticks[-1]) if ticks else (0, 1)
+
+        def to_row(prices: numpy.ndarray) -> numpy.ndarray:
+            scaled = (high - prices) / ((high - low) or 1) * (plot_height - 1)
+            return numpy.rint(scaled).astype(int)
+
+        for tick in ticks:
+            plot[to_row(numpy.array([tick]))[0], :] = self.grid_colour
+
+        if len(market):
+            self.draw_candles(
+                plot, to_row(opens), to_row(highs), to_row(lows), to_row(closes)
+            )
+
+        image = Image.fromarray(pixels)
+        draw = ImageDraw.Draw(image)
+        font = ImageFont.load_default()
+        draw.text((self.margin_left, 20), title, fill=self.text_colour, font=font)
+
+        for tick, row in zip(ticks, to_row(numpy.array(ticks))):
+            label = self.format_price(tick, ticks[1] - ticks[0], unit)
+            label_width = draw.textlength(label, font=font)
+            draw.text(
+                (self.margin_left - label_width - 6, self.margin_top + row - 6),
+                label,
+                fill=self.text_colour,
+                font=font,
+            )
+
+        for position, label in self.date_ticks(market.Date):
+            column = self.margin_left + (position + 0.5) * plot_width / len(market)
+            label_width = draw.textlength(label, font=font)
+            draw.text(
+                (
+                    min(column - label_width / 2, self.width - label_width - 2),
+                    self.margin_top + plot_height + 6,
+                ),
+                label,
+                fill=self.text_colour,
+                font=font,
+            )
+
+        draw.text(
+            (self.margin_left + plot_width / 2 - 12, self.height - 24),
+            "Date",
+            fill=self.text_colour,
+            font=font,
+        )
+        axis_title = Image.new("RGB", (100, 14), self.paper_colour)
+        ImageDraw.Draw(axis_title).text(
+            (0, 0), f"Price ({currency.upper()})", fill=self.text_colour, font=font
+        )
+        image.paste(
+            axis_title.rotate(90, expand=True),
+            (4, self.margin_top + plot_height // 2 - 50),
+        )
+
+        buffer = BytesIO()
+        image.save(buffer, format="png")
+        return buffer.getvalue()
+
+    def draw_candles(
+        self,
+        plot: numpy.ndarray,
+        open_rows: numpy.ndarray,
+        high_rows: numpy.ndarray,
+        low_rows: numpy.ndarray,
+        close_rows: numpy.ndarray,
+    ) -> None:
+        """
+        Fill candle bodies and wicks into the plot area in one vectorised pass.
+
+        :param plot: Plot area pixels, modified in place
+        :param open_rows: Pixel row of every open price
+        :param high_rows: Pixel row of every high price
+        :param low_rows: Pixel row of every low price
+        :param close_rows: Pixel row of every close price
+        """
+        plot_height, plot_width = plot.shape[:2]
+        candles = len(open_rows)
+        slot = plot_width / candles
+        columns = numpy.arange(plot_width)
+        candle = numpy.minimum((columns / slot).astype(int), candles - 1)
+        offset = columns - candle * slot
+        body_width = max(1.0, slot * 0.6)
+        in_body = numpy.abs(offset - slot / 2) <= body_width / 2
+        in_wick = numpy.floor(offset) == math.floor(slot / 2)
+        increasing = close_rows <= open_rows
+
+        body_top = numpy.minimum(open_rows, close_rows)[candle]
+        body_bottom = numpy.maximum(open_rows, close_rows)[candle]
+        rows = numpy.arange(plot_height)[:, None]
+        mask = (in_body & (rows >= body_top) & (rows <= body_bottom)) | (
+            in_wick & (rows >= high_rows[candle]) & (rows <= low_rows[candle])
+        )
+        colours = numpy.where(
+            increasing[candle][:, None],
+            self.increasing_colour,
+            self.decreasing_colour,
+        ).astype(numpy.uint8)
+        plot[mask] = numpy.broadcast_to(colours, (plot_height, plot_width, 3))[mask]
+
+    @staticmethod
+    def price_ticks(low: float, high: float, count: int = 6) -> List[float]:
+        """
+        Evenly spaced round prices covering the given range.
+
+        :param low: Lowest price
+        :param high: Highest price
+        :param count: Approximate number of ticks
+        :return: Tick prices
+        """
+        raw_step = (high - low) / (count - 1) or abs(high) or 1
+        magnitude = 10 ** math.floor(math.log10(raw_step))
+        step = next(
+            magnitude * factor
+            for factor in (1, 2, 5, 10)
+            if magnitude * factor >= raw_step
+        )
+        first = math.floor(low / step)
+        last = max(math.ceil(high / step), first + 1)
+        return [index * step for index in range(first, last + 1)]
+
+    @staticmethod
+    def format_price(price: float, step: float, unit: str = "$") -> str:
+        """
+        Format price in a currency with enough decimals for the tick step.
+
+        :param price: Price to format
+        :param step: Distance between ticks
+        :param unit: Unit of the currency, e.g. € or BTC
+        :return: Formatted price, e.g. $1,000 or 0.25 BTC
+        """
+        decimals = max(0, -math.floor(math.log10(step)))
+        amount = f"{price:,.{decimals}f}"
+        return f"{unit}{amount}" if is_unit_prefix(unit) else f"{amount} {unit}"
+
+    @staticmethod
+    def date_ticks(dates, count: int = 6) -> List[tuple]:
+        """
+        Candle positions and labels for the date axis.
+
+        :param dates: Candle dates
+        :param count: Maximum number of ticks
+        :return: Pairs of candle position and label
+        """
+        if not len(dates):
+            return []
+
+        span = dates.iloc[-1] - dates.iloc[0]
+        date_format = "%H:%M" if span.days < 2 else "%b %d"
+
+        if span.days > 365:
+            date_format = "%b %Y"
+
+        positions = numpy.unique(
+            numpy.linspace(0, len(dates) - 1, min(count, len(dates))).astype(int)
+        )
+        return [
+            (position, dates.iloc[position].strftime(date_format))
+            for position in positions
+        ]
+
+
+CHART_BACKENDS: Dict[str, Type[ChartBackend]] = {
+    "plotly": PlotlyChartBackend,
+    "native": NativeChartBackend,
+}
+
+
+def get_chart_backend(name: str) -> ChartBackend:
+    """
+    Create chart backend by name.
+
+    :param name: Backend name, one of CHART_BACKENDS
+    :return: Chart backend
+    """
+    return CHART_BACKENDS[name]()
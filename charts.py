@@ -0,0 +1,294 @@
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, Optional, Tuple
+
+from config import (
+    CHART_BACKEND,
+    CHART_CACHE_DIRECTORY,
+    CHART_CACHE_MAX_BYTES,
+    CHART_RENDER_QUEUE_SIZE,
+    CHART_RENDER_WORKERS,
+    logger,
+)
+from metrics import chart_render_time, registry
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+ChartKey = Tuple[str, ...]
+
+
+class ChartRendererBusy(Exception):
+    """Raised when more charts are waiting to render than the queue allows."""
+
+
+def render_candlestick_chart(
+    market: "DataFrame",
+    title: str,
+    currency: str = "usd",
+    unit: str = "$",
+    backend: str = CHART_BACKEND,
+) -> bytes:
+    """
+    Render candlestick chart as a PNG image.
+
+    :param market: OHLC data with Date, Open, High, Low and Close columns
+    :param title: Chart title
+    :param currency: Currency of the prices, e.g. eur
+    :param unit: Unit of the currency, e.g. € or BTC
+    :param backend: Name of the chart backend to draw with
+    :return: PNG image bytes
+    """
+    # Runs in the render workers, the bot process never loads the backends
+    from chart_backends import get_chart_backend  # noqa: WPS433
+
+    return get_chart_backend(backend).render(
+        market=market, title=title, currency=currency, unit=unit
+    )
+
+
+def warm_up() -> None:
+    """Warm up the chart backend so the first real chart does not pay for it."""
+    from pandas import DataFrame, to_datetime  # noqa: WPS433
+
+    render_candlestick_chart(
+        market=DataFrame(
+            {
+                "Date": to_datetime([0], unit="ms"),
+                "Open": [1],
+                "High": [1],
+                "Low": [1],
+                "Close": [1],
+            }
+        ),
+        title="",
+    )
+
+
+class ChartRenderer:
+    """Renders charts in a pool of warm worker processes behind a bounded queue."""
+
+    def __init__(self, workers: int, queue_size: int):
+        """
+        Create chart renderer.
+
+        :param workers: Number of worker processes
+        :param queue_size: Maximum number of charts rendering or waiting to render
+        """
+        self.workers = workers
+        self.queue_size = queue_size
+        self.pending = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """Worker process pool, created on first use."""
+        if self._executor is None:
+            # Spawned workers do not inherit the bot's event loop and threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=get_context("spawn"),
+                initializer=warm_up,
+            )
+        return self._executor
+
+    def start(self) -> None:
+        """Start worker processes ahead of the first chart request."""
+        for _ in range(self.workers):
+            self.executor.submit(int)
+
+    async def render(
+        self, market: "DataFrame", title: str, currency: str = "usd", unit: str = "$"
+    ) -> bytes:
+        """
+        Render candlestick chart without blocking the event loop.
+
+        :param market: OHLC data with Date, Open, High, Low and Close columns
+        :param title: Chart title
+        :param currency: Currency of the prices, e.g. eur
+        :param unit: Unit of the currency, e.g. € or BTC
+        :return: PNG image bytes
+        """
+        if self.pending >= self.queue_size:
+            raise ChartRendererBusy(f"{self.pending} charts are waiting to render")
+
+        self.pending += 1
+        loop = asyncio.get_running_loop()
+
+        try:
+            with chart_render_time.time(CHART_BACKEND):
+                return await loop.run_in_executor(
+                    self.executor,
+                    render_candlestick_chart,
+                    market,
+                    title,
+                    currency,
+                    unit,
+                )
+        except BrokenProcessPool:
+            logger.error("Chart render worker died, restarting pool")
+            self._executor = None
+            raise
+        finally:
+            self.pending -= 1
+
+    def close(self) -> None:
+        """Stop worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+class ChartCache:
+    """Rendered chart images in an LRU bounded by total bytes, spilling to disk."""
+
+    def __init__(self, max_bytes: int, directory: Optional[str] = None):
+        """
+        Create chart cache.
+
+        :param max_bytes: Maximum number of image bytes kept in memory
+        :param directory: Directory receiving images evicted from memory, if any
+        """
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._images: "OrderedDict[ChartKey, Tuple[float, bytes]]" = OrderedDict()
+        self._inflight: Dict[ChartKey, asyncio.Future] = {}
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    async def get_or_render(
+        self, key: ChartKey, ttl: float, render: Callable[[], Awaitable[bytes]]
+    ) -> bytes:
+        """
+        Retrieve cached chart or render it once for all concurrent callers.
+
+        :param key: Cache key, e.g. coin id, days and base currency
+        :param ttl: Seconds the rendered chart stays valid
+        :param render: Coroutine function rendering the chart on a miss
+        :return: PNG image bytes
+        """
+        image = await self.get(key)
+
+        if image is not None:
+            self.hits += 1
+            return image
+
+        inflight = self._inflight.get(key)
+
+        if inflight is None:
+            self.misses += 1
+            inflight = asyncio.ensure_future(self._render(key, ttl, render))
+            self._inflight[key] = inflight
+        return await asyncio.shield(inflight)
+
+    async def get(self, key: ChartKey) -> Optional[bytes]:
+        """
+        Retrieve chart from memory, falling back to disk.
+
+        :param key: Cache key
+        :return: PNG image bytes, None when missing or expired
+        """
+        entry = self._images.get(key)
+
+        if entry is not None:
+            if entry[0] > time.time():
+                self._images.move_to_end(key)
+                return entry[1]
+            self._discard(key)
+
+        if not self.directory:
+            return None
+
+        loop = asyncio.get_running_loop()
+        spilled = await loop.run_in_executor(None, self._read_spilled, key)
+
+        if spilled is None:
+            return None
+
+        self._store(key, *spilled)
+        return spilled[1]
+
+    async def _render(
+        self, key: ChartKey, ttl: float, render: Callable[[], Awaitable[bytes]]
+    ) -> bytes:
+        try:
+            image = await render()
+            self._store(key, time.time() + ttl, image)
+            return image
+        finally:
+            self._inflight.pop(key, None)
+
+    def _store(self, key: ChartKey, expires_at: float, image: bytes) -> None:
+        self._discard(key)
+        self._images[key] = (expires_at, image)
+        self.size += len(image)
+
+        while self.size > self.max_bytes and self._images:
+            evicted_key, (evicted_expires_at, evicted_image) = self._images.popitem(
+                last=False
+            )
+            self.size -= len(evicted_image)
+
+            if self.directory:
+                asyncio.get_running_loop().run_in_executor(
+                    None, self._spill, evicted_key, evicted_expires_at, evicted_image
+                )
+
+    def _discard(self, key: ChartKey) -> None:
+        entry = self._images.pop(key, None)
+
+        if entry is not None:
+            self.size -= len(entry[1])
+
+    def _path(self, key: ChartKey) -> str:
+        digest = hashlib.sha256("|".join(key).encode()).hexdigest()
+        return os.path.join(str(self.directory), f"{digest}.png")
+
+    def _spill(self, key: ChartKey, expires_at: float, image: bytes) -> None:
+        path = self._path(key)
+
+        try:
+            with open(path, "wb") as spilled_file:
+                spilled_file.write(image)
+            os.utime(path, (expires_at, expires_at))
+        except OSError as error:
+            logger.error("Unable to spill chart to disk: %s", error)
+
+    def _read_spilled(self, key: ChartKey) -> Optional[Tuple[float, bytes]]:
+        path = self._path(key)
+
+        try:
+            expires_at = os.stat(path).st_mtime
+
+            if expires_at <= time.time():
+                os.remove(path)
+                return None
+
+            with open(path, "rb") as spilled_file:
+                return expires_at, spilled_file.read()
+        except OSError:
+            return None
+
+
+chart_cache = ChartCache(
+    max_bytes=CHART_CACHE_MAX_BYTES, directory=CHART_CACHE_DIRECTORY
+)
+chart_renderer = ChartRenderer(
+    workers=CHART_RENDER_WORKERS, queue_size=CHART_RENDER_QUEUE_SIZE
+)
+registry.add_cache("chart", chart_cache)
+registry.add_gauge(
+    "chart_render_pending",
+    "Charts rendering or waiting to render",
+    lambda: chart_renderer.pending,
+)
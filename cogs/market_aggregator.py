@@ -1,14 +1,37 @@
+from functools import partial
+
+from aiocoingecko import LibraryException
 from discord import slash_command, ApplicationContext, ButtonStyle, Embed, option
 from discord.ext.commands import Cog
-from discord.ext.pages import Paginator, PaginatorButton
+from discord.ext.pages import PaginatorButton
 from discord.ui import View
 from requests.exceptions import RequestException
 
-from api.coingecko import CoinGecko
-from api.coinmarketcap import CoinMarketCap
+from api.exchange_rates import (
+    Conversion,
+    ExchangeRateUnavailable,
+    exchange_rates,
+)
+from api.rate_limiter import RateLimitExceeded
+from api.trending_feed import trending_feed
 from button import ChartButton
-from config import logger, DISCORD_GUILD_GUIDS
-from utils import get_coin_ids, get_coin_stats, generate_price_embed
+from lazy_pages import LazyPages, LazyPaginator
+from constants import QUOTE_CURRENCIES
+from config import (
+    logger,
+    DISCORD_GUILD_GUIDS,
+    PRICE_MAX_PAGES,
+    PRICE_PAGE_CACHE_SIZE,
+    PRICES_MAX_SYMBOLS,
+)
+from utils import (
+    COIN_STATS_ERRORS,
+    get_coin_ids,
+    get_coin_stats,
+    generate_price_embed,
+    generate_prices_embed,
+    get_market_quotes,
+)
 
 
 class MarketAggregator(Cog):
@@ -22,38 +45,50 @@ class MarketAggregator(Cog):
 
     @slash_command(guild_ids=DISCORD_GUILD_GUIDS)
     @option(name="symbol", description="Enter token symbol", required=True)
-    async def price(self, ctx: ApplicationContext, symbol: str) -> None:
+    @option(
+        name="currency",
+        description="Choose currency to quote the price in",
+        choices=QUOTE_CURRENCIES,
+        default="usd",
+        required=False,
+    )
+    async def price(
+        self, ctx: ApplicationContext, symbol: str, currency: str = "usd"
+    ) -> None:
         """
         Display token price data from CoinGecko/CoinMarketCap.
 
         :param ctx: Discord Bot Application Context
         :param symbol: Cryptocurrency token symbol
+        :param currency: Currency to quote the price in
         """
         logger.info("Price command executed")
-        pages = []
 
         await ctx.defer()
 
         try:
-            for ids in await get_coin_ids(symbol=symbol.upper()):
-                coin_stats = await get_coin_stats(coin_id=ids)
-                embed_message = generate_price_embed(token_data=coin_stats)
-                pages.append(embed_message)
-
-            paginator = Paginator(
-                pages=pages,
-                use_default_buttons=False,
-                custom_buttons=[
-                    PaginatorButton(
-                        button_type="prev", label="", style=ButtonStyle.red, emoji="⬅"
-                    ),
-                    PaginatorButton(
-                        "page_indicator", style=ButtonStyle.gray, disabled=True
-                    ),
-                    PaginatorButton(
-                        button_type="next", style=ButtonStyle.green, emoji="➡"
+            conversion = await exchange_rates.get_conversion("usd", currency)
+            coin_ids = await get_coin_ids(symbol=symbol.upper())
+
+            if not coin_ids:
+                await ctx.respond(
+                    embed=Embed(
+                        title=f"Data for ({symbol}) is not available", colour=0xC5E519
+                    )
+                )
+                return
+
+            paginator = self.create_price_paginator(
+                pages=LazyPages(
+                    page_count=min(len(coin_ids), PRICE_MAX_PAGES),
+                    build_page=partial(
+                        self.build_price_page,
+                        symbol=symbol,
+                        coin_ids=coin_ids,
+                        conversion=conversion,
                     ),
-                ],
+                    cache_size=PRICE_PAGE_CACHE_SIZE,
+                )
             )
             await paginator.respond(ctx.interaction)
         except TypeError as error:
@@ -63,7 +98,7 @@ class MarketAggregator(Cog):
                     title=f"Data for ({symbol}) is not available", colour=0xC5E519
                 )
             )
-        except RequestException as error:
+        except (RequestException, RateLimitExceeded, ExchangeRateUnavailable) as error:
             logger.error(error)
             await ctx.respond(
                 embed=Embed(
@@ -72,6 +107,87 @@ class MarketAggregator(Cog):
                 )
             )
 
+    @staticmethod
+    async def build_price_page(
+        page_number: int, symbol: str, coin_ids: list, conversion: Conversion
+    ) -> Embed:
+        """
+        Fetch stats of one coin and build its price page.
+
+        :param page_number: Zero-indexed page number
+        :param symbol: Cryptocurrency token symbol
+        :param coin_ids: Coin ids matching the symbol, one per page
+        :param conversion: Conversion from USD to the quoted currency
+        :return: Price embed
+        """
+        try:
+            coin_stats = await get_coin_stats(coin_id=coin_ids[page_number])
+        except COIN_STATS_ERRORS as error:
+            logger.error(error)
+            return Embed(title=f"Data for ({symbol}) is not available", colour=0xC5E519)
+        return generate_price_embed(
+            token_data=coin_stats.in_currency(conversion), unit=conversion.unit
+        )
+
+    @slash_command(guild_ids=DISCORD_GUILD_GUIDS)
+    @option(
+        name="symbols",
+        description="Enter token symbols separated by spaces or commas",
+        required=True,
+    )
+    async def prices(self, ctx: ApplicationContext, symbols: str) -> None:
+        """
+        Display a price table for several tokens from CoinGecko/CoinMarketCap.
+
+        :param ctx: Discord Bot Application Context
+        :param symbols: Cryptocurrency token symbols
+        """
+        logger.info("Prices command executed")
+        requested_symbols = list(
+            dict.fromkeys(
+                symbol.upper() for symbol in symbols.replace(",", " ").split()
+            )
+        )[:PRICES_MAX_SYMBOLS]
+
+        await ctx.defer()
+
+        try:
+            quotes, missing = await get_market_quotes(symbols=requested_symbols)
+        except (RequestException, LibraryException, RateLimitExceeded) as error:
+            logger.error(error)
+            await ctx.respond(
+                embed=Embed(title="Unable to get prices at this time", colour=0xC5E519)
+            )
+            return
+
+        await ctx.respond(
+            embed=generate_prices_embed(
+                symbols=requested_symbols, quotes=quotes, missing=missing
+            )
+        )
+
+    @staticmethod
+    def create_price_paginator(pages: LazyPages) -> LazyPaginator:
+        """
+        Create paginator used to browse price embeds.
+
+        :param pages: Price embeds, built as they are shown
+        :return: Paginator with custom navigation buttons
+        """
+        return LazyPaginator(
+            pages=pages,
+            use_default_buttons=False,
+            custom_buttons=[
+                PaginatorButton(
+                    button_type="prev", label="", style=ButtonStyle.red, emoji="⬅"
+                ),
+                PaginatorButton(
+                    "page_indicator", style=ButtonStyle.gray, disabled=True
+                ),
+                PaginatorButton(button_type="next", style=ButtonStyle.green, emoji="➡"),
+            ],
+        )
+
     @slash_command(guild_ids=DISCORD_GUILD_GUIDS)
     async def trending(self, ctx: ApplicationContext) -> None:
         """
@@ -79,29 +195,21 @@ class MarketAggregator(Cog):
 
         :param ctx: Discord Bot Application Context
         """
-        logger.info("Retrieving trending addresses from CoinGecko")
-        coin_gecko = CoinGecko()
-        coin_market_cap = CoinMarketCap()
+        logger.info("Retrieving trending addresses from the trending feed")
         embed_message = Embed(title="Trending tokens 🔥", colour=0x43CA7E)
 
         await ctx.defer()
 
-        coin_gecko_trending_coins = "\n> ".join(await coin_gecko.get_trending_coins())
-        coin_market_cap_trending_coins = "\n> ".join(
-            await coin_market_cap.get_trending_coins()
-        )
+        snapshots = await trending_feed.get()
 
-        try:
-            embed_message.add_field(
-                name="CoinGecko", value=f"> {coin_gecko_trending_coins}", inline=False
-            )
-            embed_message.add_field(
-                name="CoinMarketCap",
-                value=f"> {coin_market_cap_trending_coins}",
-                inline=False,
-            )
-        except RequestException as error:
-            logger.error(error)
+        for provider, snapshot in snapshots.items():
+            if snapshot is not None:
+                trending_coins = "\n> ".join(snapshot.coins)
+                embed_message.add_field(
+                    name=provider, value=f"> {trending_coins}", inline=False
+                )
+
+        if not embed_message.fields:
             embed_message.title = "Unable to get trending tokens at this time"
         await ctx.respond(embed=embed_message)
 
@@ -113,11 +221,19 @@ class MarketAggregator(Cog):
         choices=["1", "7", "14", "30", "90", "180", "365", "max"],
         required=True,
     )
+    @option(
+        name="currency",
+        description="Choose currency to chart prices in",
+        choices=QUOTE_CURRENCIES,
+        default="usd",
+        required=False,
+    )
     async def chart(
         self,
         ctx: ApplicationContext,
         symbol: str,
         days: str,
+        currency: str = "usd",
     ) -> None:
         """
         Display token charting data.
@@ -125,6 +241,7 @@ class MarketAggregator(Cog):
         :param ctx: Discord Bot Application Context
         :param symbol: Token Symbol
         :param days: Number of days to chart
+        :param currency: Currency to chart prices in
         """
         logger.info("Price command executed")
         symbol = symbol.upper()
@@ -137,9 +254,13 @@ class MarketAggregator(Cog):
             coin_ids = await get_coin_ids(symbol=symbol)
 
             for ids in coin_ids:
-                view.add_item(item=ChartButton(label=ids, days=days, symbol=symbol))
+                view.add_item(
+                    item=ChartButton(
+                        label=ids, days=days, symbol=symbol, currency=currency
+                    )
+                )
 
-        except RequestException as error:
+        except (RequestException, RateLimitExceeded) as error:
             logger.error(error)
             embed_message.title = "Unable to gather charting data at this moment"
         await ctx.respond(embed=embed_message, view=view)
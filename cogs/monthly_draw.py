@@ -5,17 +5,20 @@ from discord import (
     ApplicationContext,
     Embed,
     default_permissions,
-    Interaction,
     option,
+    RawReactionActionEvent,
 )
+from aiocoingecko import LibraryException
 from discord.ext.commands import Cog
-from tortoise.exceptions import BaseORMException
+from tortoise.exceptions import BaseORMException, IntegrityError
 from tortoise.queryset import Q
 
+from api.rate_limiter import RateLimitExceeded
 from config import DISCORD_GUILD_GUIDS, logger
 from constants import KEYCAP_DIGITS
 from models import MonthlySubmission
-from utils import add_reactions
+from utils import add_reactions, generate_draw_history_embed
+from votes import vote_tracker
 
 
 class MonthlyDraw(Cog):
@@ -54,20 +57,23 @@ class MonthlyDraw(Cog):
         await ctx.defer()
 
         try:
-            submission_exists = bool(
-                await MonthlySubmission().filter(
-                    Q(date_submitted__gte=str(today.replace(day=1)))
-                    & Q(token_name__iexact=token_name)
-                    & Q(symbol__iexact=symbol)
-                )
-            )
-
-            if not submission_exists:
+            if not await MonthlySubmission.is_submitted(
+                token_name=token_name,
+                symbol=symbol,
+                since=today.replace(day=1),
+                guild_id=ctx.guild_id,
+            ):
                 await MonthlySubmission.create(
-                    token_name=token_name, symbol=symbol, description=description
+                    token_name=token_name,
+                    symbol=symbol,
+                    description=description,
+                    guild_id=ctx.guild_id,
                 )
                 title = f"Submitted {token_name} ({symbol}) to {next_month.strftime('%B %Y')} drawing"
                 logger.info("Token submission success")
+        except IntegrityError:
+            # A concurrent submission of the same token was stored first
+            logger.info("Token submission already exists")
         except BaseORMException as error:
             logger.error(error)
             title = "Unable to submit token at this time. Try again later"
@@ -90,7 +96,7 @@ class MonthlyDraw(Cog):
         logger.info("%s executed [submit_token] command", ctx.user)
         reactions = []
         today = datetime.date.today()
-        date_range = [str(today.replace(day=1)), str(today)]
+        date_range = [today.replace(day=1), today]
         embed_message = Embed(
             colour=0x0F3FE5, title="Vote for the token of the month! 🗳️"
         )
@@ -98,8 +104,8 @@ class MonthlyDraw(Cog):
         await ctx.defer()
 
         try:
-            submissions = await MonthlySubmission().get_randomized_submissions(
-                date_range=date_range
+            submissions = await MonthlySubmission.get_randomized_submissions(
+                date_range=date_range, guild_id=ctx.guild_id, limit=len(KEYCAP_DIGITS)
             )
 
             for index, submission in enumerate(submissions):
@@ -111,12 +117,90 @@ class MonthlyDraw(Cog):
                 )
                 reactions.append(reaction)
 
-            interaction: Interaction = await ctx.respond(
-                content="@everyone", embed=embed_message
-            )
-            await add_reactions(interaction, reactions)
+            message = await ctx.send_followup(content="@everyone", embed=embed_message)
+
+            if submissions:
+                await vote_tracker.open_poll(
+                    message_id=message.id,
+                    guild_id=ctx.guild_id,
+                    channel_id=ctx.channel_id,
+                    submissions=dict(zip(reactions, submissions)),
+                )
+            await add_reactions(message, reactions)
         except BaseORMException as error:
             logger.error(error)
             embed_message.clear_fields()
             embed_message.title = "Unable to draw at this moment. Try again later"
             await ctx.respond(embed=embed_message)
+
+    @slash_command(guild_ids=DISCORD_GUILD_GUIDS)
+    @option(
+        name="months",
+        description="Number of past months to include",
+        min_value=1,
+        max_value=60,
+        default=12,
+        required=False,
+    )
+    async def draw_history(self, ctx: ApplicationContext, months: int = 12) -> None:
+        """
+        Display how past token submissions performed since they were submitted.
+
+        :param ctx: Discord Bot Application Context
+        :param months: Number of past months to include
+        """
+        from pandas import DataFrame  # noqa: WPS433
+
+        from backtest import SUBMISSION_COLUMNS, backtest_submissions  # noqa: WPS433
+
+        logger.info("%s executed [draw_history] command", ctx.user)
+        today = datetime.date.today()
+        month_index = today.year * 12 + today.month - months
+        since = datetime.date(month_index // 12, month_index % 12 + 1, 1)
+
+        embed_message = Embed(
+            title="Unable to compute draw history at this time. Try again later",
+            colour=0x0F3FE5,
+        )
+
+        await ctx.defer()
+
+        try:
+            rows = await MonthlySubmission.filter(
+                Q(guild_id=ctx.guild_id) | Q(guild_id=None),
+                date_submitted__gte=since,
+            ).values_list(*SUBMISSION_COLUMNS)
+            submissions = DataFrame(rows, columns=SUBMISSION_COLUMNS)
+            leaderboard = (
+                await backtest_submissions(submissions)
+                if rows
+                else submissions.assign(performance=[])
+            )
+            embed_message = generate_draw_history_embed(leaderboard, months=months)
+        except (BaseORMException, LibraryException, RateLimitExceeded) as error:
+            logger.error(error)
+        except Exception:
+            # The command was deferred, it must still be answered
+            logger.exception("Unable to compute draw history")
+
+        await ctx.respond(embed=embed_message)
+
+    @Cog.listener()
+    async def on_raw_reaction_add(self, payload: RawReactionActionEvent) -> None:
+        """
+        Count vote on an open monthly draw poll.
+
+        :param payload: Reaction event, received even for uncached messages
+        """
+        if payload.user_id != self.bot.user.id:
+            vote_tracker.record(payload.message_id, str(payload.emoji), 1)
+
+    @Cog.listener()
+    async def on_raw_reaction_remove(self, payload: RawReactionActionEvent) -> None:
+        """
+        Withdraw vote on an open monthly draw poll.
+
+        :param payload: Reaction event, received even for uncached messages
+        """
+        if payload.user_id != self.bot.user.id:
+            vote_tracker.record(payload.message_id, str(payload.emoji), -1)
@@ -0,0 +1,135 @@
+from aiocoingecko import LibraryException
+from discord import ApplicationContext, Embed, SlashCommandGroup, option
+from discord.ext.commands import Cog
+from requests.exceptions import RequestException
+from tortoise.exceptions import BaseORMException
+
+from api.rate_limiter import RateLimitExceeded
+from config import DISCORD_GUILD_GUIDS, MAX_ALERTS_PER_USER, logger
+from models import PriceAlert
+from utils import get_market_quotes
+
+
+class PriceAlerts(Cog):
+    alert = SlashCommandGroup(
+        "alert",
+        "Get notified when a token price crosses a threshold",
+        guild_ids=DISCORD_GUILD_GUIDS,
+    )
+
+    def __init__(self, bot):
+        """
+        Initialize price alerts cog.
+
+        :param bot: Discord bot
+        """
+        self.bot = bot
+
+    @alert.command()
+    @option(name="symbol", description="Enter token symbol", required=True)
+    @option(
+        name="direction",
+        description="Notify when the price goes above or below the threshold",
+        choices=["above", "below"],
+        required=True,
+    )
+    @option(name="price", description="Enter price threshold in USD", required=True)
+    async def add(
+        self, ctx: ApplicationContext, symbol: str, direction: str, price: float
+    ) -> None:
+        """
+        Create price alert announced in this channel.
+
+        :param ctx: Discord Bot Application Context
+        :param symbol: Cryptocurrency token symbol
+        :param direction: Either above or below
+        :param price: Price threshold in USD
+        """
+        logger.info("%s executed [alert add] command", ctx.user)
+        symbol = symbol.upper()
+
+        await ctx.defer()
+
+        try:
+            active_alerts = await PriceAlert.filter(
+                user_id=ctx.user.id, triggered_at=None
+            ).count()
+
+            if active_alerts >= MAX_ALERTS_PER_USER:
+                title = f"You already have {active_alerts} active alerts"
+            else:
+                quotes, _ = await get_market_quotes(symbols=[symbol])
+                quote = quotes.get(symbol)
+
+                if quote is None or quote["coin_id"] is None:
+                    title = f"Alerts for ({symbol}) are not available"
+                else:
+                    await PriceAlert.create(
+                        user_id=ctx.user.id,
+                        guild_id=ctx.guild_id,
+                        channel_id=ctx.channel_id,
+                        symbol=symbol,
+                        coin_id=quote["coin_id"],
+                        direction=direction,
+                        threshold=price,
+                    )
+                    title = (
+                        f"Alerting when {symbol} goes {direction} ${price:,} "
+                        f"(now ${quote['price']:,})"
+                    )
+        except BaseORMException as error:
+            logger.error(error)
+            title = "Unable to create alert at this time. Try again later"
+        except (RequestException, LibraryException, RateLimitExceeded) as error:
+            logger.error(error)
+            title = f"Unable to get data for ({symbol}) at this time"
+
+        await ctx.respond(embed=Embed(title=title, colour=0xC5E519))
+
+    @alert.command(name="list")
+    async def list_alerts(self, ctx: ApplicationContext) -> None:
+        """
+        Display your active price alerts.
+
+        :param ctx: Discord Bot Application Context
+        """
+        logger.info("%s executed [alert list] command", ctx.user)
+        embed_message = Embed(title="Your price alerts 🔔", colour=0xC5E519)
+
+        await ctx.defer()
+
+        try:
+            alerts = await PriceAlert.filter(
+                user_id=ctx.user.id, triggered_at=None
+            ).order_by("id")
+            embed_message.description = (
+                "\n".join(f"`#{alert.id}` {alert}" for alert in alerts)
+                or "No active alerts"
+            )
+        except BaseORMException as error:
+            logger.error(error)
+            embed_message.title = "Unable to list alerts at this time. Try again later"
+
+        await ctx.respond(embed=embed_message)
+
+    @alert.command()
+    @option(name="alert_id", description="Enter alert number", required=True)
+    async def remove(self, ctx: ApplicationContext, alert_id: int) -> None:
+        """
+        Delete one of your price alerts.
+
+        :param ctx: Discord Bot Application Context
+        :param alert_id: Alert number shown by /alert list
+        """
+        logger.info("%s executed [alert remove] command", ctx.user)
+
+        await ctx.defer()
+
+        try:
+            deleted = await PriceAlert.filter(id=alert_id, user_id=ctx.user.id).delete()
+            title = f"Removed alert #{alert_id}" if deleted else "Alert not found"
+        except BaseORMException as error:
+            logger.error(error)
+            title = "Unable to remove alert at this time. Try again later"
+
+        await ctx.respond(embed=Embed(title=title, colour=0xC5E519))
@@ -0,0 +1,116 @@
+from dataclasses import dataclass, fields, replace
+from typing import Any, Dict, Optional, Tuple
+
+from api.exchange_rates import Conversion
+
+
+@dataclass(frozen=True)
+class CoinStats:
+    """Fields of a coin lookup shown by the price command, nothing more."""
+
+    __slots__ = (
+        "name",
+        "symbol",
+        "website",
+        "blockchain_sites",
+        "platforms",
+        "price",
+        "market_cap_rank",
+        "volume",
+        "percent_change_24h",
+        "percent_change_7d",
+        "percent_change_30d",
+        "percent_change_ath",
+    )
+
+    name: str
+    symbol: str
+    website: str
+    blockchain_sites: Tuple[str, ...]
+    platforms: Dict[str, str]
+    price: Optional[float]
+    market_cap_rank: Optional[int]
+    volume: Optional[float]
+    percent_change_24h: float
+    percent_change_7d: float
+    percent_change_30d: float
+    percent_change_ath: Optional[float]
+
+    def __reduce__(self) -> tuple:
+        """
+        Pickle by field values, a frozen record cannot be restored field by field.
+
+        :return: Class and constructor arguments
+        """
+        return type(self), tuple(getattr(self, field.name) for field in fields(self))
+
+    def in_currency(self, conversion: Conversion) -> "CoinStats":
+        """
+        Convert the dollar amounts to another currency.
+
+        :param conversion: Conversion from USD
+        :return: Coin stats with converted price and volume
+        """
+        return replace(
+            self,
+            price=conversion.convert(self.price),
+            volume=conversion.convert(self.volume),
+        )
+
+    @classmethod
+    def from_coingecko(cls, token_data: Dict[str, Any]) -> "CoinStats":
+        """
+        Project CoinGecko coin lookup onto a coin stats record.
+
+        :param token_data: CoinGecko coins/{id} response
+        :return: Coin stats
+        """
+        market_data = token_data["market_data"]
+        links = token_data["links"]
+        has_usd = "usd" in market_data["current_price"]
+
+        def usd(key: str) -> Optional[float]:
+            return float(market_data[key]["usd"]) if has_usd else None
+
+        return cls(
+            name=token_data["name"],
+            symbol=token_data["symbol"].upper(),
+            website=links["homepage"][0],
+            blockchain_sites=tuple(links["blockchain_site"]),
+            platforms=token_data["platforms"],
+            price=usd("current_price"),
+            market_cap_rank=market_data["market_cap_rank"],
+            volume=usd("total_volume"),
+            percent_change_24h=market_data["price_change_percentage_24h"] or 0,
+            percent_change_7d=market_data["price_change_percentage_7d"] or 0,
+            percent_change_30d=market_data["price_change_percentage_30d"] or 0,
+            percent_change_ath=market_data["ath_change_percentage"]["usd"] or 0,
+        )
+
+    @classmethod
+    def from_coinmarketcap(
+        cls, token_data: Dict[str, Any], meta_data: Dict[str, Any]
+    ) -> "CoinStats":
+        """
+        Project CoinMarketCap quote and metadata onto a coin stats record.
+
+        :param token_data: CoinMarketCap quotes/latest entry
+        :param meta_data: CoinMarketCap info entry
+        :return: Coin stats
+        """
+        urls = meta_data["urls"]
+        quote = token_data["quote"]["USD"]
+        return cls(
+            name=token_data["name"],
+            symbol=token_data["symbol"],
+            website=urls["website"][0],
+            blockchain_sites=tuple(urls["explorer"]),
+            platforms={},
+            price=quote["price"],
+            market_cap_rank=token_data["cmc_rank"],
+            volume=quote["volume_24h"],
+            percent_change_24h=quote["percent_change_24h"] or 0,
+            percent_change_7d=quote["percent_change_7d"] or 0,
+            percent_change_30d=quote["percent_change_30d"] or 0,
+            percent_change_ath=None,
+        )
@@ -1,38 +1,34 @@
+use std::time::Duration;
+
+use pyo3::create_exception;
+use pyo3::exceptions::PyException;
 use pyo3::prelude::*;
 use reqwest::blocking::Client;
-use reqwest::header::{HeaderMap, HeaderValue, SET_COOKIE, USER_AGENT};
+use reqwest::header::{HeaderMap, HeaderValue, USER_AGENT};
 use select::document::Document;
 use select::predicate::{Name, Predicate};
 
-fn get_cookies() -> Vec<HeaderValue> {
-    let response = reqwest::blocking::get("https://google.com").unwrap();
-    let cookies: Vec<HeaderValue> = response
-        .headers()
-        .get_all("set-cookie")
-        .iter()
-        .map(|header_value| header_value.to_owned())
-        .collect();
-    cookies
-}
+const TRENDING_URL: &str = "https://coinmarketcap.com/trending-cryptocurrencies";
+const BROWSER_USER_AGENT: &str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/100.0.4896.79 Safari/537.36";
+const DEFAULT_TIMEOUT: f64 = 10.0;
+
+create_exception!(coinmarketcap_utils, ScraperError, PyException);
 
-fn construct_header() -> HeaderMap {
+fn build_client(timeout: f64) -> reqwest::Result<Client> {
     let mut headers = HeaderMap::new();
-    headers.insert(USER_AGENT, HeaderValue::from_str("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/100.0.4896.79 Safari/537.36").unwrap());
+    headers.insert(USER_AGENT, HeaderValue::from_static(BROWSER_USER_AGENT));
 
-    for cookie in get_cookies() {
-        headers.insert(SET_COOKIE, HeaderValue::from(cookie));
-    }
-    headers
+    Client::builder()
+        .default_headers(headers)
+        .cookie_store(true)
+        .gzip(true)
+        .timeout(Duration::from_secs_f64(timeout))
+        .build()
 }
 
-#[pyfunction]
-fn get_trending_tokens() -> PyResult<Vec<String>> {
+fn parse_trending_tokens(html: &str) -> Vec<String> {
     let mut trending_tokens: Vec<String> = vec![];
-    let url = "https://coinmarketcap.com/trending-cryptocurrencies";
-    let client = Client::new();
-    let response = client.get(url).headers(construct_header()).send().unwrap();
-
-    let document = Document::from(response.text().unwrap().as_str());
+    let document = Document::from(html);
 
     for node in document.find(Name("table").descendant(Name("a"))) {
         let elements: Vec<String> = node
@@ -40,16 +36,75 @@ fn get_trending_tokens() -> PyResult<Vec<String>> {
             .map(|element| element.inner_html())
             .collect();
 
-        if !elements.is_empty() {
+        if elements.len() >= 2 {
             trending_tokens.push(format!("{} ({})", elements[0], elements[1]));
         }
     }
-    Ok(trending_tokens)
+    trending_tokens
+}
+
+/// Long-lived CoinMarketCap trending page scraper.
+///
+/// Keeps one pooled HTTP client whose cookie store lives as long as the
+/// scraper. Network I/O and parsing run with the GIL released, so `fetch`
+/// can be awaited from asyncio through `loop.run_in_executor`.
+#[pyclass]
+struct TrendingScraper {
+    client: Client,
+    url: String,
+}
+
+impl TrendingScraper {
+    fn download(&self) -> reqwest::Result<String> {
+        self.client
+            .get(&self.url)
+            .send()?
+            .error_for_status()?
+            .text()
+    }
+}
+
+#[pymethods]
+impl TrendingScraper {
+    #[new]
+    #[args(url = "None", timeout = "None")]
+    fn new(url: Option<String>, timeout: Option<f64>) -> PyResult<Self> {
+        let client = build_client(timeout.unwrap_or(DEFAULT_TIMEOUT))
+            .map_err(|error| ScraperError::new_err(error.to_string()))?;
+
+        Ok(TrendingScraper {
+            client,
+            url: url.unwrap_or_else(|| TRENDING_URL.to_string()),
+        })
+    }
+
+    /// Download and parse the trending page.
+    fn fetch(&self, py: Python) -> PyResult<Vec<String>> {
+        py.allow_threads(|| {
+            self.download()
+                .map(|html| parse_trending_tokens(&html))
+                .map_err(|error| error.to_string())
+        })
+        .map_err(ScraperError::new_err)
+    }
+
+    /// Parse an already downloaded trending page.
+    #[staticmethod]
+    fn parse(py: Python, html: &str) -> Vec<String> {
+        py.allow_threads(|| parse_trending_tokens(html))
+    }
+}
+
+#[pyfunction]
+fn get_trending_tokens(py: Python) -> PyResult<Vec<String>> {
+    TrendingScraper::new(None, None)?.fetch(py)
 }
 
 /// A Python module implemented in Rust.
 #[pymodule]
-fn coinmarketcap_utils(_py: Python, m: &PyModule) -> PyResult<()> {
+fn coinmarketcap_utils(py: Python, m: &PyModule) -> PyResult<()> {
+    m.add_class::<TrendingScraper>()?;
     m.add_function(wrap_pyfunction!(get_trending_tokens, m)?)?;
+    m.add("ScraperError", py.get_type::<ScraperError>())?;
     Ok(())
 }
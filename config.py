@@ -16,6 +16,8 @@ logger = logging.getLogger(__name__)
 DISCORD_BOT_TOKEN = os.getenv("DISCORD_BOT_TOKEN")
 DISCORD_GUILD_GUIDS = os.getenv("DISCORD_GUILD_GUIDS", "").split(",")
 COIN_MARKET_CAP_API_KEY = os.getenv("COIN_MARKET_CAP_API_KEY")
+COINGECKO_API_URL = os.getenv("COINGECKO_API_URL", "https://api.coingecko.com/api/v3/")
+COIN_MARKET_CAP_MAX_WORKERS = int(os.getenv("COIN_MARKET_CAP_MAX_WORKERS", "4"))
 
 # Database Settings
 DB_NAME = os.getenv("DB_NAME")
@@ -23,4 +25,73 @@ DB_HOST = os.getenv("DB_HOST")
 DB_USER = os.getenv("DB_USER")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_PORT = os.getenv("DB_PORT", "5432")
-DB_URL = f"postgres://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+DB_URL = (
+    f"postgres://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+    f"?minsize={DB_POOL_MIN_SIZE}&maxsize={DB_POOL_MAX_SIZE}"
+)
+
+# HTTP Settings
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "100"))
+HTTP_POOL_SIZE_PER_HOST = int(os.getenv("HTTP_POOL_SIZE_PER_HOST", "20"))
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30"))
+
+# Rate Limit Settings (requests per minute)
+RATE_LIMITS = {
+    "coingecko": float(os.getenv("COINGECKO_RATE_LIMIT", "30")),
+    "coingecko:coins/list": float(os.getenv("COINGECKO_COINS_LIST_RATE_LIMIT", "2")),
+    "coinmarketcap": float(os.getenv("COIN_MARKET_CAP_RATE_LIMIT", "30")),
+    "coinmarketcap-web": float(os.getenv("COIN_MARKET_CAP_WEB_RATE_LIMIT", "6")),
+}
+RATE_LIMIT_MAX_RETRIES = int(os.getenv("RATE_LIMIT_MAX_RETRIES", "3"))
+
+# Cache Settings
+# Store shared by bot processes, e.g. sqlite:///tmp/stonks-cache.db or
+# redis://localhost:6379/0, caches stay in each process when empty
+CACHE_URL = os.getenv("CACHE_URL", "")
+COINGECKO_SYMBOL_INDEX_TTL = int(os.getenv("COINGECKO_SYMBOL_INDEX_TTL", "3600"))
+COIN_STATS_CACHE_TTL = int(os.getenv("COIN_STATS_CACHE_TTL", "45"))
+COIN_STATS_CACHE_SIZE = int(os.getenv("COIN_STATS_CACHE_SIZE", "1024"))
+TRENDING_REFRESH_INTERVAL = int(os.getenv("TRENDING_REFRESH_INTERVAL", "300"))
+EXCHANGE_RATES_REFRESH_INTERVAL = int(
+    os.getenv("EXCHANGE_RATES_REFRESH_INTERVAL", "300")
+)
+
+# Chart Settings
+CHART_BACKEND = os.getenv("CHART_BACKEND", "plotly")
+CHART_RENDER_WORKERS = int(os.getenv("CHART_RENDER_WORKERS", "2"))
+CHART_RENDER_QUEUE_SIZE = int(os.getenv("CHART_RENDER_QUEUE_SIZE", "16"))
+CHART_CACHE_MAX_BYTES = int(os.getenv("CHART_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+CHART_CACHE_DIRECTORY = os.getenv("CHART_CACHE_DIRECTORY")
+
+# Price Command Settings
+PRICE_MAX_PAGES = int(os.getenv("PRICE_MAX_PAGES", "25"))
+PRICE_PAGE_CACHE_SIZE = int(os.getenv("PRICE_PAGE_CACHE_SIZE", "5"))
+PRICES_MAX_SYMBOLS = int(os.getenv("PRICES_MAX_SYMBOLS", "20"))
+
+# Sharding Settings
+# "auto" for the recommended shard count, unset for a single unsharded connection
+SHARD_COUNT = os.getenv("SHARD_COUNT")
+# Shards run by this process, e.g. "0-3" or "0,2", all shards when unset
+SHARD_IDS = os.getenv("SHARD_IDS")
+
+# Startup Settings
+# Modules imported in the background once the bot is ready, none when empty
+PRELOAD_MODULES = [
+    module
+    for module in os.getenv("PRELOAD_MODULES", "pandas,numpy,backtest").split(",")
+    if module
+]
+
+# Metrics Settings
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "8000"))
+
+# Price Alert Settings
+ALERT_CHECK_INTERVAL = int(os.getenv("ALERT_CHECK_INTERVAL", "60"))
+ALERT_PRICE_BATCH_SIZE = int(os.getenv("ALERT_PRICE_BATCH_SIZE", "250"))
+MAX_ALERTS_PER_USER = int(os.getenv("MAX_ALERTS_PER_USER", "25"))
+
+# Monthly Draw Settings
+VOTE_FLUSH_INTERVAL = int(os.getenv("VOTE_FLUSH_INTERVAL", "30"))
@@ -10,3 +10,18 @@ KEYCAP_DIGITS = {
     8: "8️⃣",
     9: "9️⃣",
 }
+
+# Currencies prices and charts can be quoted in, all listed in CoinGecko exchange_rates
+QUOTE_CURRENCIES = ["usd", "eur", "gbp", "jpy", "cad", "aud", "chf", "btc", "eth"]
+
+# Seconds covered by one CoinGecko OHLC candle for each chart "days" choice
+CHART_CANDLE_INTERVALS = {
+    "1": 30 * 60,
+    "7": 4 * 60 * 60,
+    "14": 4 * 60 * 60,
+    "30": 4 * 60 * 60,
+    "90": 4 * 24 * 60 * 60,
+    "180": 4 * 24 * 60 * 60,
+    "365": 4 * 24 * 60 * 60,
+    "max": 4 * 24 * 60 * 60,
+}
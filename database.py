@@ -0,0 +1,43 @@
+from tortoise import Tortoise
+from tortoise.exceptions import BaseORMException
+
+from config import DB_URL, logger
+
+# Schema changes generate_schemas does not apply to existing tables, and
+# expression indexes Tortoise cannot declare on the models
+SCHEMA_UPDATES = (
+    "ALTER TABLE monthlysubmission ADD COLUMN IF NOT EXISTS guild_id BIGINT",
+    # Lets sharded processes check only the alerts of their guilds
+    "ALTER TABLE pricealert ADD COLUMN IF NOT EXISTS guild_id BIGINT",
+    "DROP INDEX IF EXISTS monthlysubmission_token_date_idx",
+    "DROP INDEX IF EXISTS monthlysubmission_token_month_key",
+    # Backs the duplicate check of submit_token
+    "CREATE INDEX IF NOT EXISTS monthlysubmission_guild_token_date_idx "
+    "ON monthlysubmission (guild_id, lower(token_name), lower(symbol), "
+    "date_submitted)",
+    # Backs the monthly draw
+    "CREATE INDEX IF NOT EXISTS monthlysubmission_guild_date_idx "
+    "ON monthlysubmission (guild_id, date_submitted)",
+    # One submission per token, guild and month, even when submitted concurrently
+    "CREATE UNIQUE INDEX IF NOT EXISTS monthlysubmission_guild_token_month_key "
+    "ON monthlysubmission (coalesce(guild_id, 0), lower(token_name), "
+    "lower(symbol), date_trunc('month', date_submitted::timestamp))",
+)
+
+
+async def init_database(db_url: str = DB_URL) -> None:
+    """
+    Open the connection pool, create missing tables and update existing ones.
+
+    :param db_url: Database url, pool sizes are passed as query parameters
+    """
+    await Tortoise.init(db_url=db_url, modules={"models": ["models"]})
+    await Tortoise.generate_schemas(safe=True)
+    connection = Tortoise.get_connection("default")
+
+    for statement in SCHEMA_UPDATES:
+        try:
+            await connection.execute_script(statement)
+        except BaseORMException as error:
+            # e.g. duplicate submissions made before the unique index existed
+            logger.error("Unable to update schema: %s", error)
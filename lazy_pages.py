@@ -0,0 +1,148 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Optional, Sequence, Union, overload
+
+from discord import Embed, Interaction
+from discord.ext.pages import Paginator
+from lru import LRU
+
+from config import logger
+
+PageBuilder = Callable[[int], Awaitable[Embed]]
+
+
+class LazyPages(Sequence[Embed]):
+    """Paginator pages built on first access and kept in a small LRU cache."""
+
+    def __init__(self, page_count: int, build_page: PageBuilder, cache_size: int):
+        """
+        Create lazily built pages.
+
+        :param page_count: Number of pages
+        :param build_page: Coroutine function building the embed of a page number
+        :param cache_size: Maximum number of built pages kept
+        """
+        self.page_count = page_count
+        self.build_page = build_page
+        self.placeholder = Embed(title="Loading…")
+        self._built: "LRU[int, Embed]" = LRU(cache_size)
+        self._building: Dict[int, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        """
+        Number of pages, built or not.
+
+        :return: Page count
+        """
+        return self.page_count
+
+    @overload
+    def __getitem__(self, page_number: int) -> Embed:
+        ...  # noqa: WPS428
+
+    @overload
+    def __getitem__(self, page_number: slice) -> Sequence[Embed]:
+        ...  # noqa: WPS428
+
+    def __getitem__(
+        self, page_number: Union[int, slice]
+    ) -> Union[Embed, Sequence[Embed]]:
+        """
+        Built page, or a placeholder when it was not built yet.
+
+        :param page_number: Zero-indexed page number, or a slice of them
+        :return: Page embed, or the embeds of the slice
+        """
+        if isinstance(page_number, slice):
+            return [self[index] for index in range(*page_number.indices(len(self)))]
+        if not 0 <= page_number < self.page_count:
+            raise IndexError(page_number)
+        return self._built.get(page_number, self.placeholder)
+
+    def is_built(self, page_number: int) -> bool:
+        """
+        Indicates if a page can be shown without waiting.
+
+        :param page_number: Zero-indexed page number
+        :return: True when the page is cached
+        """
+        return page_number in self._built
+
+    async def build(self, page_number: int) -> Embed:
+        """
+        Build page once for all concurrent callers, served from cache afterwards.
+
+        :param page_number: Zero-indexed page number
+        :return: Page embed
+        """
+        if page_number in self._built:
+            return self._built[page_number]
+
+        building = self._building.get(page_number)
+
+        if building is None:
+            building = asyncio.ensure_future(self._build(page_number))
+            self._building[page_number] = building
+        return await asyncio.shield(building)
+
+    def prefetch(self, page_number: int) -> None:
+        """
+        Build page in the background if it exists and is not built yet.
+
+        :param page_number: Zero-indexed page number
+        """
+        if 0 <= page_number < self.page_count and not self.is_built(page_number):
+            if page_number not in self._building:
+                asyncio.ensure_future(self.build(page_number)).add_done_callback(
+                    self._log_prefetch_error
+                )
+
+    async def _build(self, page_number: int) -> Embed:
+        try:
+            embed = await self.build_page(page_number)
+            self._built[page_number] = embed
+            return embed
+        finally:
+            self._building.pop(page_number, None)
+
+    @staticmethod
+    def _log_prefetch_error(future: asyncio.Future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            logger.error("Unable to prefetch page: %s", future.exception())
+
+
+class LazyPaginator(Paginator):
+    """Paginator building the page being shown and prefetching the next one."""
+
+    pages: LazyPages
+
+    async def respond(self, interaction: Interaction, *args, **kwargs):
+        """
+        Build the first page, then send the paginator.
+
+        :param interaction: Interaction to respond to
+        :param args: Positional arguments for Paginator.respond
+        :param kwargs: Keyword arguments for Paginator.respond
+        :return: Paginator message
+        """
+        await self.pages.build(self.current_page)
+        message = await super().respond(interaction, *args, **kwargs)
+        self.pages.prefetch(self.current_page + 1)
+        return message
+
+    async def goto_page(
+        self, page_number: int = 0, *, interaction: Optional[Interaction] = None
+    ) -> None:
+        """
+        Build the requested page if needed, show it and prefetch the next one.
+
+        :param page_number: Zero-indexed page number
+        :param interaction: Navigation interaction, if any
+        """
+        if interaction is not None and not self.pages.is_built(page_number):
+            # Acknowledge the click before a slow build, then edit the message
+            await interaction.response.defer()
+            interaction = None
+
+        await self.pages.build(page_number)
+        await super().goto_page(page_number, interaction=interaction)
+        self.pages.prefetch(page_number + 1)
@@ -1,13 +1,116 @@
+import asyncio
 import logging
+import time
+from typing import Dict, Optional
 
-from discord import Bot, AllowedMentions
+from discord import (
+    ApplicationContext,
+    AutoShardedBot,
+    Bot,
+    AllowedMentions,
+    DiscordException,
+)
 from tortoise import Tortoise
 
+from alerts import price_alert_engine
+from api import cache_backend
+from api.clients import clients
+from api.exchange_rates import exchange_rates
+from api.trending_feed import trending_feed
+from charts import chart_renderer
 from cogs.market_aggregator import MarketAggregator
 from cogs.monthly_draw import MonthlyDraw
-from config import DISCORD_BOT_TOKEN, DB_URL
+from cogs.price_alerts import PriceAlerts
+from config import DISCORD_BOT_TOKEN, SHARD_COUNT
+from database import init_database
+from metrics import command_latency, metrics_server
+from preload import preload_modules
+from sharding import shard_options
+from votes import vote_tracker
 
-bot = Bot(allowed_mentions=AllowedMentions(everyone=True))
+
+class Stonks(AutoShardedBot if SHARD_COUNT else Bot):  # type: ignore
+    def __init__(self, *args, **kwargs):
+        """
+        Create bot.
+
+        :param args: Positional arguments for Bot
+        :param kwargs: Keyword arguments for Bot
+        """
+        super().__init__(*args, **kwargs)
+        self.command_started: Dict[int, float] = {}
+        self.preload_task: Optional[asyncio.Task] = None
+
+    async def on_application_command(self, ctx: ApplicationContext) -> None:
+        """
+        Start timing a slash command.
+
+        :param ctx: Discord Bot Application Context
+        """
+        self.command_started[ctx.interaction.id] = time.perf_counter()
+
+    async def on_application_command_completion(self, ctx: ApplicationContext) -> None:
+        """
+        Record latency of a completed slash command.
+
+        :param ctx: Discord Bot Application Context
+        """
+        self.record_command_latency(ctx, "ok")
+
+    async def on_application_command_error(
+        self, ctx: ApplicationContext, exception: DiscordException
+    ) -> None:
+        """
+        Record latency of a failed slash command, then report the error.
+
+        :param ctx: Discord Bot Application Context
+        :param exception: Raised exception
+        """
+        self.record_command_latency(ctx, "error")
+        await super().on_application_command_error(ctx, exception)
+
+    def record_command_latency(self, ctx: ApplicationContext, outcome: str) -> None:
+        """
+        Observe time since the slash command was invoked.
+
+        :param ctx: Discord Bot Application Context
+        :param outcome: Either ok or error
+        """
+        started = self.command_started.pop(ctx.interaction.id, None)
+
+        if started is not None:
+            command_latency.observe(
+                time.perf_counter() - started, ctx.command.qualified_name, outcome
+            )
+
+    async def start(self, *args, **kwargs) -> None:
+        """
+        Set up the database once, then connect to Discord.
+
+        :param args: Positional arguments for Bot.start
+        :param kwargs: Keyword arguments for Bot.start
+        """
+        await init_database()
+        await super().start(*args, **kwargs)
+
+    async def close(self) -> None:
+        """Stop background work and close shared API clients before disconnecting."""
+        await metrics_server.stop()
+        await trending_feed.stop()
+        await exchange_rates.stop()
+        await price_alert_engine.stop()
+        await vote_tracker.stop()
+        await clients.close()
+
+        if cache_backend is not None:
+            await cache_backend.close()
+
+        chart_renderer.close()
+        await Tortoise.close_connections()
+        await super().close()
+
+
+bot = Stonks(allowed_mentions=AllowedMentions(everyone=True), **shard_options())
 
 
 @bot.event
@@ -15,11 +118,21 @@ async def on_ready() -> None:
     """Initialize discord bot."""
     logging.info(f"{bot.user} successfully logged in!")
 
-    await Tortoise.init(db_url=DB_URL, modules={"models": ["models"]})
-    await Tortoise.generate_schemas()
+    await metrics_server.start()
+    clients.start()
+    trending_feed.start()
+    exchange_rates.start()
+    price_alert_engine.start(bot)
+    vote_tracker.start(bot)
+    chart_renderer.start()
+
+    # on_ready fires again after reconnects
+    if bot.preload_task is None:
+        bot.preload_task = asyncio.create_task(preload_modules())
 
 
 if __name__ == "__main__":
     bot.add_cog(MarketAggregator(bot))
     bot.add_cog(MonthlyDraw(bot))
+    bot.add_cog(PriceAlerts(bot))
     bot.run(DISCORD_BOT_TOKEN)
@@ -0,0 +1,357 @@
+import asyncio
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Callable, DefaultDict, Dict, Iterator, List, Optional, Tuple
+
+from aiohttp import web
+
+from config import METRICS_HOST, METRICS_PORT, logger
+
+Labels = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+def format_labels(labelnames: Labels, labels: Labels, **extra: str) -> str:
+    """
+    Format label pairs as Prometheus text.
+
+    :param labelnames: Label names
+    :param labels: Label values, in labelnames order
+    :param extra: Additional labels, e.g. a histogram bucket bound
+    :return: Labels in braces, empty when there are none
+    """
+    pairs = [*zip(labelnames, labels), *extra.items()]
+
+    if not pairs:
+        return ""
+
+    escaped = (
+        (
+            name,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+class Counter:
+    """Monotonically increasing value per label combination."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Labels = ()):
+        """
+        Create counter.
+
+        :param name: Metric name
+        :param documentation: Metric help text
+        :param labelnames: Label names, values are passed positionally in this order
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: DefaultDict[Labels, float] = defaultdict(float)
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """
+        Increase counter.
+
+        :param labels: Label values
+        :param amount: Amount to add
+        """
+        self._values[labels] += amount
+
+    def collect(self) -> Iterator[str]:
+        """
+        Render samples.
+
+        :return: Prometheus text lines
+        """
+        for labels, value in self._values.items():
+            yield f"{self.name}{format_labels(self.labelnames, labels)} {value}"
+
+
+class Histogram:
+    """Distribution of observed values in cumulative buckets per label combination."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Labels = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        """
+        Create histogram.
+
+        :param name: Metric name
+        :param documentation: Metric help text
+        :param labelnames: Label names, values are passed positionally in this order
+        :param buckets: Upper bounds of the buckets, in increasing order
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # Per label combination: bucket counts (last one is +Inf), sum
+        self._values: Dict[Labels, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        """
+        Record observation.
+
+        :param value: Observed value, e.g. seconds
+        :param labels: Label values
+        """
+        entry = self._values.get(labels)
+
+        if entry is None:
+            entry = self._values[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+        entry[0][bisect_left(self.buckets, value)] += 1
+        entry[1][0] += value
+
+    def time(self, *labels: str) -> "Timer":
+        """
+        Time a block of code, including awaits inside it.
+
+        :param labels: Label values
+        :return: Context manager observing the elapsed seconds
+        """
+        return Timer(self, labels)
+
+    def collect(self) -> Iterator[str]:
+        """
+        Render samples.
+
+        :return: Prometheus text lines
+        """
+        bounds = [*map(str, self.buckets), "+Inf"]
+
+        for labels, (counts, total) in self._values.items():
+            cumulative = 0
+
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                bucket_labels = format_labels(self.labelnames, labels, le=bound)
+                yield f"{self.name}_bucket{bucket_labels} {cumulative}"
+            series_labels = format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum{series_labels} {total[0]}"
+            yield f"{self.name}_count{series_labels} {cumulative}"
+
+
+class Timer:
+    """Context manager observing elapsed seconds into a histogram."""
+
+    def __init__(self, histogram: Histogram, labels: Labels):
+        """
+        Create timer.
+
+        :param histogram: Histogram receiving the elapsed time
+        :param labels: Label values
+        """
+        self.histogram = histogram
+        self.labels = labels
+        self.started = 0.0
+
+    def __enter__(self) -> "Timer":
+        """
+        Start timing.
+
+        :return: Timer
+        """
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """
+        Stop timing and record the elapsed seconds.
+
+        :param exc_info: Exception raised inside the block, if any
+        """
+        self.histogram.observe(time.perf_counter() - self.started, *self.labels)
+
+
+class Registry:
+    """Metrics exposed on the metrics endpoint."""
+
+    def __init__(self):
+        """Create empty registry."""
+        self.metrics: List = []
+        self.caches: Dict[str, object] = {}
+        self.gauges: Dict[str, Tuple[str, Callable[[], float]]] = {}
+
+    def register(self, metric):
+        """
+        Expose metric.
+
+        :param metric: Counter or Histogram
+        :return: The metric, for assignment at module level
+        """
+        self.metrics.append(metric)
+        return metric
+
+    def add_cache(self, name: str, cache: object) -> None:
+        """
+        Expose hits, misses and hit ratio of a cache with hits and misses counters.
+
+        :param name: Cache label
+        :param cache: Cache with hits and misses attributes
+        """
+        self.caches[name] = cache
+
+    def add_gauge(
+        self, name: str, documentation: str, value: Callable[[], float]
+    ) -> None:
+        """
+        Expose value read when the metrics are scraped.
+
+        :param name: Metric name
+        :param documentation: Metric help text
+        :param value: Callable returning the current value
+        """
+        self.gauges[name] = (documentation, value)
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text format.
+
+        :return: Metrics page
+        """
+        lines = []
+
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.collect())
+
+        for name, (documentation, value) in self.gauges.items():
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {value()}")
+
+        lines.extend(self._render_caches())
+        return "\n".join(lines) + "\n"
+
+    def _render_caches(self) -> Iterator[str]:
+        if not self.caches:
+            return
+
+        families = (
+            ("cache_hits_total", "counter", "Lookups served from cache"),
+            ("cache_misses_total", "counter", "Lookups that had to load the value"),
+            ("cache_hit_ratio", "gauge", "Share of lookups served from cache"),
+        )
+
+        for name, kind, documentation in families:
+            yield f"# HELP {name} {documentation}"
+            yield f"# TYPE {name} {kind}"
+
+            for cache_name, cache in self.caches.items():
+                hits, misses = cache.hits, cache.misses  # type: ignore
+                value = {
+                    "cache_hits_total": hits,
+                    "cache_misses_total": misses,
+                    "cache_hit_ratio": hits / (hits + misses) if hits + misses else 0,
+                }[name]
+                yield f'{name}{{cache="{cache_name}"}} {value}'
+
+
+class MetricsServer:
+    """Serves the registry on a local HTTP endpoint and watches event loop lag."""
+
+    def __init__(self, host: str, port: int, lag_interval: float = 0.5):
+        """
+        Create metrics server.
+
+        :param host: Interface to listen on
+        :param port: Port to listen on, 0 disables the endpoint
+        :param lag_interval: Seconds between event loop lag probes
+        """
+        self.host = host
+        self.port = port
+        self.lag_interval = lag_interval
+        self._runner: Optional[web.AppRunner] = None
+        self._lag_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start the endpoint and the event loop lag probe, once."""
+        if self._lag_task is None:
+            self._lag_task = asyncio.create_task(self._probe_event_loop())
+
+        if self._runner is not None or not self.port:
+            return
+
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logger.info("Serving metrics on http://%s:%s/metrics", self.host, self.port)
+
+    async def stop(self) -> None:
+        """Stop the endpoint and the event loop lag probe."""
+        if self._lag_task is not None:
+            self._lag_task.cancel()
+            self._lag_task = None
+
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @staticmethod
+    async def _handle(request: web.Request) -> web.Response:
+        return web.Response(
+            text=registry.render(), content_type="text/plain", charset="utf-8"
+        )
+
+    async def _probe_event_loop(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.lag_interval)
+            event_loop_lag.observe(
+                max(0.0, time.perf_counter() - started - self.lag_interval)
+            )
+
+
+registry = Registry()
+command_latency = registry.register(
+    Histogram(
+        "command_latency_seconds",
+        "Time from slash command invocation to completion",
+        labelnames=("command", "outcome"),
+    )
+)
+upstream_requests = registry.register(
+    Counter(
+        "upstream_requests_total",
+        "Requests sent to upstream APIs",
+        labelnames=("provider", "endpoint", "outcome"),
+    )
+)
+upstream_latency = registry.register(
+    Histogram(
+        "upstream_latency_seconds",
+        "Time spent waiting for upstream API responses",
+        labelnames=("provider", "endpoint"),
+    )
+)
+chart_render_time = registry.register(
+    Histogram(
+        "chart_render_seconds",
+        "Time from chart render request to PNG, including queueing",
+        labelnames=("backend",),
+    )
+)
+event_loop_lag = registry.register(
+    Histogram(
+        "event_loop_lag_seconds",
+        "How late the event loop wakes up a sleeping coroutine",
+        buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+    )
+)
+metrics_server = MetricsServer(host=METRICS_HOST, port=METRICS_PORT)
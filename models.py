@@ -1,12 +1,26 @@
 import datetime
-from random import shuffle
-from typing import List
+from typing import List, Optional
 
-from tortoise import fields
+from tortoise import Tortoise, fields
+from tortoise.functions import Lower
 from tortoise.models import Model
 
 from config import logger
 
+# One random submission per symbol, then a random sample of those, so a token
+# submitted many times has the same chance as any other
+RANDOM_SUBMISSIONS_QUERY = """
+SELECT id FROM (
+    SELECT DISTINCT ON (lower(symbol)) id
+    FROM monthlysubmission
+    WHERE date_submitted BETWEEN $1 AND $2
+    AND (guild_id = $3 OR guild_id IS NULL)
+    ORDER BY lower(symbol), random()
+) AS one_per_symbol
+ORDER BY random()
+LIMIT $4
+"""
+
 
 class MonthlySubmission(Model):
     """MonthlySubmission database table ORM."""
@@ -15,24 +29,61 @@ class MonthlySubmission(Model):
     token_name = fields.TextField()
     description = fields.TextField()
     symbol = fields.TextField()
-    date_submitted = fields.DateField(default=datetime.date.today())
+    date_submitted = fields.DateField(default=datetime.date.today)
+    # Null for submissions made before guilds were recorded
+    guild_id = fields.BigIntField(null=True)
+
+    @classmethod
+    async def is_submitted(
+        cls,
+        token_name: str,
+        symbol: str,
+        since: datetime.date,
+        guild_id: Optional[int],
+    ) -> bool:
+        """
+        Check if token was submitted, ignoring case, with an EXISTS query.
 
+        :param token_name: Name of token
+        :param symbol: Symbol of token
+        :param since: Earliest submission date considered
+        :param guild_id: Guild the token was submitted in
+        :return: True when a matching submission exists
+        """
+        return await (
+            cls.annotate(
+                token_name_lower=Lower("token_name"), symbol_lower=Lower("symbol")
+            )
+            .filter(
+                token_name_lower=token_name.lower(),
+                symbol_lower=symbol.lower(),
+                date_submitted__gte=since,
+                guild_id=guild_id,
+            )
+            .exists()
+        )
+
+    @classmethod
     async def get_randomized_submissions(
-        self, date_range: List[str]
+        cls, date_range: List[datetime.date], guild_id: Optional[int], limit: int = 10
     ) -> List["MonthlySubmission"]:
         """
-        Retrieve up to 10 randomly picked submissions.
+        Retrieve randomly picked submissions, at most one per symbol.
+
+        Sampling runs in the database, only the picked rows are loaded.
 
-        :rtype: object
-        :param date_range: Range between to dates to query the database
+        :param date_range: First and last submission date to draw from
+        :param guild_id: Guild holding the draw
+        :param limit: Maximum number of submissions
         :return: List of submissions
         """
         logger.info("Gathering poll submissions")
-        submissions: List[MonthlySubmission] = await self.filter(
-            date_submitted__range=date_range
+        rows = await Tortoise.get_connection("default").execute_query_dict(
+            RANDOM_SUBMISSIONS_QUERY, [*date_range, guild_id, limit]
         )
-        shuffle(submissions)
-        return submissions[:10]
+        ids = [row["id"] for row in rows]
+        submissions = await cls.in_bulk(ids)
+        return [submissions[submission_id] for submission_id in ids]
 
     def __repr__(self):
         """
@@ -50,3 +101,119 @@ class MonthlySubmission(Model):
         :return: Model as string
         """
         return f"{self.token_name} ({self.symbol})"
+
+
+class OHLCSeries(Model):
+    """OHLCSeries database table ORM, tracks which candles are stored per coin."""
+
+    id = fields.IntField(pk=True)
+    coin_id = fields.CharField(max_length=255)
+    vs_currency = fields.CharField(max_length=16)
+    granularity = fields.IntField()
+    covered_since = fields.BigIntField()
+    last_timestamp = fields.BigIntField()
+
+    class Meta:
+        unique_together = (("coin_id", "vs_currency", "granularity"),)
+
+    def __str__(self):
+        """
+        Convert model to string.
+
+        :return: Model as string
+        """
+        return f"{self.coin_id}/{self.vs_currency} ({self.granularity}s)"
+
+
+class OHLCCandle(Model):
+    """OHLCCandle database table ORM."""
+
+    id = fields.BigIntField(pk=True)
+    coin_id = fields.CharField(max_length=255)
+    vs_currency = fields.CharField(max_length=16)
+    granularity = fields.IntField()
+    timestamp = fields.BigIntField()
+    open = fields.FloatField()
+    high = fields.FloatField()
+    low = fields.FloatField()
+    close = fields.FloatField()
+
+    class Meta:
+        unique_together = (("coin_id", "vs_currency", "granularity", "timestamp"),)
+
+    def __str__(self):
+        """
+        Convert model to string.
+
+        :return: Model as string
+        """
+        return f"{self.coin_id}/{self.vs_currency} @ {self.timestamp}"
+
+
+class PriceAlert(Model):
+    """PriceAlert database table ORM."""
+
+    id = fields.IntField(pk=True)
+    user_id = fields.BigIntField()
+    guild_id = fields.BigIntField(null=True)
+    channel_id = fields.BigIntField()
+    symbol = fields.TextField()
+    coin_id = fields.CharField(max_length=255, index=True)
+    direction = fields.CharField(max_length=5)
+    threshold = fields.FloatField()
+    created_at = fields.DatetimeField(auto_now_add=True)
+    triggered_at = fields.DatetimeField(null=True, index=True)
+
+    def __str__(self):
+        """
+        Convert model to string.
+
+        :return: Model as string
+        """
+        return f"{self.symbol} {self.direction} ${self.threshold:,}"
+
+
+class DrawPoll(Model):
+    """DrawPoll database table ORM, a monthly draw message collecting votes."""
+
+    id = fields.IntField(pk=True)
+    message_id = fields.BigIntField(unique=True)
+    guild_id = fields.BigIntField(null=True)
+    channel_id = fields.BigIntField()
+    closes_at = fields.DatetimeField()
+    closed_at = fields.DatetimeField(null=True, index=True)
+
+    options: fields.ReverseRelation["DrawPollOption"]
+
+    def __str__(self):
+        """
+        Convert model to string.
+
+        :return: Model as string
+        """
+        return f"Poll {self.message_id} closing {self.closes_at:%Y-%m-%d}"
+
+
+class DrawPollOption(Model):
+    """DrawPollOption database table ORM, vote tally of one submission in a poll."""
+
+    id = fields.IntField(pk=True)
+    poll: fields.ForeignKeyRelation[DrawPoll] = fields.ForeignKeyField(
+        "models.DrawPoll", related_name="options"
+    )
+    submission: fields.ForeignKeyRelation[MonthlySubmission] = fields.ForeignKeyField(
+        "models.MonthlySubmission", related_name="poll_options"
+    )
+    emoji = fields.CharField(max_length=16)
+    votes = fields.IntField(default=0)
+
+    class Meta:
+        unique_together = (("poll", "emoji"),)
+
+    def __str__(self):
+        """
+        Convert model to string.
+
+        :return: Model as string
+        """
+        return f"{self.emoji} {self.votes} votes"
@@ -0,0 +1,201 @@
+import time
+from typing import TYPE_CHECKING, Optional
+
+from tortoise.exceptions import BaseORMException
+from tortoise.transactions import in_transaction
+
+from api.clients import clients
+from config import logger
+from constants import CHART_CANDLE_INTERVALS
+from models import OHLCCandle, OHLCSeries
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+DAY_MS = 24 * 60 * 60 * 1000
+OHLC_COLUMNS = ["Date", "Open", "High", "Low", "Close"]
+
+
+async def get_market_data(ids: str, time_frame: str, base_coin: str) -> "DataFrame":
+    """
+    Retrieve OHLC data, fetching only candles missing from the local store.
+
+    Falls back to a full CoinGecko request when the database is unavailable.
+
+    :param ids: id of coin to lookup
+    :param time_frame: Number of days for data span, one of CHART_CANDLE_INTERVALS
+    :param base_coin: Base currency
+    :return: OHLC data with Date, Open, High, Low and Close columns
+    """
+    try:
+        return await load_market_data(
+            ids=ids, time_frame=time_frame, base_coin=base_coin
+        )
+    except BaseORMException as error:
+        logger.error("OHLC store unavailable, fetching directly: %s", error)
+        return await clients.coin_gecko.coin_market_lookup(
+            ids=ids, time_frame=time_frame, base_coin=base_coin
+        )
+
+
+async def load_market_data(ids: str, time_frame: str, base_coin: str) -> "DataFrame":
+    """
+    Top up stored candles from CoinGecko and read the requested window.
+
+    :param ids: id of coin to lookup
+    :param time_frame: Number of days for data span, one of CHART_CANDLE_INTERVALS
+    :param base_coin: Base currency
+    :return: OHLC data with Date, Open, High, Low and Close columns
+    """
+    granularity = CHART_CANDLE_INTERVALS[time_frame]
+    now = int(time.time() * 1000)
+    window_start = 0 if time_frame == "max" else now - int(time_frame) * DAY_MS
+    series = await OHLCSeries.get_or_none(
+        coin_id=ids, vs_currency=base_coin, granularity=granularity
+    )
+    days = days_to_fetch(series, time_frame, window_start, now)
+
+    if days is not None:
+        market = await clients.coin_gecko.coin_market_lookup(
+            ids=ids, time_frame=days, base_coin=base_coin
+        )
+        fetched_since = 0 if days == "max" else now - int(days) * DAY_MS
+        await store_market_data(
+            series, ids, base_coin, granularity, market, fetched_since
+        )
+    else:
+        logger.info("Serving chart data for %s from the OHLC store", ids)
+
+    candles = (
+        await OHLCCandle.filter(
+            coin_id=ids,
+            vs_currency=base_coin,
+            granularity=granularity,
+            timestamp__gte=window_start,
+        )
+        .order_by("timestamp")
+        .values_list("timestamp", "open", "high", "low", "close")
+    )
+    from pandas import DataFrame, to_datetime  # noqa: WPS433
+
+    dataframe = DataFrame(candles, columns=OHLC_COLUMNS)
+    dataframe.Date = to_datetime(dataframe.Date, unit="ms")
+    return dataframe
+
+
+def days_to_fetch(
+    series: Optional[OHLCSeries], time_frame: str, window_start: int, now: int
+) -> Optional[str]:
+    """
+    Smallest CoinGecko "days" choice returning every candle the store is missing.
+
+    Choices are limited to those sharing the granularity of the requested time
+    frame, since CoinGecko picks the candle size from the number of days.
+
+    :param series: Stored coverage, None when nothing is stored yet
+    :param time_frame: Requested number of days
+    :param window_start: Start of the requested window in milliseconds
+    :param now: Current time in milliseconds
+    :return: Number of days to fetch, None when the store is up to date
+    """
+    granularity = CHART_CANDLE_INTERVALS[time_frame]
+
+    if series is None or series.covered_since > window_start + granularity * 1000:
+        return time_frame
+
+    missing = now - series.last_timestamp
+
+    if missing < granularity * 1000:
+        return None
+
+    for days, interval in CHART_CANDLE_INTERVALS.items():
+        if interval != granularity:
+            continue
+
+        if days == "max" or int(days) * DAY_MS >= missing:
+            return days
+    return time_frame
+
+
+async def store_market_data(
+    series: Optional[OHLCSeries],
+    ids: str,
+    base_coin: str,
+    granularity: int,
+    market: "DataFrame",
+    fetched_since: int,
+) -> None:
+    """
+    Insert candles outside the stored coverage and extend it.
+
+    The newest stored candle is replaced since it may have still been open. When
+    the fetched window starts after the newest stored candle, the stored candles
+    are dropped and the coverage restarts at the fetched window, so the gap in
+    between is never reported as covered.
+
+    :param series: Stored coverage, None when nothing is stored yet
+    :param ids: id of coin
+    :param base_coin: Base currency
+    :param granularity: Seconds covered by one candle
+    :param market: Fetched OHLC data
+    :param fetched_since: Start of the fetched window in milliseconds
+    """
+    if market.empty:
+        return
+
+    timestamps = market.Date.astype("int64") // 10**6
+    missing = timestamps >= 0
+    gap = series is not None and fetched_since > series.last_timestamp
+
+    if series is not None and not gap:
+        missing = (timestamps < series.covered_since) | (
+            timestamps >= series.last_timestamp
+        )
+
+    candles = [
+        OHLCCandle(
+            coin_id=ids,
+            vs_currency=base_coin,
+            granularity=granularity,
+            timestamp=timestamp,
+            open=open_price,
+            high=high,
+            low=low,
+            close=close,
+        )
+        for timestamp, open_price, high, low, close in zip(
+            timestamps[missing].tolist(),
+            market.Open[missing].tolist(),
+            market.High[missing].tolist(),
+            market.Low[missing].tolist(),
+            market.Close[missing].tolist(),
+        )
+    ]
+    last_timestamp = int(timestamps.max())
+
+    async with in_transaction():
+        if series is not None:
+            await OHLCCandle.filter(
+                coin_id=ids,
+                vs_currency=base_coin,
+                granularity=granularity,
+                timestamp__gte=series.covered_since if gap else series.last_timestamp,
+            ).delete()
+
+        await OHLCCandle.bulk_create(candles)
+
+        if series is None:
+            await OHLCSeries.create(
+                coin_id=ids,
+                vs_currency=base_coin,
+                granularity=granularity,
+                covered_since=fetched_since,
+                last_timestamp=last_timestamp,
+            )
+        else:
+            if gap:
+                series.covered_since = fetched_since
+            else:
+                series.covered_since = min(series.covered_since, fetched_since)
+            series.last_timestamp = max(series.last_timestamp, last_timestamp)
+            await series.save(update_fields=["covered_since", "last_timestamp"])
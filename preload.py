@@ -0,0 +1,29 @@
+import asyncio
+import importlib
+import time
+from typing import List
+
+from config import PRELOAD_MODULES, logger
+
+
+async def preload_modules(modules: List[str] = PRELOAD_MODULES) -> None:
+    """
+    Import heavy modules in a worker thread after startup.
+
+    Modules such as pandas are imported where they are first used, so the bot
+    connects without them. Preloading keeps the first command using them from
+    paying their import time on the event loop.
+
+    :param modules: Module names, imported in order
+    """
+    loop = asyncio.get_running_loop()
+
+    for module in modules:
+        started = time.perf_counter()
+
+        try:
+            await loop.run_in_executor(None, importlib.import_module, module)
+        except ImportError as error:
+            logger.error("Unable to preload %s: %s", module, error)
+        else:
+            logger.info("Preloaded %s in %.2fs", module, time.perf_counter() - started)
@@ -0,0 +1,149 @@
+"""
+Shard settings of the bot process, and a launcher splitting shards across processes.
+
+Every launched process runs ``main.py`` with its own range of shards, and its
+own metrics port when metrics are enabled. Background jobs only handle the
+guilds of their process, and caches and rate limits are shared through
+``CACHE_URL``.
+
+Usage: python -m sharding --processes 4 --shard-count 16
+"""
+import argparse
+import os
+import signal
+import subprocess  # noqa: S404
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from config import METRICS_PORT, SHARD_COUNT, SHARD_IDS, logger
+
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+# Discord accepts one shard identify every 5 seconds by default
+IDENTIFY_INTERVAL = 5
+
+
+def parse_shard_ids(shard_ids: str) -> List[int]:
+    """
+    Parse a list of shard ids and ranges.
+
+    :param shard_ids: e.g. "0-3,6"
+    :return: Shard ids in order, e.g. [0, 1, 2, 3, 6]
+    """
+    parsed: List[int] = []
+
+    for part in shard_ids.split(","):
+        first, _, last = part.strip().partition("-")
+        parsed.extend(range(int(first), int(last or first) + 1))
+    return parsed
+
+
+def shard_options(
+    shard_count: Optional[str] = SHARD_COUNT, shard_ids: Optional[str] = SHARD_IDS
+) -> Dict[str, Any]:
+    """
+    Keyword arguments of AutoShardedBot.
+
+    :param shard_count: Total number of shards, "auto" for the recommended count
+    :param shard_ids: Shards run by this process, all shards when omitted
+    :return: shard_count and shard_ids, empty when sharding is disabled
+    """
+    if not shard_count:
+        return {}
+    return {
+        "shard_count": None if shard_count == "auto" else int(shard_count),
+        "shard_ids": parse_shard_ids(shard_ids) if shard_ids else None,
+    }
+
+
+def owns_guild(bot: Any, guild_id: Optional[int]) -> bool:
+    """
+    Indicates if the guild is served by a shard of this process.
+
+    Direct messages belong to shard 0, as they do on Discord.
+
+    :param bot: Discord bot, sharded or not
+    :param guild_id: Guild id, None outside of guilds
+    :return: True when this process runs the guild's shard
+    """
+    shard_ids = getattr(bot, "shard_ids", None)
+
+    if shard_ids is None:
+        return True
+    shard_id = 0 if guild_id is None else (guild_id >> 22) % bot.shard_count
+    return shard_id in shard_ids
+
+
+def split_shards(shard_count: int, processes: int) -> List[List[int]]:
+    """
+    Split shards into contiguous ranges of similar size.
+
+    :param shard_count: Total number of shards
+    :param processes: Number of processes
+    :return: Shard ids of each process
+    """
+    processes = min(processes, shard_count)
+    return [
+        list(
+            range(
+                index * shard_count // processes,
+                (index + 1) * shard_count // processes,
+            )
+        )
+        for index in range(processes)
+    ]
+
+
+def launch(processes: int, shard_count: int) -> int:
+    """
+    Run the bot in several processes until all of them exit.
+
+    :param processes: Number of bot processes
+    :param shard_count: Total number of shards
+    :return: Highest exit code of the processes
+    """
+    children: List[subprocess.Popen] = []
+    stopping = []
+
+    def terminate(signum: int, frame: Any) -> None:
+        stopping.append(signum)
+
+        for child in children:
+            child.terminate()
+
+    signal.signal(signal.SIGTERM, terminate)
+    signal.signal(signal.SIGINT, terminate)
+
+    for index, shard_ids in enumerate(split_shards(shard_count, processes)):
+        if children:
+            # Processes identify one shard at a time, let the previous one finish
+            time.sleep(IDENTIFY_INTERVAL * len(shard_ids))
+
+        if stopping:
+            break
+
+        environment = dict(
+            os.environ,
+            SHARD_COUNT=str(shard_count),
+            SHARD_IDS=f"{shard_ids[0]}-{shard_ids[-1]}",
+        )
+
+        if METRICS_PORT:
+            environment["METRICS_PORT"] = str(METRICS_PORT + index)
+
+        logger.info("Starting shards %s-%s", shard_ids[0], shard_ids[-1])
+        children.append(
+            subprocess.Popen(  # noqa: S603
+                [sys.executable, MAIN_SCRIPT], env=environment
+            )
+        )
+
+    return max(child.wait() for child in children)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--processes", type=int, required=True)
+    parser.add_argument("--shard-count", type=int, required=True)
+    args = parser.parse_args()
+    sys.exit(launch(processes=args.processes, shard_count=args.shard_count))
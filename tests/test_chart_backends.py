@@ -0,0 +1,76 @@
+from typing import List
+
+import pytest
+from PIL import ImageDraw
+from pandas import DataFrame, to_datetime
+
+from chart_backends import NativeChartBackend, PlotlyChartBackend
+
+
+@pytest.fixture
+def market() -> DataFrame:
+    """Three daily candles."""
+    return DataFrame(
+        {
+            "Date": to_datetime([0, 86400000, 172800000], unit="ms"),
+            "Open": [0.25, 0.3, 0.28],
+            "High": [0.32, 0.34, 0.31],
+            "Low": [0.24, 0.27, 0.26],
+            "Close": [0.3, 0.28, 0.29],
+        }
+    )
+
+
+@pytest.fixture
+def drawn_text(monkeypatch: pytest.MonkeyPatch) -> List[str]:
+    """Text drawn into native charts."""
+    texts: List[str] = []
+    draw_text = ImageDraw.ImageDraw.text
+
+    def record_text(self, xy, text, *args, **kwargs):
+        texts.append(text)
+        return draw_text(self, xy, text, *args, **kwargs)
+
+    monkeypatch.setattr(ImageDraw.ImageDraw, "text", record_text)
+    return texts
+
+
+def test_plotly_labels_prices_in_chart_currency(market: DataFrame) -> None:
+    fig = PlotlyChartBackend.build_figure(market, "BTC", currency="eur", unit="€")
+
+    assert fig.layout.yaxis.title.text == "Price (EUR)"
+    assert fig.layout.yaxis.tickprefix == "€"
+
+
+def test_plotly_writes_currency_codes_after_prices(market: DataFrame) -> None:
+    fig = PlotlyChartBackend.build_figure(market, "ETH", currency="btc", unit="BTC")
+
+    assert fig.layout.yaxis.title.text == "Price (BTC)"
+    assert fig.layout.yaxis.ticksuffix == " BTC"
+    assert fig.layout.yaxis.tickprefix is None
+
+
+def test_native_labels_prices_in_chart_currency(
+    market: DataFrame, drawn_text: List[str]
+) -> None:
+    image = NativeChartBackend().render(market, "ETH", currency="btc", unit="BTC")
+
+    assert image.startswith(b"\x89PNG")
+    assert "Price (BTC)" in drawn_text
+    assert "0.30 BTC" in drawn_text
+    assert not any("USD" in text or "$" in text for text in drawn_text)
+
+
+def test_native_formats_symbol_units_before_prices() -> None:
+    assert NativeChartBackend.format_price(1000, 100, unit="€") == "€1,000"
+
+
+def test_native_skips_candles_with_missing_prices(
+    market: DataFrame, drawn_text: List[str]
+) -> None:
+    market.loc[1, ["High", "Low"]] = float("nan")
+
+    image = NativeChartBackend().render(market, "ETH")
+
+    assert image.startswith(b"\x89PNG")
+    assert "$0.30" in drawn_text
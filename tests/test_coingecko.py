@@ -0,0 +1,75 @@
+import asyncio
+import time
+from typing import List
+
+import pytest
+from aiohttp import ClientSession, web
+
+import api.coingecko
+from api.coingecko import CoinGecko, parse_retry_after
+from api.rate_limiter import RateLimiter
+
+RETRY_AFTER = 0.5
+
+
+async def fetch_through_rate_limited_stub(requested_at: List[float]) -> list:
+    """
+    Request trending coins from a stub answering the first call with HTTP 429.
+
+    :param requested_at: Receives the time of every request the stub gets
+    :return: Trending coins
+    """
+
+    async def handle(request: web.Request) -> web.Response:
+        requested_at.append(time.monotonic())
+
+        if len(requested_at) == 1:
+            return web.json_response(
+                {"error": "rate limited"},
+                status=429,
+                headers={"Retry-After": str(RETRY_AFTER)},
+            )
+        return web.json_response(
+            {"coins": [{"item": {"name": "Bitcoin", "symbol": "BTC"}}]}
+        )
+
+    app = web.Application()
+    app.router.add_get("/search/trending", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # noqa: WPS437
+
+    try:
+        async with ClientSession() as session:
+            coin_gecko = CoinGecko(
+                client_session=session, api_base_url=f"http://127.0.0.1:{port}/"
+            )
+            return await coin_gecko.get_trending_coins()
+    finally:
+        await runner.cleanup()
+
+
+def test_rate_limited_request_waits_for_retry_after(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # Without the header the retry would only wait the tiny exponential backoff
+    monkeypatch.setattr(
+        api.coingecko, "rate_limiter", RateLimiter(limits={}, backoff=0.01)
+    )
+    requested_at: List[float] = []
+
+    trending = asyncio.run(fetch_through_rate_limited_stub(requested_at))
+
+    assert trending == ["Bitcoin (BTC)"]
+    assert len(requested_at) == 2
+    assert requested_at[1] - requested_at[0] >= RETRY_AFTER
+
+
+@pytest.mark.parametrize(
+    ("header", "seconds"),
+    [("30", 30.0), ("1.5", 1.5), (None, None), ("Wed, 21 Oct 2015 07:28:00 GMT", None)],
+)
+def test_parse_retry_after(header, seconds) -> None:
+    assert parse_retry_after(header) == seconds
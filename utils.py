@@ -1,34 +1,52 @@
+from functools import partial
 from http.client import HTTPException
-from operator import itemgetter
-from typing import List, Dict, Any
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Sequence, Tuple
 from urllib.error import HTTPError
 from urllib.parse import urlparse
 
-from discord import Embed, Interaction
+from aiocoingecko import LibraryException
+from coinmarketcapapi import CoinMarketCapAPIError
+from discord import Embed, Message
+from requests.exceptions import RequestException
 
-from api.coingecko import CoinGecko
-from api.coinmarketcap import CoinMarketCap
+from api import coin_stats_cache
+from api.clients import clients
+from api.coingecko import COINGECKO_MARKETS_PAGE_SIZE
+from api.rate_limiter import RateLimitExceeded
+from coin_stats import CoinStats
 from config import logger
 
+if TYPE_CHECKING:
+    from pandas import DataFrame
 
-def get_coin_explorers(platforms: dict, links: dict) -> list:
+COIN_STATS_ERRORS = (
+    TypeError,
+    KeyError,
+    IndexError,
+    RequestException,
+    LibraryException,
+    RateLimitExceeded,
+)
+
+
+def get_coin_explorers(coin_stats: CoinStats) -> list:
     """
     Locate token explorers and stores them in a list.
 
     Args:
-        platforms (dict): Chains where token is available
-        links (dict): Blockchain sites
+        coin_stats (CoinStats): Coin with its blockchain sites and the chains
+            where it is available
 
     Returns (list): List of all available explorers
 
     """
     explorers = [
         f"[{urlparse(link).hostname.split('.')[0]}]({link})"
-        for link in links["blockchain_site"]
+        for link in coin_stats.blockchain_sites
         if link
     ]
 
-    for network, address in platforms.items():
+    for network, address in coin_stats.platforms.items():
         explorer = ""
 
         if "ethereum" in network:
@@ -57,125 +75,148 @@ async def get_coin_ids(symbol: str) -> list:
     Returns: List of matching symbols
 
     """
-    coin_gecko = CoinGecko()
-    coin_market_cap = CoinMarketCap()
     try:
-        coin_ids = await coin_gecko.get_coin_ids(symbol=symbol)
+        coin_ids = await clients.coin_gecko.get_coin_ids(symbol=symbol)
     except (IndexError, HTTPError):
-        coin_ids = coin_market_cap.get_coin_ids(symbol=symbol)
+        coin_ids = await clients.coin_market_cap.get_coin_ids(symbol=symbol)
     return coin_ids
 
 
-async def get_coin_stats(coin_id: str) -> Dict[str, Any]:
+async def get_coin_stats(coin_id: str) -> CoinStats:
+    """Retrieve coin stats, served from cache while fresh.
+
+    Concurrent requests for the same coin share a single upstream lookup.
+
+    Args:
+        coin_id (str): ID of coin to lookup in cryptocurrency market aggregators
+
+    Returns:
+        CoinStats: Cryptocurrency coin statistics
+    """
+    return await coin_stats_cache.get_or_load(
+        key=coin_id, loader=partial(lookup_coin_stats, coin_id=coin_id)
+    )
+
+
+async def lookup_coin_stats(coin_id: str) -> CoinStats:
     """Retrieve coin stats from connected services crypto services.
 
     Args:
         coin_id (str): ID of coin to lookup in cryptocurrency market aggregators
 
     Returns:
-        dict: Cryptocurrency coin statistics
+        CoinStats: Cryptocurrency coin statistics
     """
     # Search with CoinGecko API
     logger.info(f"Getting coin stats for {coin_id}")
-    coin_gecko = CoinGecko()
-    coin_stats: Dict[str, Any] = {}
-    price, all_time_high, market_cap, volume = "0", "0", "0", "0"
     try:
-        token_data = await coin_gecko.coin_lookup(ids=coin_id)
-
-        market_data, links, platforms = itemgetter("market_data", "links", "platforms")(
-            token_data
-        )
-        (
-            percent_change_24h,
-            percent_change_7d,
-            percent_change_30d,
-            market_cap_rank,
-        ) = itemgetter(
-            "price_change_percentage_24h",
-            "price_change_percentage_7d",
-            "price_change_percentage_30d",
-            "market_cap_rank",
-        )(
-            market_data
-        )
-        percent_change_ath = market_data["ath_change_percentage"]["usd"]
-        explorers = get_coin_explorers(platforms=platforms, links=links)
-
-        if "usd" in market_data["current_price"]:
-            price = f"${float(market_data['current_price']['usd']):,}"
-            all_time_high = f"${float(market_data['ath']['usd']):,}"
-            market_cap = f"${float(market_data['market_cap']['usd']):,}"
-            volume = f"${float(market_data['total_volume']['usd']):,}"
-
-        coin_stats.update(
-            {
-                "name": token_data["name"],
-                "symbol": token_data["symbol"].upper(),
-                "website": links["homepage"][0],
-                "explorers": explorers,
-                "price": price,
-                "ath": all_time_high,
-                "market_cap_rank": market_cap_rank,
-                "market_cap": market_cap,
-                "volume": volume,
-                "percent_change_24h": percent_change_24h or 0,
-                "percent_change_7d": percent_change_7d or 0,
-                "percent_change_30d": percent_change_30d or 0,
-                "percent_change_ath": percent_change_ath or 0,
-            }
-        )
-
+        token_data = await clients.coin_gecko.coin_lookup(ids=coin_id)
+        return CoinStats.from_coingecko(token_data=token_data)
     except (IndexError, HTTPError, HTTPException):
         # Search with CoinMarketCap API
         logger.info(
             f"{coin_id} not found in CoinGecko. Initiated lookup on CoinMarketCap."
         )
-        coin_market_cap = CoinMarketCap()
         ids = coin_id[0]
-        coin_lookup = coin_market_cap.coin_lookup(ids=ids)
-        meta_data = coin_market_cap.get_coin_metadata(ids=ids)[ids]
-        token_data = coin_lookup[ids]
-        urls = meta_data["urls"]
-        quote = token_data["quote"]["USD"]
-        explorers = [
-            f"[{urlparse(link).hostname.split('.')[0]}]({link})"
-            for link in urls["explorer"]
-            if link
-        ]
-
-        price = f"${quote['price']:,}"
-        market_cap = f"${quote['market_cap']:,}"
-        volume = f"${quote['volume_24h']:,}"
-        percent_change_24h = quote["percent_change_24h"]
-        percent_change_7d = quote["percent_change_7d"]
-        percent_change_30d = quote["percent_change_30d"]
-
-        coin_stats.update(
-            {
-                "name": token_data["name"],
-                "symbol": token_data["symbol"],
-                "website": urls["website"][0],
-                "explorers": explorers,
-                "price": price,
+        coin_lookup = await clients.coin_market_cap.coin_lookup(ids=ids)
+        meta_data = (await clients.coin_market_cap.get_coin_metadata(ids=ids))[ids]
+        return CoinStats.from_coinmarketcap(
+            token_data=coin_lookup[ids], meta_data=meta_data
+        )
+
+
+async def get_market_quotes(
+    symbols: List[str],
+) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+    """
+    Quote several symbols with bulk requests to each market aggregator.
+
+    Symbols are resolved to CoinGecko ids and quoted through coins/markets, one
+    request per 250 ids and none when no symbol resolves, keeping the highest
+    ranked coin when a symbol matches several. Symbols CoinGecko cannot quote
+    are looked up in one CoinMarketCap request.
+
+    Args:
+        symbols: Upper-case token symbols
+
+    Returns: Quote by symbol and the symbols no aggregator could quote
+
+    """
+    quotes: Dict[str, Dict[str, Any]] = {}
+    coin_ids: List[str] = []
+
+    if not symbols:
+        return quotes, []
+
+    for symbol in symbols:
+        coin_ids.extend(await clients.coin_gecko.get_coin_ids(symbol=symbol))
+
+    markets: List[Dict[str, Any]] = []
+
+    try:
+        for start in range(0, len(coin_ids), COINGECKO_MARKETS_PAGE_SIZE):
+            markets.extend(
+                await clients.coin_gecko.coin_markets_lookup(
+                    ids=coin_ids[start : start + COINGECKO_MARKETS_PAGE_SIZE],
+                    vs_currency="usd",
+                )
+            )
+    except (LibraryException, RateLimitExceeded) as error:
+        logger.error(error)
+
+    for market in markets:
+        symbol = market["symbol"].upper()
+        rank = market["market_cap_rank"] or float("inf")
+
+        if symbol in quotes and quotes[symbol]["market_cap_rank"] <= rank:
+            continue
+
+        quotes[symbol] = {
+            "coin_id": market["id"],
+            "symbol": symbol,
+            "price": market["current_price"],
+            "market_cap_rank": rank,
+            "market_cap": market["market_cap"],
+            "percent_change_24h": market["price_change_percentage_24h"],
+            "percent_change_7d": market.get("price_change_percentage_7d_in_currency"),
+        }
+
+    missing = [symbol for symbol in symbols if symbol not in quotes]
+
+    if missing:
+        try:
+            coin_market_cap_quotes = await clients.coin_market_cap.quotes_lookup(
+                symbols=missing
+            )
+        except (
+            RequestException,
+            CoinMarketCapAPIError,
+            RateLimitExceeded,
+        ) as error:
+            logger.error(error)
+            coin_market_cap_quotes = {}
+
+        for symbol, token_data in coin_market_cap_quotes.items():
+            quote = token_data["quote"]["USD"]
+            quotes[symbol.upper()] = {
+                "coin_id": None,
+                "symbol": symbol.upper(),
+                "price": quote["price"],
                 "market_cap_rank": token_data["cmc_rank"],
-                "market_cap": market_cap,
-                "volume": volume,
-                "percent_change_24h": percent_change_24h or 0,
-                "percent_change_7d": percent_change_7d or 0,
-                "percent_change_30d": percent_change_30d or 0,
+                "market_cap": quote["market_cap"],
+                "percent_change_24h": quote["percent_change_24h"],
+                "percent_change_7d": quote["percent_change_7d"],
             }
-        )
 
-    return coin_stats
+    return quotes, [symbol for symbol in symbols if symbol not in quotes]
 
 
-async def add_reactions(message: Interaction, reactions: List[str]) -> None:
+async def add_reactions(message: Message, reactions: List[str]) -> None:
     """
     Add reactions to a message.
 
     :param message: The message to add reactions to
-    :type message: Interaction
+    :type message: Message
     :param reactions: A list of reactions to add to the message
     :type reactions: List[str]
     """
@@ -183,28 +224,169 @@ async def add_reactions(message: Interaction, reactions: List[str]) -> None:
         await message.add_reaction(reaction)
 
 
-def generate_price_embed(token_data: dict) -> Embed:
+def format_amount(amount: Optional[float], unit: str = "$") -> str:
+    """
+    Format amount in full, as shown by the price command.
+
+    :param amount: Amount in the currency of the unit
+    :param unit: Currency unit, symbols are prefixed and codes such as BTC appended
+    :return: Formatted amount, "0" when the amount is unknown
+    """
+    if amount is None:
+        return "0"
+    return f"{unit}{amount:,}" if len(unit) == 1 else f"{amount:,} {unit}"
+
+
+def format_compact_usd(amount: Optional[float]) -> str:
+    """
+    Format dollar amount for narrow table columns.
+
+    :param amount: Dollar amount
+    :return: Formatted amount, e.g. $1.23B
+    """
+    if amount is None:
+        return "-"
+
+    for divisor, suffix in ((1e12, "T"), (1e9, "B"), (1e6, "M"), (1e3, "K")):
+        if abs(amount) >= divisor:
+            return f"${amount / divisor:.2f}{suffix}"
+    return format_usd_price(amount)
+
+
+def format_usd_price(price: Optional[float]) -> str:
+    """
+    Format token price with cents, or significant digits below one dollar.
+
+    :param price: Token price in dollars
+    :return: Formatted price, e.g. $19,000.50 or $0.0001234
+    """
+    if price is None:
+        return "-"
+    return f"${price:,.2f}" if abs(price) >= 1 else f"${price:.4g}"
+
+
+def format_table(rows: Sequence[Sequence[str]]) -> str:
+    """
+    Format rows as an aligned table in a code block.
+
+    :param rows: Header row followed by data rows, all of the same length
+    :return: Table with the first column left-aligned and the others right-aligned
+    """
+    widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+    table = "\n".join(
+        " ".join(
+            cell.ljust(width) if column == 0 else cell.rjust(width)
+            for column, (cell, width) in enumerate(zip(row, widths))
+        )
+        for row in rows
+    )
+    return f"```\n{table}\n```"
+
+
+def generate_draw_history_embed(
+    leaderboard: "DataFrame", months: int, size: int = 15
+) -> Embed:
+    """
+    Generate Discord embed message of the best past picks for draw_history command.
+
+    :param leaderboard: Picks with symbol, date_submitted and performance, best first
+    :param months: Number of months covered
+    :param size: Maximum number of picks listed
+    :return: Discord embed message
+    """
+    logger.info("Generating draw history discord embed")
+    embed_message = Embed(
+        title=f"Monthly draw picks of the last {months} months 🏆", colour=0x0F3FE5
+    )
+
+    if leaderboard.empty:
+        embed_message.description = "No priced submissions in this period"
+        return embed_message
+
+    rows = [("#", "Symbol", "Submitted", "Return")]
+    rows.extend(
+        (
+            str(rank),
+            pick.symbol,
+            f"{pick.date_submitted:%Y-%m-%d}",
+            f"{pick.performance:+.1%}",
+        )
+        for rank, pick in enumerate(leaderboard.head(size).itertuples(), start=1)
+    )
+    embed_message.description = format_table(rows)
+    embed_message.set_footer(
+        text=f"{len(leaderboard)} picks, median return "
+        f"{leaderboard.performance.median():+.1%}"
+    )
+    return embed_message
+
+
+def generate_prices_embed(
+    symbols: List[str], quotes: Dict[str, Dict[str, Any]], missing: List[str]
+) -> Embed:
+    """
+    Generate Discord embed message with a price table used in prices command.
+
+    :param symbols: Requested token symbols, in table order
+    :param quotes: Quote by symbol
+    :param missing: Symbols without a quote
+    :return: Discord embed message
+    """
+    logger.info("Generating prices table discord embed")
+    rows: List[Tuple[str, ...]] = [("Symbol", "Price", "24H", "7D", "Market Cap")]
+
+    for symbol in symbols:
+        if symbol not in quotes:
+            continue
+
+        quote = quotes[symbol]
+        rows.append(
+            (
+                symbol,
+                format_usd_price(quote["price"]),
+                *(
+                    "-" if change is None else f"{change:+.1f}%"
+                    for change in (
+                        quote["percent_change_24h"],
+                        quote["percent_change_7d"],
+                    )
+                ),
+                format_compact_usd(quote["market_cap"]),
+            )
+        )
+
+    embed_message = Embed(
+        title="Prices 💸", description=format_table(rows), colour=0xC5E519
+    )
+
+    if missing:
+        embed_message.add_field(name="Not found", value=", ".join(missing))
+    return embed_message
+
+
+def generate_price_embed(token_data: CoinStats, unit: str = "$") -> Embed:
     """
     Generate Discord embed message used in price command.
 
     :param token_data: Token data
+    :param unit: Currency unit of the price and volume
     :return: Discord embed message
     """
     logger.info("Generating price data discord embed")
-    percent_change_24h, percent_change_7d, percent_change_30d = itemgetter(
-        "percent_change_24h", "percent_change_7d", "percent_change_30d"
-    )(token_data)
+    percent_change_24h = token_data.percent_change_24h
+    percent_change_7d = token_data.percent_change_7d
+    percent_change_30d = token_data.percent_change_30d
 
     embed_message = Embed(
-        title=f"{token_data['name']} ({token_data['symbol']})",
-        url=token_data["website"],
+        title=f"{token_data.name} ({token_data.symbol})",
+        url=token_data.website,
         colour=0xC5E519,
     )
     fields = [
-        ("Explorers 🔗", ", ".join(token_data["explorers"]), False),
-        ("Price 💸", token_data["price"], False),
-        ("Market Cap Rank 🥇", token_data["market_cap_rank"], False),
-        ("Volume 💰", token_data["volume"], False),
+        ("Explorers 🔗", ", ".join(get_coin_explorers(token_data)), False),
+        ("Price 💸", format_amount(token_data.price, unit=unit), False),
+        ("Market Cap Rank 🥇", token_data.market_cap_rank, False),
+        ("Volume 💰", format_amount(token_data.volume, unit=unit), False),
         (
             "24H Change 📈" if percent_change_24h > 0 else "24H Change 📉",
             f"{percent_change_24h}%",
@@ -222,8 +404,8 @@ def generate_price_embed(token_data: dict) -> Embed:
         ),
     ]
 
-    if "percent_change_ath" in token_data:
-        percent_change_ath = token_data["percent_change_ath"]
+    if token_data.percent_change_ath is not None:
+        percent_change_ath = token_data.percent_change_ath
         fields.append(
             (
                 "ATH Change 📈" if percent_change_ath > 0 else "ATH Change 📉",
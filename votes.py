@@ -0,0 +1,252 @@
+import asyncio
+import datetime
+from typing import Dict, List, NamedTuple, Optional
+
+from discord import Bot, Embed, HTTPException
+from discord.abc import Messageable
+from tortoise.exceptions import BaseORMException
+from tortoise.transactions import in_transaction
+
+from config import VOTE_FLUSH_INTERVAL, logger
+from models import DrawPoll, DrawPollOption, MonthlySubmission
+from sharding import owns_guild
+
+
+def next_month_start(moment: datetime.datetime) -> datetime.datetime:
+    """
+    First instant of the month following a moment.
+
+    :param moment: Timezone aware moment
+    :return: Midnight of the first day of the next month, same timezone
+    """
+    month_start = moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    return (month_start + datetime.timedelta(days=32)).replace(day=1)
+
+
+class OpenPoll(NamedTuple):
+    """Poll still collecting votes, with its options by reaction emoji."""
+
+    poll: DrawPoll
+    options: Dict[str, DrawPollOption]
+
+
+class VoteTracker:
+    """Counts monthly draw votes from reaction events and closes polls at month end."""
+
+    def __init__(self, flush_interval: float):
+        """
+        Create vote tracker.
+
+        :param flush_interval: Seconds between writes of changed vote counts
+        """
+        self.flush_interval = flush_interval
+        self._polls: Dict[int, OpenPoll] = {}
+        self._changed: Dict[int, DrawPollOption] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self, bot: Bot) -> None:
+        """
+        Load open polls, then flush votes and close polls in the background.
+
+        :param bot: Discord bot announcing winners
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(bot))
+
+    async def stop(self) -> None:
+        """Stop the background work and write the remaining vote counts."""
+        if self._task is not None:
+            self._task.cancel()
+
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                logger.info("Vote tracker stopped")
+            self._task = None
+
+        try:
+            await self.flush()
+        except BaseORMException as error:
+            logger.error("Unable to save votes: %s", error)
+
+    async def load(self, bot: Bot) -> None:
+        """
+        Restore counters of polls that are still open.
+
+        :param bot: Discord bot, only polls of the guilds it serves are loaded
+        """
+        polls = [
+            poll
+            for poll in await DrawPoll.filter(closed_at=None).prefetch_related(
+                "options__submission"
+            )
+            if owns_guild(bot, poll.guild_id)
+        ]
+
+        for poll in polls:
+            self._polls[poll.message_id] = OpenPoll(
+                poll=poll, options={option.emoji: option for option in poll.options}
+            )
+        logger.info("Tracking votes of %s open polls", len(polls))
+
+    async def open_poll(
+        self,
+        message_id: int,
+        guild_id: Optional[int],
+        channel_id: int,
+        submissions: Dict[str, MonthlySubmission],
+    ) -> None:
+        """
+        Start counting votes of a poll closing at the end of the month.
+
+        :param message_id: Poll message id
+        :param guild_id: Guild the poll was posted in
+        :param channel_id: Channel the poll was posted in
+        :param submissions: Submission voted for with each reaction emoji
+        """
+        now = datetime.datetime.now(datetime.timezone.utc)
+
+        async with in_transaction():
+            poll = await DrawPoll.create(
+                message_id=message_id,
+                guild_id=guild_id,
+                channel_id=channel_id,
+                closes_at=next_month_start(now),
+            )
+            options = {
+                emoji: await DrawPollOption.create(
+                    poll=poll, submission=submission, emoji=emoji
+                )
+                for emoji, submission in submissions.items()
+            }
+        self._polls[message_id] = OpenPoll(poll=poll, options=options)
+
+    def record(self, message_id: int, emoji: str, change: int) -> None:
+        """
+        Count an added or removed reaction, ignoring non-poll messages.
+
+        :param message_id: Reacted message id
+        :param emoji: Reaction emoji
+        :param change: 1 for an added reaction, -1 for a removed one
+        """
+        open_poll = self._polls.get(message_id)
+        option = open_poll.options.get(emoji) if open_poll else None
+
+        if option is not None:
+            # Reactions removed while the bot was offline are never counted
+            option.votes = max(0, option.votes + change)
+            self._changed[option.id] = option
+
+    def tally(self, message_id: int) -> List[DrawPollOption]:
+        """
+        Current vote counts of an open poll.
+
+        :param message_id: Poll message id
+        :return: Options with the most voted first, empty for unknown polls
+        """
+        open_poll = self._polls.get(message_id)
+
+        if open_poll is None:
+            return []
+        return sorted(
+            open_poll.options.values(), key=lambda option: option.votes, reverse=True
+        )
+
+    async def flush(self) -> None:
+        """Write changed vote counts in one batch."""
+        if not self._changed:
+            return
+
+        changed = list(self._changed.values())
+        self._changed.clear()
+
+        try:
+            await DrawPollOption.bulk_update(changed, fields=["votes"])
+        except BaseORMException:
+            for option in changed:
+                self._changed.setdefault(option.id, option)
+            raise
+
+    async def close_due_polls(self, bot: Bot) -> None:
+        """
+        Close polls whose month has ended and announce their winners.
+
+        :param bot: Discord bot announcing winners
+        """
+        now = datetime.datetime.now(datetime.timezone.utc)
+        due = [
+            message_id
+            for message_id, open_poll in self._polls.items()
+            if open_poll.poll.closes_at <= now
+        ]
+
+        if not due:
+            return
+
+        await self.flush()
+
+        for message_id in due:
+            open_poll = self._polls[message_id]
+            open_poll.poll.closed_at = now
+            await open_poll.poll.save(update_fields=["closed_at"])
+            await self.announce(bot, open_poll.poll, self.tally(message_id))
+            del self._polls[message_id]
+
+    @staticmethod
+    async def announce(bot: Bot, poll: DrawPoll, tally: List[DrawPollOption]) -> None:
+        """
+        Publish the winner in the channel the poll was posted in.
+
+        :param bot: Discord bot
+        :param poll: Closed poll
+        :param tally: Options with the most voted first
+        """
+        votes = tally[0].votes if tally else 0
+        winners = [str(option.submission) for option in tally if option.votes == votes]
+
+        if not votes:
+            description = "No votes were cast"
+        elif len(winners) == 1:
+            description = f"{winners[0]} won with {votes} votes"
+        else:
+            description = f"{', '.join(winners)} tied with {votes} votes"
+
+        try:
+            channel = bot.get_channel(poll.channel_id) or await bot.fetch_channel(
+                poll.channel_id
+            )
+
+            if not isinstance(channel, Messageable):
+                logger.error(
+                    "Unable to announce %s: %s is not a text channel", poll, channel
+                )
+                return
+
+            await channel.send(
+                embed=Embed(
+                    colour=0x0F3FE5,
+                    title="Token of the month 🏆",
+                    description=description,
+                )
+            )
+        except HTTPException as error:
+            logger.error("Unable to announce %s: %s", poll, error)
+
+    async def _run(self, bot: Bot) -> None:
+        try:
+            await self.load(bot)
+        except Exception:
+            logger.exception("Unable to load open polls")
+
+        while True:
+            await asyncio.sleep(self.flush_interval)
+
+            try:
+                await self.flush()
+                await self.close_due_polls(bot)
+            except Exception:
+                # Keep flushing, a failed round must not stop votes for good
+                logger.exception("Unable to save votes")
+
+
+vote_tracker = VoteTracker(flush_interval=VOTE_FLUSH_INTERVAL)